@@ -0,0 +1,36 @@
+"""issue keyset indexes
+
+Revision ID: 3f1c9a7b2d10
+Revises: 86aa3c894d65
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7b2d10'
+down_revision: Union[str, Sequence[str], None] = '86aa3c894d65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_issues_created_at_id', 'issues', ['created_at', 'id'], unique=False)
+    op.create_index('ix_issues_reporter_created_at_id', 'issues', ['reporter_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_status_created_at_id', 'issues', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_severity_created_at_id', 'issues', ['severity', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_priority_created_at_id', 'issues', ['priority', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issues_priority_created_at_id', table_name='issues')
+    op.drop_index('ix_issues_severity_created_at_id', table_name='issues')
+    op.drop_index('ix_issues_status_created_at_id', table_name='issues')
+    op.drop_index('ix_issues_reporter_created_at_id', table_name='issues')
+    op.drop_index('ix_issues_created_at_id', table_name='issues')
@@ -1 +1,76 @@
-alembic upgrade head 
\ No newline at end of file
+"""init
+
+Revision ID: 86aa3c894d65
+Revises:
+Create Date: 2025-07-01 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '86aa3c894d65'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('role', sa.Enum('ADMIN', 'MAINTAINER', 'REPORTER', name='role'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table(
+        'issues',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('file_path', sa.String(), nullable=True),
+        sa.Column('severity', sa.Enum('LOW', 'MEDIUM', 'HIGH', name='severity'), nullable=True),
+        sa.Column('status', sa.Enum('OPEN', 'TRIAGED', 'IN_PROGRESS', 'DONE', name='status'), nullable=True),
+        sa.Column('priority', sa.Enum('BLOCKER', 'CRITICAL', 'MINOR', 'TRIVIAL', name='priority'), nullable=False),
+        sa.Column('reporter_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('tags', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['reporter_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_issues_id', 'issues', ['id'], unique=False)
+
+    op.create_table(
+        'daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column('status', postgresql.ENUM('OPEN', 'TRIAGED', 'IN_PROGRESS', 'DONE', name='status', create_type=False), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_daily_stats_date', 'daily_stats', ['date'], unique=False)
+    op.create_index('ix_daily_stats_id', 'daily_stats', ['id'], unique=False)
+    op.create_index('ix_daily_stats_status', 'daily_stats', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_stats_status', table_name='daily_stats')
+    op.drop_index('ix_daily_stats_id', table_name='daily_stats')
+    op.drop_index('ix_daily_stats_date', table_name='daily_stats')
+    op.drop_table('daily_stats')
+    op.drop_index('ix_issues_id', table_name='issues')
+    op.drop_table('issues')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
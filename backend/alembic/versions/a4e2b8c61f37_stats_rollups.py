@@ -0,0 +1,39 @@
+"""stats rollups
+
+Revision ID: a4e2b8c61f37
+Revises: 3f1c9a7b2d10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e2b8c61f37'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7b2d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stats_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('date', 'dimension', 'value', name='uq_stats_rollups_date_dimension_value'),
+    )
+    op.create_index('ix_stats_rollups_id', 'stats_rollups', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stats_rollups_id', table_name='stats_rollups')
+    op.drop_table('stats_rollups')
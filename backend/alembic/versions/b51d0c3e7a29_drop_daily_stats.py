@@ -0,0 +1,42 @@
+"""drop daily_stats
+
+Revision ID: b51d0c3e7a29
+Revises: 7c41e9a0d2b6
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b51d0c3e7a29'
+down_revision: Union[str, Sequence[str], None] = '7c41e9a0d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: daily_stats was superseded by stats_rollups and is no longer read or written."""
+    op.drop_index('ix_daily_stats_status', table_name='daily_stats')
+    op.drop_index('ix_daily_stats_id', table_name='daily_stats')
+    op.drop_index('ix_daily_stats_date', table_name='daily_stats')
+    op.drop_table('daily_stats')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        'daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column('status', postgresql.ENUM('OPEN', 'TRIAGED', 'IN_PROGRESS', 'DONE', name='status', create_type=False), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_daily_stats_date', 'daily_stats', ['date'], unique=False)
+    op.create_index('ix_daily_stats_id', 'daily_stats', ['id'], unique=False)
+    op.create_index('ix_daily_stats_status', 'daily_stats', ['status'], unique=False)
@@ -0,0 +1,88 @@
+"""normalized tags
+
+Revision ID: c7d5e1f09a42
+Revises: a4e2b8c61f37
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d5e1f09a42'
+down_revision: Union[str, Sequence[str], None] = 'a4e2b8c61f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tags = op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tags_id', 'tags', ['id'], unique=False)
+    op.create_index('ix_tags_name', 'tags', ['name'], unique=True)
+    issue_tags = op.create_table(
+        'issue_tags',
+        sa.Column('issue_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['issue_id'], ['issues.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('issue_id', 'tag_id'),
+    )
+    op.create_index('ix_issue_tags_tag_id_issue_id', 'issue_tags', ['tag_id', 'issue_id'], unique=False)
+
+    # Backfill from the comma-separated issues.tags column, in id-ordered batches
+    conn = op.get_bind()
+    tag_ids = {}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, tags FROM issues WHERE id > :last_id AND tags IS NOT NULL AND tags != '' ORDER BY id LIMIT :n"),
+            {"last_id": last_id, "n": BATCH},
+        ).fetchall()
+        if not rows:
+            break
+        links = []
+        for issue_id, csv in rows:
+            for name in dict.fromkeys(t.strip() for t in csv.split(',') if t.strip()):
+                if name not in tag_ids:
+                    conn.execute(tags.insert().values(name=name))
+                    tag_ids[name] = conn.execute(sa.select(tags.c.id).where(tags.c.name == name)).scalar_one()
+                links.append({"issue_id": issue_id, "tag_id": tag_ids[name]})
+        if links:
+            conn.execute(issue_tags.insert(), links)
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.drop_column('tags')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.add_column(sa.Column('tags', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT it.issue_id, t.name FROM issue_tags it JOIN tags t ON t.id = it.tag_id ORDER BY it.issue_id, t.name"
+    ))
+    csv = {}
+    for issue_id, name in rows:
+        csv.setdefault(issue_id, []).append(name)
+    for issue_id, names in csv.items():
+        conn.execute(sa.text("UPDATE issues SET tags = :tags WHERE id = :id"), {"tags": ','.join(names), "id": issue_id})
+
+    op.drop_index('ix_issue_tags_tag_id_issue_id', table_name='issue_tags')
+    op.drop_table('issue_tags')
+    op.drop_index('ix_tags_name', table_name='tags')
+    op.drop_index('ix_tags_id', table_name='tags')
+    op.drop_table('tags')
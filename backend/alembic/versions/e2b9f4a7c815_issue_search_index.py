@@ -0,0 +1,30 @@
+"""issue search index
+
+Revision ID: e2b9f4a7c815
+Revises: c7d5e1f09a42
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.search import create_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9f4a7c815'
+down_revision: Union[str, Sequence[str], None] = 'c7d5e1f09a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_search_index(op.get_bind())
@@ -0,0 +1,49 @@
+"""attachments
+
+Revision ID: f3a8c2d91b07
+Revises: e2b9f4a7c815
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c2d91b07'
+down_revision: Union[str, Sequence[str], None] = 'e2b9f4a7c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'attachments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('issue_id', sa.Integer(), nullable=True),
+        sa.Column('uploader_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['issue_id'], ['issues.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['uploader_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_attachments_id', 'attachments', ['id'], unique=False)
+    op.create_index('ix_attachments_issue_id', 'attachments', ['issue_id'], unique=False)
+    op.create_index('ix_attachments_uploader_id', 'attachments', ['uploader_id'], unique=False)
+    op.create_index('ix_attachments_sha256', 'attachments', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attachments_sha256', table_name='attachments')
+    op.drop_index('ix_attachments_uploader_id', table_name='attachments')
+    op.drop_index('ix_attachments_issue_id', table_name='attachments')
+    op.drop_index('ix_attachments_id', table_name='attachments')
+    op.drop_table('attachments')
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserLogin, Token
-from app.crud.user import create_user, authenticate
-from app.core.security import create_access_token
+from starlette.concurrency import run_in_threadpool
+from app.crud.user import create_user_async, authenticate_async, email_exists
+from app.core.security import create_access_token, PasswordPoolBusy
 from app.db.session import SessionLocal
 
 router = APIRouter()
@@ -14,17 +15,32 @@ def get_db():
     finally:
         db.close()
 
+def password_pool_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=Token)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    if authenticate(db, user.email, user.password):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(email_exists, db, user.email):
+        raise HTTPException(status_code=400, detail="User already exists")
+    try:
+        new_user = await create_user_async(db, user)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+    if new_user is None:
         raise HTTPException(status_code=400, detail="User already exists")
-    new_user = create_user(db, user)
     token = create_access_token({"user_id": new_user.id, "role": new_user.role})
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    auth_user = authenticate(db, user.email, user.password)
+async def login(user: UserLogin, db: Session = Depends(get_db)):
+    try:
+        auth_user = await authenticate_async(db, user.email, user.password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
     if not auth_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token({"user_id": auth_user.id, "role": auth_user.role})
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.api.deps import optional_oauth2_scheme, resolve_principal
+from app.utils.response_cache import response_cache
+
+
+class CachedRoute(APIRoute):
+    """
+    Route class for read-only routers whose responses depend only on the URL, the
+    caller's role and the issues table (the stats router). GETs are answered from
+    response_cache when possible and carry a weak ETag made of the issues version, the
+    UTC day (stats are "today"-relative) and the role; a matching If-None-Match gets a
+    bodyless 304. Both short-circuits happen before dependencies are solved, so they
+    cost no database session. Responses marked Cache-Control: no-store (fallbacks given
+    when the database failed) pass through uncached and without an ETag.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+
+            principal = await resolve_principal(await optional_oauth2_scheme(request))
+            role = principal.role.value if principal and principal.role else "anonymous"
+            version = await response_cache.version()
+            tag = f'W/"{version}-{datetime.utcnow().date().isoformat()}-{role}"'
+            headers = {"ETag": tag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+            if tag in request.headers.get("if-none-match", ""):
+                return Response(status_code=304, headers=headers)
+
+            key = f"{tag}{request.url.path}?{request.url.query}"
+            entry = await response_cache.get(key)
+            if entry is not None:
+                status_code, media_type, body = entry
+                return Response(body, status_code=status_code, media_type=media_type, headers=headers)
+
+            response = await handler(request)
+            if response.headers.get("cache-control") == "no-store":
+                return response
+            if response.status_code == 200 and response.background is None:
+                await response_cache.set(key, (200, response.media_type or "application/json", bytes(response.body)))
+                response.headers.update(headers)
+            return response
+
+        return cached_handler
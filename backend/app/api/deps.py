@@ -1,14 +1,22 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, WebSocket, status
 from jose import JWTError, jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, AsyncSessionLocal, ReadSessionLocal, AsyncReadSessionLocal
 from app.models.user import User, Role
-from app.schemas.user import TokenData
+from app.schemas.user import TokenData, Principal
+from app.core.config import settings
 from app.core.security import SECRET_KEY, ALGORITHM
 from app.crud.user import get_by_email
+from app.utils.cache import user_cache, token_cache, recent_writers
+from typing import Optional
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 def get_db():
     db = SessionLocal()
@@ -17,6 +25,66 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def token_user_id(token: Optional[str]) -> Optional[int]:
+    """
+    Resolves a bearer token to its user id via the token cache, decoding the JWT on a miss.
+    Returns None for a missing or invalid token.
+    """
+    if not token:
+        return None
+    user_id = token_cache.get(token) if settings.TOKEN_CACHE_ENABLED else None
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        user_id = payload.get("user_id")
+        if user_id is not None and settings.TOKEN_CACHE_ENABLED:
+            # Never keep a token around past its own expiry
+            token_cache.set(token, user_id, ttl=payload["exp"] - time.time() if "exp" in payload else None)
+    return user_id
+
+def read_from_primary(token: Optional[str]) -> bool:
+    """
+    True while the token's user is inside their read-after-write window.
+    """
+    user_id = token_user_id(token)
+    return user_id is not None and recent_writers.get(user_id) is not None
+
+def get_read_session_factory(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """
+    The session factory get_read_db uses: the replica's, or the primary's for users who
+    have just written. For responses that open their own session (streamed exports).
+    """
+    if ReadSessionLocal is SessionLocal or read_from_primary(token):
+        return SessionLocal
+    return ReadSessionLocal
+
+def get_read_db(factory=Depends(get_read_session_factory)):
+    """
+    Session on the read replica, or on the primary for users who have just written.
+    """
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """
+    Async counterpart of get_read_db.
+    """
+    if AsyncReadSessionLocal is AsyncSessionLocal or read_from_primary(token):
+        factory = AsyncSessionLocal
+    else:
+        factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,7 +102,59 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise credentials_exception
     return user
 
-def require_admin(user: User = Depends(get_current_user)):
+async def resolve_principal(token: Optional[str]) -> Optional[Principal]:
+    """
+    The Principal a token belongs to, from the caches when possible, or None if the token
+    is missing, invalid or names a deleted user. A cache miss is looked up in a session
+    of its own, closed before the endpoint runs: holding its connection while the
+    endpoint waits for another from the same pool deadlocks the pool under load.
+    """
+    user_id = token_user_id(token)
+    if user_id is None:
+        return None
+    principal = user_cache.get(user_id)
+    if principal is None:
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(
+                select(User.id, User.email, User.role).where(User.id == user_id)
+            )).first()
+        if row is None:
+            return None
+        principal = Principal(id=row.id, email=row.email, role=row.role)
+        user_cache.set(user_id, principal)
+    return principal
+
+async def get_current_principal(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    """
+    Like get_current_user, but returns a cached Principal (id, email, role) instead of
+    the ORM row. A cache hit costs neither a JWT decode nor a database round trip.
+    Authenticated writes also open the user's read-after-write window (see get_read_db).
+    """
+    principal = await resolve_principal(token)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    if request.method not in SAFE_METHODS:
+        recent_writers.set(principal.id, True)
+    return principal
+
+async def websocket_principal(websocket: WebSocket) -> Optional[Principal]:
+    """
+    Authenticates a WebSocket handshake with the same JWT as the HTTP API, taken from
+    ?token= (browsers can't set headers on WebSockets) or an Authorization header.
+    """
+    token = websocket.query_params.get("token")
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    return await resolve_principal(token)
+
+def require_admin(user: Principal = Depends(get_current_principal)):
     if user.role != Role.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
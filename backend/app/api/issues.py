@@ -1,100 +1,344 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from starlette.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import os, shutil
+from datetime import datetime
+import os
 
-from app.schemas.issue import IssueCreate, IssueOut, IssueUpdate
+from app.schemas.issue import (
+    IssueCreate,
+    IssueOut,
+    IssueOutList,
+    IssueUpdate,
+    TagCount,
+    IssueSearchHit,
+    IssueBatchUpdate,
+    IssueBatchResult,
+    IssueImportResult,
+)
 from app.crud.issue import (
-    create_issue,
-    get_issues_by_user,
-    get_all_issues,
-    update_issue,
-    get_issue,
-    delete_issue
+    create_issue_async,
+    list_issue_rows_page_async,
+    get_tag_counts_async,
+    get_issue_async,
+    update_issue_async,
+    delete_issue_async,
+    import_issue_batch,
+    transition_error,
+    triage_issues_async,
 )
-from app.api.deps import get_db, get_current_user
-from app.models.user import User, Role
+from app.crud.search import search_issues_async
+from app.crud.export import stream_issue_batches
+from app.crud.attachment import upload_limit_async, new_attachment, blob_lock_async, release_blobs_async
+from app.crud.job import enqueue_job_async
+from app.crud.upload import get_upload_session_async, attach_upload_async
+from app.schemas.attachment import AttachmentOut
+from app.schemas.upload import AttachUpload
+from app.storage import get_storage, store_file, write_temp, UploadTooLarge
+from app.storage.http import attachment_response, content_disposition
+from app.utils.export import EXPORT_FORMATS, ExportFormatUnavailable
+from app.utils.events import issue_snapshot, issue_events, batch_issue_events, publish_events
+from app.api.deps import get_db, get_async_db, get_read_session_factory, get_async_read_db, get_current_principal
+from app.models.user import Role
+from app.schemas.user import Principal
+from app.models.issue import Status, Severity, Priority
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploaded_files"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
 
 @router.post("/", response_model=IssueOut)
-def create(
+async def create(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     priority: Optional[str] = Form(None),
     severity: str = Form(...),
+    tags: Optional[str] = Form(None),  # comma-separated
     file: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal)
+):
+    try:
+        issue_data = IssueCreate(
+            title=title,
+            description=description,
+            priority=priority,
+            severity=severity,
+            tags=tags.split(",") if tags else None,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    if not file:
+        issue = await create_issue_async(db, issue_data, reporter_id=user.id)
+    else:
+        storage = get_storage()
+        limit, reason = await upload_limit_async(db, user.id)
+        try:
+            path, sha256, size = await run_in_threadpool(write_temp, file.file, storage.temp_dir, limit)
+        except UploadTooLarge:
+            raise HTTPException(status_code=413, detail=reason)
+        attachment = new_attachment(user.id, file.filename, file.content_type, sha256, size)
+        try:
+            # The issue commits under the blob lock, so a concurrent release sees its reference
+            async with blob_lock_async(db, storage, sha256):
+                await run_in_threadpool(store_file, storage, path, sha256)
+                issue = await create_issue_async(db, issue_data, reporter_id=user.id, attachments=[attachment])
+        except BaseException:
+            await db.rollback()
+            if os.path.exists(path):
+                os.unlink(path)
+            await release_blobs_async(db, storage, [sha256])
+            raise
+    background_tasks.add_task(publish_events, issue_events("created", None, issue_snapshot(issue)))
+    return issue
+
+
+@router.post("/bulk", response_model=IssueImportResult)
+async def bulk_import(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=10000),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: Principal = Depends(get_current_principal),
 ):
-    file_path = None
-    if file:
-        file_location = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        file_path = file_location
-
-    issue_data = IssueCreate(
-        title=title,
-        description=description,
-        priority=priority,
-        severity=severity,
-        file_path=file_path
-    )
+    """
+    Imports issues from an NDJSON body (one IssueImport per line), streamed and committed
+    batch_size lines at a time. Bad lines are reported by line number and skipped without
+    failing the rest of their batch. Lines longer than IMPORT_MAX_LINE_BYTES are
+    reported the same way without being buffered.
+    """
+    if user.role not in [Role.MAINTAINER, Role.ADMIN]:
+        raise HTTPException(status_code=403, detail="Maintainer or Admin access required")
+
+    created, failed, errors = 0, 0, []
+
+    async def flush(batch, line_errors):
+        nonlocal created, failed
+        snapshots, batch_errors = await run_in_threadpool(import_issue_batch, db, batch, user.id) if batch else ([], [])
+        batch_errors = sorted(batch_errors + line_errors, key=lambda e: e["line"])
+        created += len(snapshots)
+        failed += len(batch_errors)
+        errors.extend(batch_errors[:IMPORT_MAX_REPORTED_ERRORS - len(errors)])
+        # Dashboards get one stats delta per batch rather than an event per issue
+        await publish_events(batch_issue_events("created", [(None, s) for s in snapshots], per_issue=False))
+
+    batch, line_errors, number = [], [], 0
+    # The line being received; once it passes the limit its remaining bytes are dropped
+    pending, too_long = bytearray(), False
+
+    def extend(piece: bytes):
+        nonlocal too_long
+        if not too_long:
+            pending.extend(piece)
+            if len(pending) > IMPORT_MAX_LINE_BYTES:
+                too_long = True
+                pending.clear()
 
-    return create_issue(db, issue_data, reporter_id=user.id)
+    async def end_line():
+        nonlocal batch, line_errors, number, too_long
+        number += 1
+        if too_long:
+            line_errors.append({"line": number, "error": f"Line longer than {IMPORT_MAX_LINE_BYTES} bytes"})
+            too_long = False
+        elif pending.strip():
+            batch.append((number, bytes(pending)))
+        pending.clear()
+        if len(batch) >= batch_size:
+            await flush(batch, line_errors)
+            batch, line_errors = [], []
+
+    async for chunk in request.stream():
+        *lines, rest = chunk.split(b"\n")
+        for line in lines:
+            extend(line)
+            await end_line()
+        extend(rest)
+    if too_long or pending.strip():
+        await end_line()
+    if batch or line_errors:
+        await flush(batch, line_errors)
+    return {"created": created, "failed": failed, "errors": errors}
+
+
+@router.patch("/batch", response_model=IssueBatchResult)
+async def batch_triage(
+    update: IssueBatchUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Sets status and/or priority on many issues in one statement. The status workflow is
+    checked per issue; issues that may not move are listed in `errors` and left as they were.
+    """
+    if user.role not in [Role.MAINTAINER, Role.ADMIN]:
+        raise HTTPException(status_code=403, detail="Maintainer or Admin access required")
+    if update.status is None and update.priority is None:
+        raise HTTPException(status_code=400, detail="Nothing to update: give status and/or priority")
+
+    changes, errors = await triage_issues_async(db, update.ids, status=update.status, priority=update.priority)
+    background_tasks.add_task(publish_events, batch_issue_events("triaged", changes))
+    return {"updated": [after["id"] for _, after in changes], "errors": errors}
 
 
 @router.get("/", response_model=List[IssueOut])
-def list_issues(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def list_issues(
+    status: Optional[Status] = None,
+    severity: Optional[Severity] = None,
+    priority: Optional[Priority] = None,
+    reporter_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
+    # Reporters only ever see their own issues
     if user.role == Role.REPORTER:
-        return get_issues_by_user(db, user.id)
-    return get_all_issues(db)
+        reporter_id = user.id
+    try:
+        rows, next_cursor, prev_cursor = await list_issue_rows_page_async(
+            db,
+            reporter_id=reporter_id,
+            status=status,
+            severity=severity,
+            priority=priority,
+            tag=tag,
+            created_from=created_from,
+            created_to=created_to,
+            order=order,
+            after=after,
+            before=before,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Column rows validated as one list and dumped straight to JSON bytes by pydantic-core;
+    # returning a Response skips FastAPI's second validation pass over response_model
+    body = IssueOutList.dump_json(IssueOutList.validate_python(rows))
+    response = Response(body, media_type="application/json")
+    # Cursors travel in headers so the body stays a plain list of issues
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if prev_cursor:
+        response.headers["X-Prev-Cursor"] = prev_cursor
+    return response
+
+
+@router.get("/tags", response_model=List[TagCount])
+async def list_tags(
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_principal),
+):
+    # Reporters only count tags on their own issues
+    reporter_id = user.id if user.role == Role.REPORTER else None
+    return [{"name": name, "count": count} for name, count in await get_tag_counts_async(db, reporter_id)]
+
+
+@router.get("/search", response_model=List[IssueSearchHit])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    after: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_principal),
+):
+    # Same scoping as list_issues: reporters only find their own issues
+    reporter_id = user.id if user.role == Role.REPORTER else None
+    try:
+        hits, next_cursor = await search_issues_async(db, q, reporter_id=reporter_id, after=after, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return hits
 
 
 @router.patch("/{issue_id}", response_model=IssueOut)
-def update_status(
+async def update_status(
     issue_id: int,
     update: IssueUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
 ):
-    issue = get_issue(db, issue_id)
+    issue = await get_issue_async(db, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     # Strict status workflow enforcement
-    allowed_transitions = {
-        "OPEN": ["TRIAGED"],
-        "TRIAGED": ["IN_PROGRESS"],
-        "IN_PROGRESS": ["DONE"],
-        "DONE": []
-    }
-    if update.status and update.status != issue.status:
-        current = str(issue.status)
-        target = str(update.status)
-        if target not in allowed_transitions.get(current, []):
-            raise HTTPException(status_code=400, detail=f"Invalid status transition: {current} → {target}")
+    error = transition_error(issue.status, update.status)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
     if user.role in [Role.MAINTAINER, Role.ADMIN] or issue.reporter_id == user.id:
-        return update_issue(db, issue, update)
+        before = issue_snapshot(issue)
+        issue = await update_issue_async(db, issue, update)
+        background_tasks.add_task(publish_events, issue_events("updated", before, issue_snapshot(issue)))
+        return issue
 
     raise HTTPException(status_code=403, detail="Not authorized")
 
 
+@router.get("/export")
+def export(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    status: Optional[Status] = None,
+    severity: Optional[Severity] = None,
+    priority: Optional[Priority] = None,
+    reporter_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session_factory=Depends(get_read_session_factory),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Every matching issue as one streamed file, oldest first. Takes the list filters and
+    scoping; rows come from a server-side cursor in batches, so memory stays flat
+    however many issues match.
+    """
+    if user.role == Role.REPORTER:
+        reporter_id = user.id
+    media_type, extension, encode = EXPORT_FORMATS[format]
+    batches = stream_issue_batches(
+        session_factory,
+        reporter_id=reporter_id,
+        status=status,
+        severity=severity,
+        priority=priority,
+        tag=tag,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    try:
+        chunks = encode(batches)
+    except ExportFormatUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": content_disposition(f"issues.{extension}")}
+    )
+
+
 @router.get("/{issue_id}", response_model=IssueOut)
-def get_single_issue(
+async def get_single_issue(
     issue_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_principal),
 ):
-    issue = get_issue(db, issue_id)
+    issue = await get_issue_async(db, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     # Only allow access if user is admin/maintainer or reporter of the issue
@@ -103,45 +347,104 @@ def get_single_issue(
     raise HTTPException(status_code=403, detail="Not authorized")
 
 
+@router.get("/{issue_id}/attachment")
+async def download_attachment(
+    request: Request,
+    issue_id: int,
+    attachment_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Downloads one of the issue's attachments (the latest unless attachment_id is given).
+    Same access rules as get_single_issue.
+    """
+    issue = await get_issue_async(db, issue_id)
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    if user.role not in [Role.MAINTAINER, Role.ADMIN] and issue.reporter_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if attachment_id is not None:
+        attachment = next((a for a in issue.attachments if a.id == attachment_id), None)
+    else:
+        attachment = issue.attachments[-1] if issue.attachments else None
+    if attachment is not None:
+        return attachment_response(request, get_storage(), attachment)
+    # Files uploaded before attachments were tracked only have a path on the issue
+    if attachment_id is None and issue.file_path and os.path.isfile(issue.file_path):
+        return FileResponse(issue.file_path, filename=os.path.basename(issue.file_path))
+    raise HTTPException(status_code=404, detail="Attachment not found")
+
+
+@router.post("/{issue_id}/attachments", response_model=AttachmentOut, status_code=201)
+async def attach_finished_upload(
+    issue_id: int,
+    body: AttachUpload,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Attaches a completed resumable upload (see /api/uploads) to the issue. Its size
+    counted against the quota from the moment the session started, so it is not checked
+    again here.
+    """
+    issue = await get_issue_async(db, issue_id)
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    if user.role not in [Role.MAINTAINER, Role.ADMIN] and issue.reporter_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    upload = await get_upload_session_async(db, body.upload_id)
+    if upload is None or upload.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.sha256 is None:
+        raise HTTPException(status_code=409, detail="Upload is not complete")
+    return await attach_upload_async(db, upload, issue.id)
+
+
 @router.delete("/{issue_id}", status_code=204)
-def delete_issue_endpoint(
+async def delete_issue_endpoint(
     issue_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
 ):
     if user.role != Role.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
-    deleted = delete_issue(db, issue_id)
-    if not deleted:
+    issue = await get_issue_async(db, issue_id)
+    if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
+    hashes = [a.sha256 for a in issue.attachments]
+    before = issue_snapshot(issue)
+    if hashes:
+        # Queued in the delete's transaction: the blobs are released if and only if it commits
+        await enqueue_job_async(db, "attachments.release", {"hashes": hashes}, commit=False)
+    await delete_issue_async(db, issue_id)
+    background_tasks.add_task(publish_events, issue_events("deleted", before, None))
     return None
 
 
 @router.patch("/{issue_id}/triage", response_model=IssueOut)
-def triage_issue(
+async def triage_issue(
     issue_id: int,
     update: IssueUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
 ):
     if user.role not in [Role.MAINTAINER, Role.ADMIN]:
         raise HTTPException(status_code=403, detail="Maintainer or Admin access required")
     
-    issue = get_issue(db, issue_id)
+    issue = await get_issue_async(db, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     
     # Strict status workflow enforcement
-    allowed_transitions = {
-        "OPEN": ["TRIAGED"],
-        "TRIAGED": ["IN_PROGRESS"],
-        "IN_PROGRESS": ["DONE"],
-        "DONE": []
-    }
-    if update.status and update.status != issue.status:
-        current = str(issue.status)
-        target = str(update.status)
-        if target not in allowed_transitions.get(current, []):
-            raise HTTPException(status_code=400, detail=f"Invalid status transition: {current} → {target}")
+    error = transition_error(issue.status, update.status)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
     
-    return update_issue(db, issue, update)
+    before = issue_snapshot(issue)
+    issue = await update_issue_async(db, issue, update)
+    background_tasks.add_task(publish_events, issue_events("triaged", before, issue_snapshot(issue)))
+    return issue
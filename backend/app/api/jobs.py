@@ -0,0 +1,69 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_current_principal
+from app.crud.job import enqueue_job_async, get_job_async
+from app.models.job import Job, JobStatus
+from app.models.user import Role
+from app.schemas.job import ExportRequest, JobOut
+from app.schemas.user import Principal
+from app.storage import get_storage
+from app.storage.http import stored_file_response
+
+router = APIRouter()
+
+
+async def visible_job(db: AsyncSession, job_id: int, user: Principal) -> Job:
+    job = await get_job_async(db, job_id)
+    if job is None or (job.user_id != user.id and user.role != Role.ADMIN):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/exports", response_model=JobOut, status_code=202)
+async def create_export(
+    body: ExportRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Queues an export of the matching issues; the worker writes the file and
+    GET /api/jobs/{id}/result downloads it. Repeating a request with the same
+    Idempotency-Key returns the job it created instead of queueing another export.
+    """
+    if user.role == Role.REPORTER:
+        body.reporter_id = user.id
+    job = await enqueue_job_async(
+        db, "issues.export", body.model_dump(mode="json"), user_id=user.id,
+        idempotency_key=f"export:{user.id}:{idempotency_key}" if idempotency_key else None,
+    )
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def read_job(job_id: int, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal)):
+    return await visible_job(db, job_id, user)
+
+
+@router.get("/{job_id}/result")
+async def download_result(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    job = await visible_job(db, job_id, user)
+    if job.kind != "issues.export":
+        raise HTTPException(status_code=404, detail="Job has no file")
+    if job.status != JobStatus.DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    result = json.loads(job.result)
+    return stored_file_response(
+        request, get_storage(), result["key"], f'"job-{job.id}"', result["filename"], result["media_type"], result["size"]
+    )
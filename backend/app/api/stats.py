@@ -1,87 +1,71 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.api.deps import get_db
-from app.schemas.stats import DailyStat
-from app.crud.stats import get_today_stats
-from app.models.issue import Severity, Issue
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.caching import CachedRoute
+from app.api.deps import get_async_read_db
+from app.schemas.stats import DailyStat, TimeseriesPoint
+from app.crud.stats import get_today_stats_async, get_today_rollup_async, get_analytics_async, get_timeseries_async
+from app.models.issue import Severity
 from datetime import date, datetime, timedelta
 import logging
-from sqlalchemy import func
 
-router = APIRouter()
+# Responses are cached and ETagged until the next issue write (see CachedRoute)
+router = APIRouter(route_class=CachedRoute)
 logger = logging.getLogger(__name__)
 
+def degraded(response: Response, fallback):
+    """
+    Marks a fallback answer given because the query failed as no-store, so CachedRoute
+    neither caches nor ETags it and the next request tries the database again.
+    """
+    response.headers["Cache-Control"] = "no-store"
+    return fallback
+
 @router.get("/", response_model=List[DailyStat])
-def read_stats(db: Session = Depends(get_db)):
+async def read_stats(response: Response, db: AsyncSession = Depends(get_async_read_db)):
     try:
-        return get_today_stats(db) or []
+        return await get_today_stats_async(db) or []
     except Exception as e:
         logger.error(f"Error in /api/stats/: {e}")
-        return []
+        return degraded(response, [])
 
 @router.get("/daily", response_model=List[DailyStat])
-def read_stats_daily(db: Session = Depends(get_db)):
+async def read_stats_daily(response: Response, db: AsyncSession = Depends(get_async_read_db)):
     try:
-        return get_today_stats(db) or []
+        return await get_today_stats_async(db) or []
     except Exception as e:
         logger.error(f"Error in /api/stats/daily: {e}")
-        return []
+        return degraded(response, [])
 
 @router.get("/severity")
-def read_severity_stats(db: Session = Depends(get_db)):
+async def read_severity_stats(response: Response, db: AsyncSession = Depends(get_async_read_db)):
     try:
-        results = db.query(Issue.severity, func.count(Issue.id)).filter(func.date(Issue.created_at) == date.today()).group_by(Issue.severity).all()
-        return {str(severity): count for severity, count in results}
+        return {severity: count for severity, count in await get_today_rollup_async(db, "severity")}
     except Exception as e:
         logger.error(f"Error in /api/stats/severity: {e}")
-        return {}
+        return degraded(response, {})
+
+@router.get("/timeseries", response_model=List[TimeseriesPoint])
+async def read_timeseries(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    dimension: str = Query("status", pattern="^(status|severity|priority)$"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    return await get_timeseries_async(db, start, end, bucket=bucket, dimension=dimension)
 
 @router.get("/analytics")
-def read_analytics(db: Session = Depends(get_db)):
+async def read_analytics(response: Response, db: AsyncSession = Depends(get_async_read_db)):
     try:
-        # Get all issues
-        all_issues = db.query(Issue).all()
-        
-        # Calculate counts
-        total_issues = len(all_issues)
-        open_issues = len([i for i in all_issues if i.status == 'OPEN'])
-        in_progress_issues = len([i for i in all_issues if i.status == 'IN_PROGRESS'])
-        completed_issues = len([i for i in all_issues if i.status == 'DONE'])
-        
-        # Priority counts
-        high_priority_issues = len([i for i in all_issues if i.priority == 'CRITICAL' or i.priority == 'BLOCKER'])
-        medium_priority_issues = len([i for i in all_issues if i.priority == 'MINOR'])
-        low_priority_issues = len([i for i in all_issues if i.priority == 'TRIVIAL'])
-        
-        # Recent issues (last 5)
-        recent_issues = db.query(Issue).order_by(Issue.created_at.desc()).limit(5).all()
-        
-        # Issues by status
-        status_counts = {}
-        for status in ['OPEN', 'TRIAGED', 'IN_PROGRESS', 'DONE']:
-            status_counts[status] = len([i for i in all_issues if i.status == status])
-        
-        # Issues by severity
-        severity_counts = {}
-        for severity in ['LOW', 'MEDIUM', 'HIGH']:
-            severity_counts[severity] = len([i for i in all_issues if i.severity == severity])
-        
-        return {
-            "total_issues": total_issues,
-            "open_issues": open_issues,
-            "in_progress_issues": in_progress_issues,
-            "completed_issues": completed_issues,
-            "high_priority_issues": high_priority_issues,
-            "medium_priority_issues": medium_priority_issues,
-            "low_priority_issues": low_priority_issues,
-            "recent_issues": recent_issues,
-            "issues_by_status": status_counts,
-            "issues_by_severity": severity_counts
-        }
+        return await get_analytics_async(db)
     except Exception as e:
         logger.error(f"Error in /api/stats/analytics: {e}")
-        return {
+        return degraded(response, {
             "total_issues": 0,
             "open_issues": 0,
             "in_progress_issues": 0,
@@ -92,4 +76,4 @@ def read_analytics(db: Session = Depends(get_db)):
             "recent_issues": [],
             "issues_by_status": {},
             "issues_by_severity": {}
-        }
+        })
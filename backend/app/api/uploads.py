@@ -0,0 +1,150 @@
+import fcntl
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+from app.api.deps import get_async_db, get_current_principal
+from app.core.config import settings
+from app.crud.attachment import blob_lock_async, upload_limit_async
+from app.crud.upload import (
+    create_upload_session_async,
+    get_upload_session_async,
+    advance_upload_async,
+    complete_upload_async,
+    delete_upload_session_async,
+)
+from app.models.upload import UploadSession
+from app.schemas.upload import UploadCreate, UploadOut
+from app.schemas.user import Principal
+from app.storage import get_storage, hash_file, partial_path, store_file
+
+router = APIRouter()
+
+# Resumable upload protocol, modelled on tus:
+#   POST   /api/uploads            declare filename and size, get an upload id
+#   HEAD   /api/uploads/{id}       Upload-Offset: how many bytes the server has
+#   PATCH  /api/uploads/{id}       send bytes from Upload-Offset on; repeat until done
+#   POST   /api/issues/{id}/attachments {"upload_id": ...} attaches the finished file
+# A dropped PATCH keeps the bytes that arrived, so clients resume from the HEAD offset.
+
+
+def upload_out(upload: UploadSession) -> UploadOut:
+    return UploadOut(
+        id=upload.id, filename=upload.filename, content_type=upload.content_type, size=upload.size,
+        offset=upload.offset, complete=upload.sha256 is not None, expires_at=upload.expires_at,
+    )
+
+
+def offset_headers(upload: UploadSession) -> dict:
+    return {"Upload-Offset": str(upload.offset), "Upload-Length": str(upload.size), "Cache-Control": "no-store"}
+
+
+async def owned_upload(upload_id: str, db: AsyncSession, user: Principal) -> UploadSession:
+    upload = await get_upload_session_async(db, upload_id)
+    if upload is None or upload.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+@router.post("/", response_model=UploadOut, status_code=201)
+async def start_upload(
+    body: UploadCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    limit, reason = await upload_limit_async(db, user.id, settings.MAX_RESUMABLE_UPLOAD_BYTES)
+    if body.size > limit:
+        raise HTTPException(status_code=413, detail=reason)
+    upload = await create_upload_session_async(db, user.id, body.filename, body.content_type, body.size)
+    response.headers["Location"] = f"/api/uploads/{upload.id}"
+    return upload_out(upload)
+
+
+@router.get("/{upload_id}", response_model=UploadOut)
+async def read_upload(upload_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal)):
+    return upload_out(await owned_upload(upload_id, db, user))
+
+
+@router.head("/{upload_id}")
+async def upload_offset(upload_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal)):
+    upload = await owned_upload(upload_id, db, user)
+    return Response(headers=offset_headers(upload))
+
+
+@router.patch("/{upload_id}", status_code=204)
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Appends the request body at Upload-Offset. The body is streamed to the partial file
+    as it arrives, so memory use does not depend on the chunk or file size. One request
+    writes at a time: the partial file is locked before it is touched, and a concurrent
+    PATCH gets a 409 instead of interleaving its bytes. No transaction is held while
+    the body streams; the new offset is recorded by compare-and-swap afterwards.
+    """
+    upload = await owned_upload(upload_id, db, user)
+    if upload.sha256 is not None:
+        raise HTTPException(status_code=409, detail="Upload already complete", headers=offset_headers(upload))
+    if upload_offset != upload.offset:
+        raise HTTPException(status_code=409, detail="Upload-Offset does not match", headers=offset_headers(upload))
+
+    path = partial_path(upload.id)
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        # Expired or cancelled since the row was read
+        raise HTTPException(status_code=404, detail="Upload not found")
+    with f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)  # released when the file is closed
+        except BlockingIOError:
+            raise HTTPException(status_code=409, detail="Another request is writing this upload",
+                                headers=offset_headers(upload))
+        # Another request may have written and committed since the checks above
+        await db.refresh(upload)
+        if upload.sha256 is not None or upload_offset != upload.offset:
+            raise HTTPException(status_code=409, detail="Upload-Offset does not match", headers=offset_headers(upload))
+        # Give the connection back for the (possibly minutes long) transfer
+        await db.commit()
+
+        offset = upload.offset
+        too_large = False
+        # Drop bytes past the committed offset left by a request that died before committing
+        await run_in_threadpool(f.truncate, offset)
+        f.seek(offset)
+        try:
+            async for chunk in request.stream():
+                if offset + len(chunk) > upload.size:
+                    too_large = True
+                    break
+                await run_in_threadpool(f.write, chunk)
+                offset += len(chunk)
+        except ClientDisconnect:
+            pass  # keep what arrived; the client resumes from the new offset
+        await run_in_threadpool(f.flush)
+
+        if not await advance_upload_async(db, upload, offset):
+            raise HTTPException(status_code=409, detail="Upload-Offset does not match")
+        if too_large:
+            raise HTTPException(status_code=413, detail="More bytes than the declared upload size", headers=offset_headers(upload))
+
+        if upload.offset == upload.size:
+            storage = get_storage()
+            sha256 = await run_in_threadpool(hash_file, path)
+            async with blob_lock_async(db, storage, sha256):
+                await run_in_threadpool(store_file, storage, path, sha256)
+                await complete_upload_async(db, upload, sha256)
+    return Response(status_code=204, headers=offset_headers(upload))
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def cancel_upload(upload_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_principal)):
+    upload = await owned_upload(upload_id, db, user)
+    await delete_upload_session_async(db, upload)
+    return None
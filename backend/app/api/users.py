@@ -1,12 +1,51 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from app.api.deps import get_db
-from app.crud.user import get_users
-from app.schemas.user import User, UserCreate, UserLogin
+from app.api.auth import password_pool_busy
+from app.api.deps import get_db, get_async_db, get_async_read_db, require_admin
+from app.core.security import PasswordPoolBusy
+from app.crud.user import (
+    get_users_async,
+    get_user_async,
+    update_role_async,
+    has_issues_async,
+    delete_user_async,
+    bulk_create_users_async,
+)
+from app.schemas.user import User, UserCreate, UserLogin, RoleUpdate, BulkUserResult
 
 router = APIRouter()
 
+BULK_USERS_MAX = 10000
+
 @router.get("/", response_model=List[User])
-def list_users(db: Session = Depends(get_db)):
-    return get_users(db)
+async def list_users(db: AsyncSession = Depends(get_async_read_db)):
+    return await get_users_async(db)
+
+@router.patch("/{user_id}/role", response_model=User)
+async def change_role(user_id: int, update: RoleUpdate, db: AsyncSession = Depends(get_async_db), admin=Depends(require_admin)):
+    db_user = await get_user_async(db, user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await update_role_async(db, db_user, update.role)
+
+@router.delete("/{user_id}", status_code=204)
+async def remove_user(user_id: int, db: AsyncSession = Depends(get_async_db), admin=Depends(require_admin)):
+    db_user = await get_user_async(db, user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if await has_issues_async(db, user_id):
+        raise HTTPException(status_code=409, detail="User still has reported issues")
+    await delete_user_async(db, db_user)
+    return None
+
+@router.post("/bulk", response_model=BulkUserResult)
+async def bulk_create(users: List[UserCreate], db: Session = Depends(get_db), admin=Depends(require_admin)):
+    if len(users) > BULK_USERS_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_USERS_MAX} users per request")
+    try:
+        created, skipped = await bulk_create_users_async(db, users)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+    return {"created": len(created), "skipped": skipped}
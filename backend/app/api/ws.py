@@ -0,0 +1,74 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.api.deps import websocket_principal
+from app.models.user import Role
+from app.utils.broker import broker
+from app.utils.events import ALL_ISSUES, STATS, MINE, hub, reporter_topic
+from app.utils.websocket import Connection, manager
+
+router = APIRouter()
+
+
+def parse_topics(connection: Connection, topics) -> set[str]:
+    """
+    Keeps the topics a client may ask for and resolves "mine" to the user's own topic.
+    Reporters asking for all issues get their own, as in list_issues.
+    """
+    valid = set()
+    for topic in topics:
+        topic = topic.strip()
+        if topic == MINE or (topic == ALL_ISSUES and connection.own_only):
+            valid.add(reporter_topic(connection.user_id))
+        elif topic in (ALL_ISSUES, STATS) or (topic.startswith("issue:") and topic[len("issue:"):].isdigit()):
+            valid.add(topic)
+    return valid
+
+
+def handle_client_message(connection: Connection, text: str):
+    """
+    Client control messages:
+      {"action": "subscribe", "topics": [...]}
+      {"action": "unsubscribe", "topics": [...]}
+      {"action": "resume", "since": "<epoch>:<seq>"}
+    Anything else (pongs included) is ignored.
+    """
+    try:
+        message = json.loads(text)
+        action = message.get("action")
+    except (ValueError, AttributeError):
+        return
+    if action == "subscribe":
+        manager.subscribe(connection, parse_topics(connection, message.get("topics") or []))
+    elif action == "unsubscribe":
+        manager.unsubscribe(connection, parse_topics(connection, message.get("topics") or []))
+    elif action == "resume" and isinstance(message.get("since"), str):
+        hub.replay(connection, message["since"])
+
+
+@router.websocket("/ws/issues")
+async def websocket_endpoint(websocket: WebSocket, topics: str = ALL_ISSUES, since: Optional[str] = None):
+    """
+    Live issue events. Authenticate with ?token=<JWT>; ?topics=issues,stats picks the
+    initial topics; ?since=<epoch>:<seq> (the last event seen) replays what was missed
+    while disconnected. The user's role is fixed for the life of the connection.
+    """
+    principal = await websocket_principal(websocket)
+    if principal is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # Subscribe this process to the bus on its first client; later calls are no-ops
+    await broker.subscribe(hub.dispatch)
+    connection = await manager.connect(websocket, principal.id, own_only=principal.role == Role.REPORTER)
+    manager.subscribe(connection, parse_topics(connection, topics.split(",")))
+    if since:
+        hub.replay(connection, since)
+    try:
+        while True:
+            handle_client_message(connection, await websocket.receive_text())
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # client left, or the manager closed a slow connection
+    finally:
+        manager.disconnect(connection)
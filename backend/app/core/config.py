@@ -7,7 +7,27 @@ class Settings(BaseSettings):
     
     # Use SQLite for development (easier setup)
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./tracker.db"
-    
+    # Async engine used by read endpoints; derived from SQLALCHEMY_DATABASE_URI when unset
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    SQLALCHEMY_ASYNC_DATABASE_URI: str | None = None
+
+    # Optional read replica serving GET endpoints. A user who has just written is kept on
+    # the primary for READ_AFTER_WRITE_SECONDS (from the start of the write request) so
+    # they see their own changes despite replication lag.
+    SQLALCHEMY_READ_DATABASE_URI: str | None = None
+    SQLALCHEMY_ASYNC_READ_DATABASE_URI: str | None = None
+    READ_AFTER_WRITE_SECONDS: int = 5
+
+    # Connection pool (applies to each engine separately)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL only; 0 disables
+    SQLITE_WAL: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
     # PostgreSQL settings (for production)
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "281003"
@@ -15,6 +35,71 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: str = "5432"
 
+    # Stats rollups are maintained on every issue write; this job only corrects drift
+    STATS_RECONCILE_INTERVAL_MINUTES: int = 30
+    STATS_RECONCILE_DAYS: int = 2
+
+    # Background jobs run by the worker service (worker/main.py) from the jobs table
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10  # doubles after every failed attempt
+    JOB_RETRY_MAX_SECONDS: float = 3600
+    JOB_LOCK_TIMEOUT_SECONDS: int = 900  # running jobs without a heartbeat for this long are assumed lost and retried
+    JOB_HEARTBEAT_SECONDS: float = 60  # how often a running job refreshes its lock; keep well below the timeout
+    JOB_RETENTION_HOURS: int = 24  # finished jobs and their export files are kept this long
+    JOB_WORKER_METRICS_PORT: int = 0  # serve /metrics from the worker on this port; 0 disables
+
+    # In-process cache of authenticated principals (per worker process)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Rendered /api/stats responses, keyed by URL and role and invalidated by every issue
+    # write. memory:// is per worker (entries and ETags then roll over every TTL window);
+    # redis://… shares entries and invalidation between workers.
+    STATS_CACHE_URL: str = "memory://"
+    STATS_CACHE_TTL_SECONDS: int = 30
+    STATS_CACHE_MAX_SIZE: int = 1000
+
+    # Dedicated pool for bcrypt work so login bursts don't starve other endpoints
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" | "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # beyond this, password requests fail fast with 503
+
+    # Attachment storage; S3 credentials come from the usual AWS_* environment variables
+    STORAGE_BACKEND: str = "local"  # "local" | "s3"
+    STORAGE_LOCAL_ROOT: str = "uploaded_files"
+    STORAGE_S3_BUCKET: str = "tracker-attachments"
+    STORAGE_S3_ENDPOINT_URL: str | None = None  # set for MinIO and other S3-compatible stores
+    STORAGE_S3_REGION: str | None = None
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024
+    USER_STORAGE_QUOTA_BYTES: int = 1024 * 1024 * 1024  # attachments plus open upload sessions, per user
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    # When set (e.g. "/protected-attachments"), local attachments are handed to nginx via
+    # X-Accel-Redirect instead of being streamed by the API; see nginx/default.conf
+    STORAGE_ACCEL_REDIRECT_PREFIX: str | None = None
+
+    # Resumable uploads (/api/uploads). Partial files live in UPLOAD_PARTIAL_DIR, or in the
+    # local storage root when unset; it must be shared by all API workers.
+    UPLOAD_PARTIAL_DIR: str | None = None
+    MAX_RESUMABLE_UPLOAD_BYTES: int = 1024 * 1024 * 1024  # per file; MAX_UPLOAD_BYTES caps form posts
+    UPLOAD_SESSION_TTL_HOURS: int = 24  # idle time before an unfinished upload is discarded
+    UPLOAD_CLEANUP_INTERVAL_MINUTES: int = 30
+
+    # WebSocket fan-out (per connection)
+    WS_QUEUE_SIZE: int = 100
+    WS_SLOW_CONSUMER_POLICY: str = "drop_oldest"  # "drop_oldest" | "coalesce" | "disconnect"
+    WS_SEND_TIMEOUT_SECONDS: float = 10
+    WS_PING_INTERVAL_SECONDS: float = 25
+    WS_REPLAY_BUFFER_SIZE: int = 1000  # recent events kept for clients resuming with ?since=
+
+    # Pub/sub bus carrying WebSocket events between API processes. memory:// only reaches
+    # this process; use postgresql://… (LISTEN/NOTIFY) or redis://… with several workers.
+    BROKER_URL: str = "memory://"
+    BROKER_CHANNEL: str = "tracker_events"
+
     class Config:
         case_sensitive = True
 
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.metrics import prometheus as metrics
 
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
@@ -20,3 +25,74 @@ def verify_password(plain_password, hashed_password):
 
 def get_password_hash(password):
     return pwd_context.hash(password)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password worker pool already has PASSWORD_HASH_MAX_PENDING jobs."""
+
+
+_executor: Executor | None = None
+_pending = 0
+_lock = threading.Lock()
+
+
+def _get_executor() -> Executor:
+    # Created lazily so importing this module never forks worker processes
+    global _executor
+    with _lock:
+        if _executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password",
+                )
+        return _executor
+
+
+async def _run_password_job(fn, *args):
+    global _pending
+    with _lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            metrics.password_jobs_rejected.inc()
+            raise PasswordPoolBusy()
+        _pending += 1
+    metrics.password_jobs_pending.inc()
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    finally:
+        with _lock:
+            _pending -= 1
+        metrics.password_jobs_pending.dec()
+        metrics.password_job_seconds.observe(time.perf_counter() - started)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password):
+    return await _run_password_job(get_password_hash, password)
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hashes many passwords on the password pool, at most PASSWORD_HASH_WORKERS at a time,
+    so logins queued behind a bulk job wait for one round of hashes, not for all of them.
+    Each hash is a regular password job: it counts against PASSWORD_HASH_MAX_PENDING
+    (raising PasswordPoolBusy when the pool is saturated) and in the password metrics.
+    """
+    step = settings.PASSWORD_HASH_WORKERS
+    hashes = []
+    for i in range(0, len(passwords), step):
+        hashes += await asyncio.gather(*(_run_password_job(get_password_hash, p) for p in passwords[i:i + step]))
+    return hashes
+
+
+def hash_passwords(passwords: list[str], executor: Executor) -> list[str]:
+    """
+    Hashes many passwords in parallel on the given executor (used by offline provisioning).
+    """
+    return list(executor.map(get_password_hash, passwords, chunksize=32))
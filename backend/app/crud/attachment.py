@@ -0,0 +1,114 @@
+import fcntl
+import os
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.upload import UploadSession
+from app.storage import StorageBackend, blob_key
+
+
+def user_storage_used(db: Session, user_id: int) -> int:
+    """
+    Total bytes of the user's attachments plus the declared size of their open upload
+    sessions, which reserve their space from the start. Deduplicated content still
+    counts per upload.
+    """
+    attachments = select(func.coalesce(func.sum(Attachment.size), 0)).where(Attachment.uploader_id == user_id)
+    uploads = select(func.coalesce(func.sum(UploadSession.size), 0)).where(UploadSession.user_id == user_id)
+    return db.execute(attachments).scalar() + db.execute(uploads).scalar()
+
+
+def upload_limit(db: Session, user_id: int, max_bytes: int | None = None) -> tuple[int, str]:
+    """
+    Largest upload the user may make right now, and the message to report if they exceed it.
+    max_bytes is the per-file cap (MAX_UPLOAD_BYTES by default).
+    """
+    return _limit_for(user_storage_used(db, user_id), max_bytes or settings.MAX_UPLOAD_BYTES)
+
+
+async def upload_limit_async(db: AsyncSession, user_id: int, max_bytes: int | None = None) -> tuple[int, str]:
+    return _limit_for(await db.run_sync(user_storage_used, user_id), max_bytes or settings.MAX_UPLOAD_BYTES)
+
+
+def _limit_for(used: int, max_bytes: int) -> tuple[int, str]:
+    remaining = settings.USER_STORAGE_QUOTA_BYTES - used
+    if remaining < max_bytes:
+        return max(remaining, 0), "Storage quota exceeded"
+    return max_bytes, f"File larger than {max_bytes} bytes"
+
+
+def new_attachment(uploader_id: int, filename: str, content_type: str | None, sha256: str, size: int) -> Attachment:
+    return Attachment(uploader_id=uploader_id, filename=filename, content_type=content_type, sha256=sha256, size=size)
+
+
+# ─────────────────────────────────────────────────────
+# Blob locks. Storing a blob (which may just reuse the stored copy) and committing the
+# row that references it must not interleave with release_blobs checking for references
+# and deleting, or a fresh reference can end up pointing at a deleted blob. Hold
+# blob_lock(db, storage, sha256) across store_file() and the commit of the new
+# attachment or upload row. On PostgreSQL it is a transaction-scoped advisory lock,
+# released by that commit (or a rollback); elsewhere it is a file lock in the storage
+# temp directory, shared by the processes of one host.
+
+def _advisory_key(sha256: str) -> int:
+    return int(sha256[:15], 16)  # fits a signed bigint
+
+
+def _lock_path(storage: StorageBackend, sha256: str) -> str:
+    directory = storage.temp_dir or os.path.join(tempfile.gettempdir(), "tracker-uploads")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"blob-{sha256[:2]}.lock")  # 256 stripes
+
+
+@contextmanager
+def blob_lock(db: Session, storage: StorageBackend, sha256: str):
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _advisory_key(sha256)})
+        yield
+        return
+    with open(_lock_path(storage, sha256), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)  # released when the file is closed
+        yield
+
+
+@asynccontextmanager
+async def blob_lock_async(db: AsyncSession, storage: StorageBackend, sha256: str):
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _advisory_key(sha256)})
+        yield
+        return
+    with open(_lock_path(storage, sha256), "a") as f:
+        await run_in_threadpool(fcntl.flock, f, fcntl.LOCK_EX)
+        yield
+
+
+def _references(sha256: str):
+    return select(Attachment.id).where(Attachment.sha256 == sha256).union_all(
+        select(UploadSession.id).where(UploadSession.sha256 == sha256)
+    ).limit(1)
+
+
+def release_blobs(db: Session, storage: StorageBackend, hashes):
+    """
+    Deletes stored blobs that neither an attachment nor a finished upload references any
+    more. Call after committing the deletion of the rows that referenced them.
+    """
+    for sha256 in set(h for h in hashes if h):
+        with blob_lock(db, storage, sha256):
+            if db.execute(_references(sha256)).first() is None:
+                storage.delete(blob_key(sha256))
+            db.commit()
+
+
+async def release_blobs_async(db: AsyncSession, storage: StorageBackend, hashes):
+    for sha256 in set(h for h in hashes if h):
+        async with blob_lock_async(db, storage, sha256):
+            if (await db.execute(_references(sha256))).first() is None:
+                await run_in_threadpool(storage.delete, blob_key(sha256))
+            await db.commit()
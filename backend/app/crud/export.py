@@ -0,0 +1,60 @@
+from typing import Callable, Iterator
+
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.crud.issue import filter_issues
+from app.models.issue import Issue
+from app.models.tag import Tag, issue_tags
+
+# Exported fields, in file column order. Enum columns are read as their stored strings,
+# which skips per-value Enum conversion and is what every output format writes anyway.
+EXPORT_COLUMNS = (
+    Issue.id,
+    Issue.title,
+    Issue.description,
+    type_coerce(Issue.severity, String).label("severity"),
+    type_coerce(Issue.status, String).label("status"),
+    type_coerce(Issue.priority, String).label("priority"),
+    Issue.reporter_id,
+    Issue.created_at,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS) + ("tags",)
+
+
+def iter_issue_batches(db: Session, batch_size: int = 5000, **filters) -> Iterator[list[tuple]]:
+    """
+    Yields every issue matching the list filters (reporter_id, status, severity, priority,
+    tag, created_from, created_to) in (created_at, id) order, as batches of tuples shaped
+    like EXPORT_FIELDS. Rows are streamed from a server-side cursor and each batch's tags
+    are fetched with one query, so memory use depends on batch_size, not on the number
+    of issues.
+    """
+    stmt = filter_issues(select(*EXPORT_COLUMNS), **filters).order_by(Issue.created_at, Issue.id)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            tags = {row[0]: [] for row in rows}
+            tag_rows = db.execute(
+                select(issue_tags.c.issue_id, Tag.name)
+                .join(Tag, Tag.id == issue_tags.c.tag_id)
+                .where(issue_tags.c.issue_id.in_(tags))
+                .order_by(Tag.name)
+            )
+            for issue_id, name in tag_rows:
+                tags[issue_id].append(name)
+            yield [(*row, tags[row[0]]) for row in rows]
+    finally:
+        result.close()
+
+
+def stream_issue_batches(session_factory: Callable[[], Session], batch_size: int = 5000, **filters) -> Iterator[list[tuple]]:
+    """
+    iter_issue_batches on a session of its own, closed when the iterator is exhausted or
+    closed; for responses that outlive the request's dependencies.
+    """
+    db = session_factory()
+    try:
+        yield from iter_issue_batches(db, batch_size=batch_size, **filters)
+    finally:
+        db.close()
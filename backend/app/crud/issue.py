@@ -1,27 +1,68 @@
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select, text, tuple_, func, update
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.issue import Issue
-from app.schemas.issue import IssueCreate, IssueUpdate
+from app.db.session import dialect_insert
+from app.models.issue import Issue, Status, Severity, Priority
+from app.models.tag import Tag, issue_tags
+from app.models.attachment import Attachment
+from app.models.user import User
+from app.schemas.issue import IssueCreate, IssueImport, IssueUpdate
+from app.crud.stats import (
+    ROLLUP_DIMENSIONS,
+    add_issue_deltas,
+    apply_deltas,
+    record_issue_created,
+    record_issue_updated,
+    record_issue_deleted,
+)
 from datetime import datetime
+import base64
+import io
 
 
-def create_issue(db: Session, issue: IssueCreate, reporter_id: int) -> Issue:
-    tags_str = None
+def get_or_create_tags(db: Session, names: list[str]) -> list[Tag]:
+    """
+    Returns Tag rows for the given names, creating missing ones. Concurrent creation of
+    the same name is resolved by the unique index (ON CONFLICT DO NOTHING).
+    """
+    names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+    if not names:
+        return []
+    stmt = dialect_insert(db)(Tag).values([{"name": n} for n in names]).on_conflict_do_nothing(index_elements=["name"])
+    db.execute(stmt)
+    return db.query(Tag).filter(Tag.name.in_(names)).all()
+
+
+def create_issue(db: Session, issue: IssueCreate, reporter_id: int, attachments: list[Attachment] = ()) -> Issue:
+    db_issue = Issue(**issue.dict(exclude_unset=True, exclude={"tags"}), reporter_id=reporter_id, created_at=datetime.utcnow())
     if issue.tags:
-        tags_str = ','.join(issue.tags)
-    db_issue = Issue(**issue.dict(exclude_unset=True, exclude={"tags"}), tags=tags_str, reporter_id=reporter_id, created_at=datetime.utcnow())
+        db_issue.tag_objects = get_or_create_tags(db, issue.tags)
+    db_issue.attachments = list(attachments)
     db.add(db_issue)
+    db.flush()
+    record_issue_created(db, db_issue)
     db.commit()
     db.refresh(db_issue)
     return db_issue
 
 
+# The async write variants run the sync implementation on the AsyncSession's own
+# connection (run_sync), so tag upserts and rollup deltas have a single code path.
+
+async def create_issue_async(
+    db: AsyncSession, issue: IssueCreate, reporter_id: int, attachments: list[Attachment] = ()
+) -> Issue:
+    return await db.run_sync(create_issue, issue, reporter_id, attachments)
+
+
 def get_issue(db: Session, issue_id: int) -> Issue | None:
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    if issue and issue.tags:
-        issue.tags = issue.tags.split(',')
-    elif issue:
-        issue.tags = []
-    return issue
+    return db.query(Issue).filter(Issue.id == issue_id).first()
+
+
+async def get_issue_async(db: AsyncSession, issue_id: int) -> Issue | None:
+    return await db.get(Issue, issue_id)
 
 
 def get_issues(db: Session, skip: int = 0, limit: int = 100):
@@ -35,26 +76,497 @@ def get_issues_by_user(db: Session, user_id: int):
     return db.query(Issue).filter(Issue.reporter_id == user_id).all()
 
 
+def encode_cursor(issue: Issue) -> str:
+    """
+    Returns an opaque cursor pointing at the (created_at, id) key of an issue.
+    """
+    raw = f"{issue.created_at.isoformat()}|{issue.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Inverse of encode_cursor. Raises ValueError on a malformed cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, issue_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(issue_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def filter_issues(
+    stmt,
+    *,
+    reporter_id: int | None = None,
+    status: Status | None = None,
+    severity: Severity | None = None,
+    priority: Priority | None = None,
+    tag: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+):
+    """
+    Applies the issues list filters to a select over issues.
+    """
+    if reporter_id is not None:
+        stmt = stmt.where(Issue.reporter_id == reporter_id)
+    if status is not None:
+        stmt = stmt.where(Issue.status == status)
+    if severity is not None:
+        stmt = stmt.where(Issue.severity == severity)
+    if priority is not None:
+        stmt = stmt.where(Issue.priority == priority)
+    if tag:
+        stmt = stmt.where(Issue.tag_objects.any(Tag.name == tag))
+    if created_from is not None:
+        stmt = stmt.where(Issue.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Issue.created_at < created_to)
+    return stmt
+
+
+def _page_statement(
+    *,
+    columns=(Issue,),
+    reporter_id: int | None = None,
+    status: Status | None = None,
+    severity: Severity | None = None,
+    priority: Priority | None = None,
+    tag: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    order: str = "desc",
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = 100,
+):
+    if after and before:
+        raise ValueError("Only one of 'after' and 'before' may be given")
+
+    stmt = filter_issues(
+        select(*columns),
+        reporter_id=reporter_id,
+        status=status,
+        severity=severity,
+        priority=priority,
+        tag=tag,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+    descending = order == "desc"
+    backwards = before is not None
+    # Walking backwards flips both the comparison and the scan direction;
+    # the fetched rows are reversed again in _page_result.
+    scan_desc = descending != backwards
+
+    key = tuple_(Issue.created_at, Issue.id)
+    cursor = after or before
+    if cursor:
+        created_at, issue_id = decode_cursor(cursor)
+        bound = (created_at, issue_id)
+        stmt = stmt.where(key < bound if scan_desc else key > bound)
+
+    if scan_desc:
+        stmt = stmt.order_by(Issue.created_at.desc(), Issue.id.desc())
+    else:
+        stmt = stmt.order_by(Issue.created_at.asc(), Issue.id.asc())
+    return stmt.limit(limit + 1)
+
+
+def _page_result(rows: list[Issue], limit: int, after: str | None, before: str | None):
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    backwards = before is not None
+    if backwards:
+        items.reverse()
+
+    if not items:
+        return items, None, None
+    if backwards:
+        next_cursor = encode_cursor(items[-1])
+        prev_cursor = encode_cursor(items[0]) if has_more else None
+    else:
+        next_cursor = encode_cursor(items[-1]) if has_more else None
+        prev_cursor = encode_cursor(items[0]) if after else None
+    return items, next_cursor, prev_cursor
+
+
+def list_issues_page(db: Session, **filters) -> tuple[list[Issue], str | None, str | None]:
+    """
+    Returns one page of issues using keyset pagination on (created_at, id),
+    together with the cursors of the next and previous pages (None at either end).
+
+    Filters: reporter_id, status, severity, priority, tag, created_from, created_to,
+    order ("asc" | "desc"), after / before (cursors) and limit (default 100).
+    `after` continues forward from a cursor, `before` walks back from one; the
+    cost of a page does not depend on how deep the cursor is.
+    """
+    rows = db.execute(_page_statement(**filters)).scalars().all()
+    return _page_result(rows, filters.get("limit", 100), filters.get("after"), filters.get("before"))
+
+
+async def list_issues_page_async(db: AsyncSession, **filters) -> tuple[list[Issue], str | None, str | None]:
+    """
+    Async list_issues_page; takes the same filters.
+    """
+    rows = (await db.execute(_page_statement(**filters))).scalars().all()
+    return _page_result(rows, filters.get("limit", 100), filters.get("after"), filters.get("before"))
+
+
+# Columns of IssueOut that live on the issues row; tags and attachments are fetched
+# separately for the whole page
+ISSUE_ROW_COLUMNS = (
+    Issue.id,
+    Issue.title,
+    Issue.description,
+    Issue.severity,
+    Issue.status,
+    Issue.priority,
+    Issue.reporter_id,
+    Issue.created_at,
+)
+ATTACHMENT_ROW_COLUMNS = (
+    Attachment.issue_id,
+    Attachment.id,
+    Attachment.filename,
+    Attachment.content_type,
+    Attachment.size,
+    Attachment.sha256,
+    Attachment.created_at,
+)
+
+
+async def _issue_dicts_async(db: AsyncSession, rows) -> list[dict]:
+    items = [row._asdict() for row in rows]
+    by_id = {}
+    for item in items:
+        item["tags"] = []
+        item["attachments"] = []
+        by_id[item["id"]] = item
+    if not by_id:
+        return items
+
+    tags = await db.execute(
+        select(issue_tags.c.issue_id, Tag.name)
+        .join(Tag, Tag.id == issue_tags.c.tag_id)
+        .where(issue_tags.c.issue_id.in_(by_id))
+        .order_by(Tag.name)
+    )
+    for issue_id, name in tags:
+        by_id[issue_id]["tags"].append(name)
+
+    attachments = await db.execute(
+        select(*ATTACHMENT_ROW_COLUMNS).where(Attachment.issue_id.in_(by_id)).order_by(Attachment.id)
+    )
+    for row in attachments:
+        attachment = row._asdict()
+        by_id[attachment.pop("issue_id")]["attachments"].append(attachment)
+    return items
+
+
+async def list_issue_rows_page_async(db: AsyncSession, **filters) -> tuple[list[dict], str | None, str | None]:
+    """
+    list_issues_page_async for responses: the same page and cursors, but as plain dicts
+    shaped like IssueOut, built from column tuples in three queries without loading
+    ORM entities.
+    """
+    rows = (await db.execute(_page_statement(columns=ISSUE_ROW_COLUMNS, **filters))).all()
+    rows, next_cursor, prev_cursor = _page_result(
+        rows, filters.get("limit", 100), filters.get("after"), filters.get("before")
+    )
+    return await _issue_dicts_async(db, rows), next_cursor, prev_cursor
+
+
 def update_issue(db: Session, db_issue: Issue, updates: IssueUpdate) -> Issue:
     update_data = updates.dict(exclude_unset=True)
     tags = update_data.pop("tags", None)
+    previous = {dimension: getattr(db_issue, dimension) for dimension in ROLLUP_DIMENSIONS}
     for key, value in update_data.items():
         setattr(db_issue, key, value)
     if tags is not None:
-        db_issue.tags = ','.join(tags)
+        db_issue.tag_objects = get_or_create_tags(db, tags)
+    record_issue_updated(db, db_issue, previous)
     db.commit()
     db.refresh(db_issue)
-    if db_issue.tags:
-        db_issue.tags = db_issue.tags.split(',')
-    else:
-        db_issue.tags = []
     return db_issue
 
 
+async def update_issue_async(db: AsyncSession, db_issue: Issue, updates: IssueUpdate) -> Issue:
+    return await db.run_sync(update_issue, db_issue, updates)
+
+
 def delete_issue(db: Session, issue_id: int) -> bool:
     issue = db.query(Issue).filter(Issue.id == issue_id).first()
     if issue:
+        record_issue_deleted(db, issue)
         db.delete(issue)
         db.commit()
         return True
     return False
+
+
+async def delete_issue_async(db: AsyncSession, issue_id: int) -> bool:
+    return await db.run_sync(delete_issue, issue_id)
+
+
+def _tag_counts_statement(reporter_id: int | None):
+    stmt = (
+        select(Tag.name, func.count(issue_tags.c.issue_id))
+        .join(issue_tags, issue_tags.c.tag_id == Tag.id)
+    )
+    if reporter_id is not None:
+        stmt = stmt.join(Issue, Issue.id == issue_tags.c.issue_id).where(Issue.reporter_id == reporter_id)
+    return stmt.group_by(Tag.name).order_by(func.count(issue_tags.c.issue_id).desc(), Tag.name)
+
+
+def get_tag_counts(db: Session, reporter_id: int | None = None) -> list[tuple[str, int]]:
+    """
+    Returns (tag, issue count) pairs, most used first. Without a reporter filter the
+    count is answered from the (tag_id, issue_id) index alone.
+    """
+    return [tuple(row) for row in db.execute(_tag_counts_statement(reporter_id))]
+
+
+async def get_tag_counts_async(db: AsyncSession, reporter_id: int | None = None) -> list[tuple[str, int]]:
+    return [tuple(row) for row in await db.execute(_tag_counts_statement(reporter_id))]
+
+
+# ─────────────────────────────────────────────────────
+# Status workflow
+
+STATUS_TRANSITIONS = {
+    Status.OPEN: {Status.TRIAGED},
+    Status.TRIAGED: {Status.IN_PROGRESS},
+    Status.IN_PROGRESS: {Status.DONE},
+    Status.DONE: set(),
+}
+
+
+def transition_error(current: Status | None, target: Status | None) -> str | None:
+    """
+    Why an issue may not move from `current` to `target`, or None if it may. Keeping the
+    current status is always allowed.
+    """
+    if target is None or target == current or target in STATUS_TRANSITIONS.get(current, ()):
+        return None
+    return f"Invalid status transition: {_value(current)} → {_value(target)}"
+
+
+def _value(v):
+    return getattr(v, "value", v)
+
+
+# ─────────────────────────────────────────────────────
+# Bulk import and batch triage
+
+_import_rows = TypeAdapter(list[IssueImport])
+_import_row = TypeAdapter(IssueImport)
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"] for e in error.errors()
+    )
+
+
+def validate_issue_lines(lines: list[tuple[int, bytes]]) -> tuple[list[tuple[int, IssueImport]], list[dict]]:
+    """
+    Parses (line number, NDJSON line) pairs into IssueImport rows. A clean batch is
+    validated in one pass; a batch with any bad line is revalidated line by line so the
+    good ones still go through. Returns (numbered rows, errors).
+    """
+    try:
+        items = _import_rows.validate_json(b"[" + b",".join(line for _, line in lines) + b"]")
+        return [(number, item) for (number, _), item in zip(lines, items)], []
+    except ValidationError:
+        pass
+    valid, errors = [], []
+    for number, line in lines:
+        try:
+            valid.append((number, _import_row.validate_json(line)))
+        except ValidationError as e:
+            errors.append({"line": number, "error": _describe(e)})
+    return valid, errors
+
+
+# Issue columns written by imports; ids are generated or preallocated
+IMPORT_COLUMNS = ["title", "description", "severity", "status", "priority", "reporter_id", "created_at"]
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    value = str(_value(value))
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(db: Session, table: str, columns: list[str], rows: list[dict]):
+    """
+    Loads rows into a PostgreSQL table with COPY, inside the session's transaction.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[c]) for c in columns) + "\n")
+    buffer.seek(0)
+    connection = db.connection()
+    dbapi_error = connection.dialect.loaded_dbapi.Error
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    except dbapi_error as e:
+        # Raw cursor errors bypass SQLAlchemy; wrap them like any failed statement so
+        # callers' SQLAlchemyError handling (and rollback) applies
+        raise DBAPIError.instance(statement, None, e, dbapi_error) from e
+    finally:
+        cursor.close()
+
+
+def _insert_issue_rows(db: Session, rows: list[dict]) -> list[int]:
+    if db.get_bind().dialect.name == "postgresql":
+        # Ids come from the sequence up front, so the rows can be COPYed and still be
+        # matched to their tags
+        ids = db.scalars(
+            text("SELECT nextval(pg_get_serial_sequence('issues', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(rows)},
+        ).all()
+        for issue_id, row in zip(ids, rows):
+            row["id"] = issue_id
+        copy_rows(db, "issues", ["id", *IMPORT_COLUMNS], rows)
+        return ids
+    return db.execute(insert(Issue).returning(Issue.id, sort_by_parameter_order=True), rows).scalars().all()
+
+
+def insert_issues(db: Session, items: list[IssueImport], default_reporter_id: int) -> list[dict]:
+    """
+    Inserts issues inside the caller's transaction: COPY on PostgreSQL, executemany
+    elsewhere, one statement per table (issues, tags, issue_tags) and one rollup upsert
+    for the whole batch. Returns snapshots (id, reporter_id and rollup dimensions) of the
+    created issues, in order.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "title": item.title,
+            "description": item.description,
+            "severity": item.severity or Severity.LOW,
+            "status": item.status or Status.OPEN,
+            "priority": item.priority or Priority.MINOR,
+            "reporter_id": item.reporter_id or default_reporter_id,
+            "created_at": item.created_at or now,
+        }
+        for item in items
+    ]
+    ids = _insert_issue_rows(db, rows)
+
+    names = [list(dict.fromkeys(n.strip() for n in item.tags or () if n and n.strip())) for item in items]
+    tag_ids = {tag.name: tag.id for tag in get_or_create_tags(db, [n for group in names for n in group])}
+    links = [{"issue_id": issue_id, "tag_id": tag_ids[n]} for issue_id, group in zip(ids, names) for n in group]
+    if links and db.get_bind().dialect.name == "postgresql":
+        copy_rows(db, "issue_tags", ["issue_id", "tag_id"], links)
+    elif links:
+        db.execute(issue_tags.insert(), links)
+
+    deltas = {}
+    snapshots = []
+    for issue_id, row in zip(ids, rows):
+        add_issue_deltas(deltas, row["created_at"].date(), None, row)
+        snapshots.append({"id": issue_id, "reporter_id": row["reporter_id"],
+                          **{d: _value(row[d]) for d in ROLLUP_DIMENSIONS}})
+    apply_deltas(db, deltas)
+    return snapshots
+
+
+def _insert_or_split(db: Session, rows: list[tuple[int, IssueImport]], default_reporter_id: int):
+    # A failing batch is retried row by row, so one bad row only fails itself
+    try:
+        created = insert_issues(db, [item for _, item in rows], default_reporter_id)
+        db.commit()
+        return created, []
+    except SQLAlchemyError as e:
+        db.rollback()
+        if len(rows) == 1:
+            return [], [{"line": rows[0][0], "error": str(getattr(e, "orig", None) or e)}]
+    created, errors = [], []
+    for row in rows:
+        row_created, row_errors = _insert_or_split(db, [row], default_reporter_id)
+        created += row_created
+        errors += row_errors
+    return created, errors
+
+
+def import_issue_batch(db: Session, lines: list[tuple[int, bytes]], default_reporter_id: int):
+    """
+    Validates and inserts one batch of NDJSON lines ((line number, bytes)) in a single
+    transaction. Invalid lines and lines naming an unknown reporter are reported and
+    skipped; the rest of the batch is still imported. Returns (created issue snapshots,
+    errors as {"line", "error"} sorted by line).
+    """
+    valid, errors = validate_issue_lines(lines)
+    reporters = {item.reporter_id for _, item in valid if item.reporter_id is not None}
+    known = set(db.scalars(select(User.id).where(User.id.in_(reporters)))) if reporters else set()
+    rows = []
+    for number, item in valid:
+        if item.reporter_id is not None and item.reporter_id not in known:
+            errors.append({"line": number, "error": f"reporter_id: unknown user {item.reporter_id}"})
+        else:
+            rows.append((number, item))
+    created, insert_errors = _insert_or_split(db, rows, default_reporter_id) if rows else ([], [])
+    return created, sorted(errors + insert_errors, key=lambda e: e["line"])
+
+
+def triage_issues(db: Session, ids: list[int], status: Status | None = None, priority: Priority | None = None):
+    """
+    Sets status and/or priority on many issues with one UPDATE, enforcing the status
+    workflow per issue: issues that may not make the transition (or do not exist) are
+    reported and left alone. Rollups move in one upsert. Returns ([(before, after)]
+    snapshots of the updated issues, errors as {"id", "error"}).
+    """
+    ids = list(dict.fromkeys(ids))
+    found = {
+        row.id: row
+        for row in db.execute(
+            select(Issue.id, Issue.reporter_id, Issue.created_at, *(getattr(Issue, d) for d in ROLLUP_DIMENSIONS))
+            .where(Issue.id.in_(ids))
+            .with_for_update()
+        )
+    }
+    values = {k: v for k, v in (("status", status), ("priority", priority)) if v is not None}
+    errors, changes, deltas = [], [], {}
+    for issue_id in ids:
+        row = found.get(issue_id)
+        if row is None:
+            errors.append({"id": issue_id, "error": "Issue not found"})
+            continue
+        error = transition_error(row.status, status)
+        if error:
+            errors.append({"id": issue_id, "error": error})
+            continue
+        before = {"id": row.id, "reporter_id": row.reporter_id, **{d: _value(getattr(row, d)) for d in ROLLUP_DIMENSIONS}}
+        after = {**before, **{k: _value(v) for k, v in values.items()}}
+        add_issue_deltas(deltas, row.created_at.date(), before, after)
+        changes.append((before, after))
+
+    if changes and values:
+        db.execute(
+            update(Issue)
+            .where(Issue.id.in_([before["id"] for before, _ in changes]))
+            .values(**values)
+            # Updates issues already loaded in the session too (no extra query); async
+            # sessions do not expire them on commit
+            .execution_options(synchronize_session="evaluate")
+        )
+        apply_deltas(db, deltas)
+    db.commit()
+    return changes, errors
+
+
+async def triage_issues_async(
+    db: AsyncSession, ids: list[int], status: Status | None = None, priority: Priority | None = None
+):
+    return await db.run_sync(triage_issues, ids, status=status, priority=priority)
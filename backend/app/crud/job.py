@@ -0,0 +1,188 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import dialect_insert
+from app.models.job import Job, JobStatus
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: dict | None = None,
+    *,
+    idempotency_key: str | None = None,
+    user_id: int | None = None,
+    run_at: datetime | None = None,
+    max_attempts: int | None = None,
+    commit: bool = True,
+) -> Job:
+    """
+    Queues a job for the worker. With an idempotency_key, a job already stored under the
+    same key (in any state) is returned instead of queueing another; concurrent enqueues
+    are resolved by the unique index. commit=False leaves the job in the caller's
+    transaction so it is only queued if that transaction commits.
+    """
+    values = {
+        "kind": kind,
+        "payload": json.dumps(payload or {}),
+        "status": JobStatus.QUEUED,
+        "idempotency_key": idempotency_key,
+        "user_id": user_id,
+        "attempts": 0,
+        "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+        "run_at": run_at or datetime.utcnow(),
+        "created_at": datetime.utcnow(),
+    }
+    if idempotency_key is None:
+        job = Job(**values)
+        db.add(job)
+        db.flush()
+    else:
+        db.execute(dialect_insert(db)(Job).values(values).on_conflict_do_nothing(index_elements=["idempotency_key"]))
+        job = db.scalars(select(Job).where(Job.idempotency_key == idempotency_key)).one()
+    if commit:
+        db.commit()
+    return job
+
+
+async def enqueue_job_async(db: AsyncSession, kind: str, payload: dict | None = None, **options) -> Job:
+    return await db.run_sync(enqueue_job, kind, payload, **options)
+
+
+def get_job(db: Session, job_id: int) -> Job | None:
+    return db.get(Job, job_id)
+
+
+async def get_job_async(db: AsyncSession, job_id: int) -> Job | None:
+    return await db.get(Job, job_id)
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int, now: datetime | None = None) -> list[int]:
+    """
+    Atomically moves up to `limit` due jobs to running and returns their ids, oldest due
+    first. On PostgreSQL the candidates are selected FOR UPDATE SKIP LOCKED, so workers
+    claiming at the same time never block on or double-claim a job; SQLite serializes
+    writers, which gives the same guarantee.
+    """
+    now = now or datetime.utcnow()
+    candidates = (
+        select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id.in_(candidates.scalar_subquery()), Job.status == JobStatus.QUEUED)
+        .values(status=JobStatus.RUNNING, locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id, Job.run_at)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return [job_id for job_id, _ in sorted(claimed, key=lambda row: (row.run_at, row.id))]
+
+
+def _held_by(job_id: int, worker_id: str):
+    return (Job.id == job_id) & (Job.locked_by == worker_id) & (Job.status == JobStatus.RUNNING)
+
+
+def heartbeat_job(db: Session, job_id: int, worker_id: str) -> bool:
+    """
+    Refreshes the lock of a job `worker_id` is running, so requeue_stale_jobs leaves it
+    alone. Returns False if the worker no longer holds it.
+    """
+    held = db.execute(update(Job).where(_held_by(job_id, worker_id)).values(locked_at=datetime.utcnow())).rowcount
+    db.commit()
+    return bool(held)
+
+
+def complete_job(db: Session, job: Job, worker_id: str, result=None) -> bool:
+    """
+    Marks the job done. Returns False, writing nothing, if `worker_id` lost the job in the
+    meantime (it was requeued as stale and may be running elsewhere).
+    """
+    done = db.execute(
+        update(Job)
+        .where(_held_by(job.id, worker_id))
+        .values(
+            status=JobStatus.DONE,
+            result=json.dumps(result) if result is not None else None,
+            finished_at=datetime.utcnow(),
+            locked_by=None,
+            locked_at=None,
+            last_error=None,
+        )
+    ).rowcount
+    db.commit()
+    return bool(done)
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff with ±10% jitter, so jobs that failed together spread out.
+    """
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.9, 1.1)
+
+
+def fail_job(db: Session, job: Job, worker_id: str, error: str, retry: bool = True) -> str | None:
+    """
+    Records a failed attempt: the job is queued again after a backoff delay, or marked
+    failed once it has used all its attempts (or at once when retry is False). Returns
+    the new status, or None, writing nothing, if `worker_id` lost the job in the meantime.
+    """
+    now = datetime.utcnow()
+    if not retry or job.attempts >= job.max_attempts:
+        values = {"status": JobStatus.FAILED, "finished_at": now}
+    else:
+        values = {"status": JobStatus.QUEUED, "run_at": now + timedelta(seconds=retry_delay(job.attempts))}
+    failed = db.execute(
+        update(Job)
+        .where(_held_by(job.id, worker_id))
+        .values(last_error=error, locked_by=None, locked_at=None, **values)
+    ).rowcount
+    db.commit()
+    return values["status"] if failed else None
+
+
+def requeue_stale_jobs(db: Session, now: datetime | None = None) -> int:
+    """
+    Queues again running jobs whose worker has not sent a heartbeat (heartbeat_job) for
+    JOB_LOCK_TIMEOUT_SECONDS: it crashed or was killed. The lost run counts as an attempt.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    stale = (Job.status == JobStatus.RUNNING) & (Job.locked_at < cutoff)
+    failed = db.execute(
+        update(Job)
+        .where(stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, finished_at=now, locked_by=None, locked_at=None, last_error="Worker lost")
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(stale)
+        .values(status=JobStatus.QUEUED, run_at=now, locked_by=None, locked_at=None, last_error="Worker lost")
+    ).rowcount
+    db.commit()
+    return failed + requeued
+
+
+def delete_finished_jobs(db: Session, before: datetime) -> list[tuple[int, str, str | None]]:
+    """
+    Deletes done and failed jobs that finished before `before`. Returns their (id, kind,
+    result) so files they produced (exports) can be removed.
+    """
+    deleted = db.execute(
+        delete(Job)
+        .where(Job.status.in_([JobStatus.DONE, JobStatus.FAILED]), Job.finished_at < before)
+        .returning(Job.id, Job.kind, Job.result)
+    ).all()
+    db.commit()
+    return [tuple(row) for row in deleted]
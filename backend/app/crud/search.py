@@ -0,0 +1,149 @@
+import base64
+import html
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.issue import Issue
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with these control characters; the fragment is then
+# HTML-escaped and only they are turned into tags, so issue text can't inject markup
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# Scores are normalised so that lower is better on both backends (bm25() already is;
+# ts_rank_cd is negated), which lets one (score, id) keyset serve both.
+_SQLITE_PAGE = """
+SELECT id, score FROM (
+    SELECT issues.id AS id, bm25(issues_fts, 10.0, 1.0) AS score
+    FROM issues_fts JOIN issues ON issues.id = issues_fts.rowid
+    WHERE issues_fts MATCH :q {reporter}
+) AS hits
+{cursor}
+ORDER BY score, id
+LIMIT :limit
+"""
+
+_SQLITE_HIGHLIGHT = """
+SELECT rowid,
+       highlight(issues_fts, 0, :start, :end),
+       snippet(issues_fts, 1, :start, :end, '…', 24)
+FROM issues_fts
+WHERE issues_fts MATCH :q AND rowid IN ({ids})
+"""
+
+_POSTGRES_SEARCH = """
+WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+hits AS (
+    SELECT issues.id, issues.title, issues.description,
+           -ts_rank_cd(issues.search_vector, q.query) AS score
+    FROM issues, q
+    WHERE issues.search_vector @@ q.query {reporter}
+),
+page AS (
+    SELECT * FROM hits {cursor} ORDER BY score, id LIMIT :limit
+)
+SELECT page.id, page.score,
+       ts_headline('english', page.title, q.query, :title_opts),
+       ts_headline('english', coalesce(page.description, ''), q.query, :snippet_opts)
+FROM page, q
+ORDER BY page.score, page.id
+"""
+
+
+def encode_search_cursor(score: float, issue_id: int) -> str:
+    raw = f"{score!r}|{issue_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Inverse of encode_search_cursor. Raises ValueError on a malformed cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, issue_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(score), int(issue_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _mark(fragment: str | None) -> str | None:
+    if fragment is None:
+        return None
+    return html.escape(fragment, quote=False).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every word so user input can never be parsed as FTS5 syntax; words are ANDed
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{w}"' for w in words)
+
+
+def search_issues(
+    db: Session,
+    q: str,
+    *,
+    reporter_id: int | None = None,
+    after: str | None = None,
+    limit: int = 20,
+) -> tuple[list[dict], str | None]:
+    """
+    Ranks issues matching `q` by relevance (title weighted above description) and returns
+    one page of hits plus the cursor of the next page. Each hit carries the Issue, its
+    score and highlighted title/description fragments (HTML-escaped, matches in <mark>).
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+    match = q.strip() if postgres else _fts5_query(q)
+    if not match:
+        return [], None
+
+    params = {"q": match, "limit": limit + 1}
+    reporter = ""
+    if reporter_id is not None:
+        reporter = "AND issues.reporter_id = :reporter_id"
+        params["reporter_id"] = reporter_id
+    cursor = ""
+    if after:
+        params["after_score"], params["after_id"] = decode_search_cursor(after)
+        cursor = "WHERE score > :after_score OR (score = :after_score AND id > :after_id)"
+
+    if postgres:
+        params["title_opts"] = f"StartSel={_MATCH_START},StopSel={_MATCH_END},HighlightAll=true"
+        params["snippet_opts"] = f"StartSel={_MATCH_START},StopSel={_MATCH_END},MaxFragments=2"
+        rows = db.execute(text(_POSTGRES_SEARCH.format(reporter=reporter, cursor=cursor)), params).all()
+        page = [(r[0], r[1]) for r in rows]
+        highlights = {r[0]: (_mark(r[2]), _mark(r[3])) for r in rows}
+    else:
+        page = [tuple(r) for r in db.execute(text(_SQLITE_PAGE.format(reporter=reporter, cursor=cursor)), params).all()]
+        highlights = {}
+        ids = [issue_id for issue_id, _ in page[:limit]]
+        if ids:
+            # Highlighting only the page, not every match
+            sql = _SQLITE_HIGHLIGHT.format(ids=",".join(str(int(i)) for i in ids))
+            rows = db.execute(text(sql), {"q": match, "start": _MATCH_START, "end": _MATCH_END}).all()
+            highlights = {r[0]: (_mark(r[1]), _mark(r[2])) for r in rows}
+
+    has_more = len(page) > limit
+    page = page[:limit]
+    issues = {i.id: i for i in db.query(Issue).filter(Issue.id.in_([issue_id for issue_id, _ in page]))}
+    hits = [
+        {
+            "issue": issues[issue_id],
+            "score": score,
+            "title_highlight": highlights.get(issue_id, (None, None))[0],
+            "description_highlight": highlights.get(issue_id, (None, None))[1],
+        }
+        for issue_id, score in page
+        if issue_id in issues
+    ]
+    next_cursor = encode_search_cursor(page[-1][1], page[-1][0]) if has_more and page else None
+    return hits, next_cursor
+
+
+async def search_issues_async(db: AsyncSession, q: str, **options) -> tuple[list[dict], str | None]:
+    return await db.run_sync(search_issues, q, **options)
@@ -1,38 +1,282 @@
 # app/crud/stats.py
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date
-from app.models.stats import DailyStats
-from app.models.issue import Issue
+from sqlalchemy import func, select
+from datetime import date, datetime, timedelta
+from enum import Enum
+from app.db.session import dialect_insert
+from app.models.stats import StatsRollup
+from app.models.issue import Issue, Status, Severity, Priority
 from app.schemas.stats import DailyStat  # Optional if used for response schema
 
-def record_daily_stats(db: Session):
+ROLLUP_DIMENSIONS = ("status", "severity", "priority")
+
+
+def _value(v):
+    return v.value if isinstance(v, Enum) else v
+
+
+def _upsert(db: Session, rows: list[dict], increment: bool):
+    """
+    Inserts rollup rows, resolving (date, dimension, value) conflicts atomically:
+    either adding to the stored count (increment) or overwriting it.
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db)(StatsRollup).values(rows)
+    new_count = StatsRollup.count + stmt.excluded["count"] if increment else stmt.excluded["count"]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "dimension", "value"],
+        set_={"count": new_count},
+    )
+    db.execute(stmt)
+
+
+def add_issue_deltas(deltas: dict, day: date, previous: dict | None, current: dict | None):
+    """
+    Accumulates into deltas ((day, dimension, value) -> change) the rollup changes of one
+    issue going from `previous` to `current`: dimension -> value maps, None when the issue
+    did not exist before / does not exist after.
+    """
+    for dimension in ROLLUP_DIMENSIONS:
+        old = _value(previous.get(dimension)) if previous else None
+        new = _value(current.get(dimension)) if current else None
+        if old == new:
+            continue
+        if old is not None:
+            deltas[(day, dimension, old)] = deltas.get((day, dimension, old), 0) - 1
+        if new is not None:
+            deltas[(day, dimension, new)] = deltas.get((day, dimension, new), 0) + 1
+
+
+def apply_deltas(db: Session, deltas: dict[tuple[date, str, str], int]):
+    """
+    Adds each (day, dimension, value) -> delta to the rollup counters in one upsert.
+    Runs inside the caller's transaction; nothing is committed here.
+    """
+    rows = [
+        {"date": day, "dimension": dimension, "value": value, "count": delta}
+        for (day, dimension, value), delta in deltas.items()
+        if delta
+    ]
+    _upsert(db, rows, increment=True)
+
+
+def _record_issue_change(db: Session, issue: Issue, previous: dict | None, current: dict | None):
+    deltas = {}
+    add_issue_deltas(deltas, issue.created_at.date(), previous, current)
+    apply_deltas(db, deltas)
+
+
+def _rollup_values(issue: Issue) -> dict:
+    return {dimension: getattr(issue, dimension) for dimension in ROLLUP_DIMENSIONS}
+
+
+def record_issue_created(db: Session, issue: Issue):
+    _record_issue_change(db, issue, None, _rollup_values(issue))
+
+
+def record_issue_deleted(db: Session, issue: Issue):
+    _record_issue_change(db, issue, _rollup_values(issue), None)
+
+
+def record_issue_updated(db: Session, issue: Issue, previous: dict):
     """
-    Deletes today's existing stats (if any) and records fresh counts of issues by status.
+    `previous` maps dimension -> value as it was before the update.
     """
-    # Remove existing stats for today
-    db.query(DailyStats).filter(DailyStats.date == date.today()).delete()
-    db.commit()
+    _record_issue_change(db, issue, previous, _rollup_values(issue))
+
 
-    # Count issues grouped by status
-    results = (
-        db.query(Issue.status, func.count(Issue.id))
-        .filter(func.date(Issue.created_at) == date.today())  # Optional: limit to today
-        .group_by(Issue.status)
+def _count_day(db: Session, day: date) -> dict[tuple[str, str], int]:
+    start = datetime.combine(day, datetime.min.time())
+    rows = (
+        db.query(Issue.status, Issue.severity, Issue.priority, func.count(Issue.id))
+        .filter(Issue.created_at >= start, Issue.created_at < start + timedelta(days=1))
+        .group_by(Issue.status, Issue.severity, Issue.priority)
         .all()
     )
+    counts = {}
+    for status, severity, priority, count in rows:
+        for dimension, value in zip(ROLLUP_DIMENSIONS, (status, severity, priority)):
+            if value is not None:
+                key = (dimension, _value(value))
+                counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def rebuild_rollups(db: Session, start: date, end: date):
+    """
+    Recounts every day in [start, end] from the issues table and overwrites the rollup
+    counters. Work is done one day at a time, each in its own transaction, so memory and
+    lock time stay bounded however long the range is and readers never observe a
+    partially rebuilt day.
+    """
+    day = start
+    while day <= end:
+        counts = _count_day(db, day)
+        # Zero out rows that no longer have any issues, then write the fresh counts
+        db.query(StatsRollup).filter(StatsRollup.date == day).update({StatsRollup.count: 0})
+        _upsert(
+            db,
+            [{"date": day, "dimension": d, "value": v, "count": c} for (d, v), c in counts.items()],
+            increment=False,
+        )
+        db.commit()
+        day += timedelta(days=1)
+
+
+def reconcile_rollups(db: Session, days: int = 2):
+    """
+    Rebuilds the last `days` days (today included) to correct any drift in the counters.
+    """
+    today = datetime.utcnow().date()
+    rebuild_rollups(db, today - timedelta(days=days - 1), today)
+
+
+def backfill_rollups(db: Session, start: date | None = None, end: date | None = None):
+    """
+    Rebuilds rollup history, by default from the oldest issue up to today.
+    """
+    if start is None:
+        oldest = db.query(func.min(Issue.created_at)).scalar()
+        if oldest is None:
+            return
+        start = oldest.date()
+    rebuild_rollups(db, start, end or datetime.utcnow().date())
 
-    # Store stats in DailyStats table
-    for status, count in results:
-        stat = DailyStats(date=date.today(), status=status, count=count)
-        db.add(stat)
 
-    db.commit()
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _timeseries_statement(start: date, end: date, dimension: str):
+    return (
+        select(StatsRollup.date, StatsRollup.value, StatsRollup.count)
+        .where(
+            StatsRollup.dimension == dimension,
+            StatsRollup.date >= start,
+            StatsRollup.date <= end,
+            StatsRollup.count > 0,
+        )
+        .order_by(StatsRollup.date)
+    )
+
+
+def _fold_timeseries(rows, bucket: str) -> list[dict]:
+    points = {}
+    for day, value, count in rows:
+        key = (_bucket_start(day, bucket), value)
+        points[key] = points.get(key, 0) + count
+    return [
+        {"bucket": bucket_start, "value": value, "count": count}
+        for (bucket_start, value), count in sorted(points.items())
+    ]
+
+
+def get_timeseries(db: Session, start: date, end: date, bucket: str = "day", dimension: str = "status"):
+    """
+    Returns rollup counts for `dimension` between start and end (inclusive), summed per
+    day, ISO week (starting Monday) or calendar month. Only the pre-aggregated
+    stats_rollups table is read.
+    """
+    return _fold_timeseries(db.execute(_timeseries_statement(start, end, dimension)).all(), bucket)
+
+
+async def get_timeseries_async(db: AsyncSession, start: date, end: date, bucket: str = "day", dimension: str = "status"):
+    return _fold_timeseries((await db.execute(_timeseries_statement(start, end, dimension))).all(), bucket)
+
+
+def _today_rollup_statement(dimension: str):
+    return select(StatsRollup.value, StatsRollup.count).where(
+        StatsRollup.date == datetime.utcnow().date(),
+        StatsRollup.dimension == dimension,
+        StatsRollup.count > 0,
+    )
+
+
+def get_today_rollup(db: Session, dimension: str):
+    """
+    Returns (value, count) pairs of today's rollup counters for one dimension.
+    """
+    return db.execute(_today_rollup_statement(dimension)).all()
+
+
+async def get_today_rollup_async(db: AsyncSession, dimension: str):
+    return (await db.execute(_today_rollup_statement(dimension))).all()
+
+
+def _daily_stats(rows) -> list[DailyStat]:
+    today = datetime.utcnow().date()
+    return [DailyStat(date=today, status=value, count=count) for value, count in rows]
 
 
 def get_today_stats(db: Session):
     """
-    Returns list of DailyStats entries for today.
+    Returns today's per-status counts in the DailyStat shape.
+    """
+    return _daily_stats(get_today_rollup(db, "status"))
+
+
+async def get_today_stats_async(db: AsyncSession):
+    return _daily_stats(await get_today_rollup_async(db, "status"))
+
+
+def _issue_dict(issue: Issue) -> dict:
+    data = {column.name: getattr(issue, column.name) for column in Issue.__table__.columns}
+    data["tags"] = issue.tags
+    return data
+
+
+_ANALYTICS_COUNTS = (
+    select(Issue.status, Issue.severity, Issue.priority, func.count(Issue.id))
+    .group_by(Issue.status, Issue.severity, Issue.priority)
+)
+_RECENT_ISSUES = select(Issue).order_by(Issue.created_at.desc()).limit(5)
+
+
+def _fold_analytics(rows, recent_issues) -> dict:
+    total = 0
+    by_status = {s.value: 0 for s in Status}
+    by_severity = {s.value: 0 for s in Severity}
+    by_priority = {p.value: 0 for p in Priority}
+    for status, severity, priority, count in rows:
+        total += count
+        if status is not None:
+            by_status[status.value] += count
+        if severity is not None:
+            by_severity[severity.value] += count
+        if priority is not None:
+            by_priority[priority.value] += count
+
+    return {
+        "total_issues": total,
+        "open_issues": by_status["OPEN"],
+        "in_progress_issues": by_status["IN_PROGRESS"],
+        "completed_issues": by_status["DONE"],
+        "high_priority_issues": by_priority["CRITICAL"] + by_priority["BLOCKER"],
+        "medium_priority_issues": by_priority["MINOR"],
+        "low_priority_issues": by_priority["TRIVIAL"],
+        "recent_issues": [_issue_dict(issue) for issue in recent_issues],
+        "issues_by_status": by_status,
+        "issues_by_severity": by_severity,
+    }
+
+
+def get_analytics(db: Session) -> dict:
+    """
+    Returns issue counts by status, severity and priority plus the five most recent issues.
+    Counting happens in a single GROUP BY over (status, severity, priority), so at most one
+    row per combination reaches Python regardless of table size.
     """
-    return db.query(DailyStats).filter(DailyStats.date == date.today()).all()
+    return _fold_analytics(db.execute(_ANALYTICS_COUNTS).all(), db.execute(_RECENT_ISSUES).scalars().all())
+
+
+async def get_analytics_async(db: AsyncSession) -> dict:
+    rows = (await db.execute(_ANALYTICS_COUNTS)).all()
+    recent_issues = (await db.execute(_RECENT_ISSUES)).scalars().all()
+    return _fold_analytics(rows, recent_issues)
@@ -0,0 +1,135 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.upload import UploadSession
+from app.crud.attachment import release_blobs, release_blobs_async
+from app.storage import get_storage, partial_path
+
+
+def _expiry() -> datetime:
+    return datetime.utcnow() + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+
+
+def _new_upload_session(user_id: int, filename: str, content_type: str | None, size: int) -> UploadSession:
+    return UploadSession(
+        id=uuid.uuid4().hex, user_id=user_id, filename=filename, content_type=content_type,
+        size=size, offset=0, expires_at=_expiry(),
+    )
+
+
+def _create_partial(upload_id: str):
+    # Created up front so PATCH can always open it for update
+    open(partial_path(upload_id), "wb").close()
+
+
+def create_upload_session(db: Session, user_id: int, filename: str, content_type: str | None, size: int) -> UploadSession:
+    upload = _new_upload_session(user_id, filename, content_type, size)
+    db.add(upload)
+    db.commit()
+    _create_partial(upload.id)
+    return upload
+
+
+async def create_upload_session_async(
+    db: AsyncSession, user_id: int, filename: str, content_type: str | None, size: int
+) -> UploadSession:
+    upload = _new_upload_session(user_id, filename, content_type, size)
+    db.add(upload)
+    await db.commit()
+    await run_in_threadpool(_create_partial, upload.id)
+    return upload
+
+
+def get_upload_session(db: Session, upload_id: str) -> UploadSession | None:
+    return db.get(UploadSession, upload_id)
+
+
+async def get_upload_session_async(db: AsyncSession, upload_id: str) -> UploadSession | None:
+    return await db.get(UploadSession, upload_id)
+
+
+async def advance_upload_async(db: AsyncSession, upload: UploadSession, offset: int) -> bool:
+    """
+    Moves the committed offset from upload.offset to offset and extends the session's
+    expiry. Returns False if another request moved the offset first.
+    """
+    result = await db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload.id, UploadSession.offset == upload.offset)
+        .values(offset=offset, expires_at=_expiry())
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        return False
+    upload.offset = offset
+    return True
+
+
+async def complete_upload_async(db: AsyncSession, upload: UploadSession, sha256: str):
+    upload.sha256 = sha256
+    await db.commit()
+
+
+def attach_upload(db: Session, upload: UploadSession, issue_id: int) -> Attachment:
+    """
+    Turns a finished upload into an attachment of the issue and ends the session.
+    """
+    attachment = Attachment(
+        issue_id=issue_id, uploader_id=upload.user_id, filename=upload.filename,
+        content_type=upload.content_type, size=upload.size, sha256=upload.sha256,
+    )
+    db.add(attachment)
+    db.delete(upload)
+    db.commit()
+    db.refresh(attachment)
+    return attachment
+
+
+async def attach_upload_async(db: AsyncSession, upload: UploadSession, issue_id: int) -> Attachment:
+    return await db.run_sync(attach_upload, upload, issue_id)
+
+
+def delete_upload_session(db: Session, upload: UploadSession):
+    db.delete(upload)
+    db.commit()
+    _remove_partial(upload.id)
+    release_blobs(db, get_storage(), [upload.sha256])
+
+
+async def delete_upload_session_async(db: AsyncSession, upload: UploadSession):
+    await db.delete(upload)
+    await db.commit()
+    await run_in_threadpool(_remove_partial, upload.id)
+    await release_blobs_async(db, get_storage(), [upload.sha256])
+
+
+def expire_upload_sessions(db: Session, now: datetime | None = None) -> int:
+    """
+    Drops sessions idle past their expiry together with their partial files, and the
+    stored blobs of finished uploads that were never attached to an issue.
+    """
+    expired = db.execute(
+        delete(UploadSession)
+        .where(UploadSession.expires_at < (now or datetime.utcnow()))
+        .returning(UploadSession.id, UploadSession.sha256)
+    ).all()
+    db.commit()
+    for upload_id, _ in expired:
+        _remove_partial(upload_id)
+    release_blobs(db, get_storage(), [sha256 for _, sha256 in expired])
+    return len(expired)
+
+
+def _remove_partial(upload_id: str):
+    try:
+        os.unlink(partial_path(upload_id))
+    except FileNotFoundError:
+        pass
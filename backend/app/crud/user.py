@@ -1,11 +1,29 @@
+from concurrent.futures import Executor
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.user import User
+from starlette.concurrency import run_in_threadpool
+from app.db.session import dialect_insert
+from app.models.user import User, Role
+from app.models.issue import Issue
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash,
+    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    hash_passwords_async,
+    hash_passwords,
+)
+from app.utils.cache import invalidate_user
 
 def get_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+def email_exists(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
 def create_user(db: Session, user_in: UserCreate):
     hashed_pw = get_password_hash(user_in.password)
     db_user = User(
@@ -25,5 +43,140 @@ def authenticate(db: Session, email: str, password: str):
         return None
     return user
 
+async def create_user_async(db: Session, user_in: UserCreate):
+    """
+    Async create_user: the bcrypt hash runs on the password pool, the insert on the threadpool.
+    Returns None if the email was taken concurrently (unique constraint on users.email).
+    """
+    hashed_pw = await get_password_hash_async(user_in.password)
+    db_user = User(
+        email=user_in.email,
+        full_name=user_in.full_name,
+        hashed_password=hashed_pw,
+        role=user_in.role,
+    )
+
+    def _insert():
+        db.add(db_user)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+        db.refresh(db_user)
+        return db_user
+
+    return await run_in_threadpool(_insert)
+
+async def authenticate_async(db: Session, email: str, password: str):
+    user = await run_in_threadpool(get_by_email, db, email)
+    if not user or not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
 def get_users(db: Session):
-    return db.query(User).all()
\ No newline at end of file
+    return db.query(User).all()
+
+async def get_users_async(db: AsyncSession):
+    return (await db.scalars(select(User))).all()
+
+def get_user(db: Session, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
+async def get_user_async(db: AsyncSession, user_id: int):
+    return await db.get(User, user_id)
+
+def update_role(db: Session, db_user: User, role: Role):
+    db_user.role = role
+    db.commit()
+    db.refresh(db_user)
+    invalidate_user(db_user.id)
+    return db_user
+
+async def update_role_async(db: AsyncSession, db_user: User, role: Role):
+    return await db.run_sync(update_role, db_user, role)
+
+def has_issues(db: Session, user_id: int) -> bool:
+    return db.query(Issue.id).filter(Issue.reporter_id == user_id).first() is not None
+
+async def has_issues_async(db: AsyncSession, user_id: int) -> bool:
+    return await db.run_sync(has_issues, user_id)
+
+def delete_user(db: Session, db_user: User):
+    user_id = db_user.id
+    db.delete(db_user)
+    db.commit()
+    invalidate_user(user_id)
+
+async def delete_user_async(db: AsyncSession, db_user: User):
+    await db.run_sync(delete_user, db_user)
+
+# ─────────────────────────────────────────────────────
+# Bulk provisioning
+
+def existing_emails(db: Session, emails: list[str]) -> set[str]:
+    found = set()
+    for i in range(0, len(emails), 500):
+        found.update(email for (email,) in db.query(User.email).filter(User.email.in_(emails[i:i + 500])))
+    return found
+
+def insert_users(db: Session, rows: list[dict], batch_size: int = 1000) -> list[str]:
+    """
+    Inserts prepared user rows one multi-row INSERT per batch. Emails that already exist
+    are skipped atomically with ON CONFLICT DO NOTHING. Returns the emails actually created.
+    """
+    insert = dialect_insert(db)
+    created = []
+    for i in range(0, len(rows), batch_size):
+        stmt = (
+            insert(User)
+            .values(rows[i:i + batch_size])
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.email)
+        )
+        created += db.execute(stmt).scalars().all()
+        db.commit()
+    return created
+
+def _plan_bulk(db: Session, users: list[UserCreate]) -> tuple[list[UserCreate], list[str]]:
+    # Drop duplicates and existing accounts before spending any bcrypt time on them
+    unique = {}
+    skipped = []
+    for user_in in users:
+        if user_in.email in unique:
+            skipped.append(user_in.email)
+        else:
+            unique[user_in.email] = user_in
+    existing = existing_emails(db, list(unique))
+    pending = [user_in for email, user_in in unique.items() if email not in existing]
+    return pending, skipped + sorted(existing)
+
+def _user_rows(users: list[UserCreate], hashes: list[str]) -> list[dict]:
+    return [
+        {"email": u.email, "full_name": u.full_name, "hashed_password": h, "role": u.role.value}
+        for u, h in zip(users, hashes)
+    ]
+
+def _finish_bulk(pending: list[UserCreate], skipped: list[str], created: list[str]):
+    created_set = set(created)
+    # Anything still missing lost a race against a concurrent insert
+    skipped += [u.email for u in pending if u.email not in created_set]
+    return created, skipped
+
+async def bulk_create_users_async(db: Session, users: list[UserCreate], batch_size: int = 1000):
+    """
+    Creates many users at once. Returns (created emails, skipped emails).
+    """
+    pending, skipped = await run_in_threadpool(_plan_bulk, db, users)
+    hashes = await hash_passwords_async([u.password for u in pending])
+    created = await run_in_threadpool(insert_users, db, _user_rows(pending, hashes), batch_size)
+    return _finish_bulk(pending, skipped, created)
+
+def bulk_create_users(db: Session, users: list[UserCreate], executor: Executor, batch_size: int = 1000):
+    """
+    Synchronous bulk_create_users_async for offline use, hashing on the given executor.
+    """
+    pending, skipped = _plan_bulk(db, users)
+    hashes = hash_passwords([u.password for u in pending], executor)
+    created = insert_users(db, _user_rows(pending, hashes), batch_size)
+    return _finish_bulk(pending, skipped, created)
@@ -3,6 +3,10 @@ from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
 
 # Import all models so that metadata.create_all works
+import app.models.attachment
 import app.models.issue
+import app.models.job
 import app.models.stats
+import app.models.tag
+import app.models.upload
 import app.models.user
@@ -1,6 +1,17 @@
+from app.db.base import Base  # imports every model, in dependency order
 from sqlalchemy.orm import Session
 from app.core.security import get_password_hash
 from app.models.user import User, Role
+from app.db.search import ensure_search_index
+
+
+def init_schema(engine):
+    """
+    Creates missing tables and the search index. Run by the API and the job worker at
+    startup, so either can come up first against an empty database.
+    """
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
 
 def init_admin(db: Session):
     admin_email = "admin@example.com"
@@ -0,0 +1,82 @@
+"""
+Full-text index over issue titles and descriptions.
+
+SQLite: an external-content FTS5 table (issues_fts) kept in sync by triggers.
+Postgres: a stored, weighted tsvector column (issues.search_vector) with a GIN index.
+Neither is part of the ORM metadata, so ensure_search_index() is run after create_all().
+"""
+
+from sqlalchemy import text
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+        title, description, content='issues', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN
+        INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS issues_fts_au",
+    "DROP TRIGGER IF EXISTS issues_fts_ad",
+    "DROP TRIGGER IF EXISTS issues_fts_ai",
+    "DROP TABLE IF EXISTS issues_fts",
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE issues ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_issues_search_vector ON issues USING GIN (search_vector)",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_issues_search_vector",
+    "ALTER TABLE issues DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_search_index(conn):
+    """
+    Creates the dialect's search index on an open connection (idempotent).
+    """
+    if conn.dialect.name == "postgresql":
+        for ddl in POSTGRES_DDL:
+            conn.execute(text(ddl))
+        return
+    exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'issues_fts'")).first()
+    for ddl in SQLITE_DDL:
+        conn.execute(text(ddl))
+    if not exists:
+        # Index the rows that were there before the triggers
+        conn.execute(text("INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')"))
+
+
+def drop_search_index(conn):
+    for ddl in POSTGRES_DROP if conn.dialect.name == "postgresql" else SQLITE_DROP:
+        conn.execute(text(ddl))
+
+
+def ensure_search_index(engine):
+    with engine.begin() as conn:
+        create_search_index(conn)
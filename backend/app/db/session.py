@@ -1,6 +1,144 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.metrics import prometheus as metrics
+
+
+class _TimedCheckout:
+    """
+    Records how long each checkout waited for a pooled connection.
+    """
+    engine_name = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.db_pool_wait_seconds.labels(engine=self.engine_name).observe(time.perf_counter() - start)
+
+
+def timed_pool(base, name: str):
+    """
+    A subclass of the given pool class that reports checkout waits under the engine's name.
+    Kept as a class attribute so it survives pool.recreate() on dispose.
+    """
+    return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"engine_name": name})
+
+
+def engine_options(url: str, pool_class) -> dict:
+    """
+    Pool and driver options for an engine on the given URL.
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    parsed = make_url(url)
+    options = {}
+    if parsed.get_backend_name() == "sqlite":
+        # Sessions are opened in one threadpool worker and used in another
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def configure_connection(dbapi_connection, connection_record):
+    """
+    Per-connection settings: WAL and a busy timeout on SQLite, a statement timeout on PostgreSQL.
+    """
+    backend = connection_record.info.get("backend")
+    cursor = dbapi_connection.cursor()
+    try:
+        if backend == "sqlite":
+            if settings.SQLITE_WAL:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        elif backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+            cursor.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+
+def instrument(sync_engine, name: str):
+    """
+    Installs the connect hook and exports pool gauges for an engine.
+    """
+    backend = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        connection_record.info["backend"] = backend
+        configure_connection(dbapi_connection, connection_record)
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    pool = sync_engine.pool
+    if isinstance(pool, QueuePool):
+        metrics.db_pool_size.labels(engine=name).set_function(pool.size)
+        metrics.db_pool_checked_out.labels(engine=name).set_function(pool.checkedout)
+        metrics.db_pool_overflow.labels(engine=name).set_function(lambda: max(pool.overflow(), 0))
+
+
+def make_engine(url: str, name: str):
+    engine = create_engine(url, **engine_options(url, timed_pool(QueuePool, name)))
+    instrument(engine, name)
+    return engine
+
+
+def make_async_engine(url: str, name: str):
+    engine = create_async_engine(url, **engine_options(url, timed_pool(AsyncAdaptedQueuePool, name)))
+    instrument(engine.sync_engine, name)
+    return engine
+
+
+engine = make_engine(settings.SQLALCHEMY_DATABASE_URI, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def async_url(url: str) -> str:
+    """
+    Maps a sync database URL onto its async driver.
+    """
+    scheme, _, rest = url.partition("://")
+    if scheme.split("+")[0] == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.split("+")[0] in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+async_engine = make_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI or async_url(settings.SQLALCHEMY_DATABASE_URI), "async"
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for GET endpoints; without one, reads share the primary's engines
+if settings.SQLALCHEMY_READ_DATABASE_URI:
+    read_engine = make_engine(settings.SQLALCHEMY_READ_DATABASE_URI, "read")
+    async_read_engine = make_async_engine(
+        settings.SQLALCHEMY_ASYNC_READ_DATABASE_URI or async_url(settings.SQLALCHEMY_READ_DATABASE_URI), "async_read"
+    )
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+else:
+    read_engine, async_read_engine = engine, async_engine
+    ReadSessionLocal, AsyncReadSessionLocal = SessionLocal, AsyncSessionLocal
+
+
+def dialect_insert(db):
+    """
+    Returns the dialect-specific insert() (supporting on_conflict_* clauses) for the session's bind.
+    """
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 from starlette.requests import Request
@@ -7,23 +7,24 @@ import traceback
 
 from app.core.config import settings
 from app.db.session import engine, SessionLocal
-from app.db.base import Base
-from app.db.init_db import init_admin
+from app.db.init_db import init_admin, init_schema
 
-from app.api import auth, users, issues, stats, deps
+from app.api import auth, users, issues, jobs, stats, uploads, ws, deps
 from app.metrics import prometheus as metrics
-from app.utils.websocket import manager
-from app.workers.stats_worker import start as start_scheduler
+from app.metrics.middleware import PrometheusMiddleware
+from app.metrics.sql import install_sql_hooks
 
 # ─────────────────────────────────────────────────────
 # Logging setup for debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+install_sql_hooks()
+
 # ─────────────────────────────────────────────────────
 # Create DB Tables and Initialize Admin User
 try:
-    Base.metadata.create_all(bind=engine)
+    init_schema(engine)
     logger.info("✅ Database tables created.")
     
     # Initialize admin user
@@ -66,7 +67,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "Location", "Upload-Offset", "Upload-Length"],
 )
+# Added last so it wraps CORS too and times the whole request
+app.add_middleware(PrometheusMiddleware)
 
 # ─────────────────────────────────────────────────────
 # API Routers
@@ -74,23 +78,10 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(issues.router, prefix="/api/issues", tags=["Issues"])
 app.include_router(stats.router, prefix="/api/stats", tags=["Stats"])
+app.include_router(uploads.router, prefix="/api/uploads", tags=["Uploads"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(metrics.router, tags=["Metrics"])  # exposes /metrics
+app.include_router(ws.router, tags=["WebSocket"])  # exposes /ws/issues
 
-# ─────────────────────────────────────────────────────
-# WebSocket Endpoint
-@app.websocket("/ws/issues")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        while True:
-            await websocket.receive_text()  # keep connection alive
-    except Exception:
-        manager.disconnect(websocket)
-
-# ─────────────────────────────────────────────────────
-# Start APScheduler background job (for daily stats)
-try:
-    start_scheduler()
-    logger.info("✅ Scheduler started.")
-except Exception as e:
-    logger.error(f"❌ Failed to start scheduler: {e}")
+# Background work (stats reconciliation, upload cleanup, exports, blob release) runs
+# in the job worker (worker/main.py), not in the API processes.
@@ -0,0 +1,82 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import prometheus as metrics
+from app.metrics.sql import RequestDBStats, stop_request_db, track_request_db
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled the request. Routes of included routers only
+    know their path relative to the router prefix, so the prefix is recovered from the
+    request path: everything before the part the route itself matched.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    params = {k: str(v) for k, v in scope.get("path_params", {}).items()}
+    try:
+        matched = getattr(route, "path_format", template).format(**params)
+    except (KeyError, IndexError, ValueError):
+        return template
+    if not path.endswith(matched):
+        return template
+    return path[: len(path) - len(matched)] + template
+
+
+class PrometheusMiddleware:
+    """
+    Per-route request metrics: counts by status class, in-flight requests, latency up to
+    the last response byte (background tasks excluded), and the queries and DB time each
+    request spent (see app.metrics.sql). Routes are labelled by template
+    ("/api/issues/{issue_id}"), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status = 500
+        finished = False
+        db = RequestDBStats()
+        in_flight = metrics.http_requests_in_flight.labels(method=method)
+        in_flight.inc()
+
+        def observe():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            in_flight.dec()
+            path = route_template(scope)
+            metrics.requests_counter.inc()
+            metrics.http_requests.labels(method=method, route=path, status=f"{status // 100}xx").inc()
+            metrics.http_request_seconds.labels(method=method, route=path).observe(time.perf_counter() - start)
+            metrics.http_db_queries.labels(method=method, route=path).observe(db.queries)
+            metrics.http_db_seconds.labels(method=method, route=path).observe(db.seconds)
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        token = track_request_db(db)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_request_db(token)
+            observe()
@@ -1,10 +1,78 @@
-from prometheus_client import Counter, generate_latest
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 from fastapi import APIRouter, Response
 
 router = APIRouter()
 
 requests_counter = Counter("tracker_requests_total", "Total HTTP requests")
 
+# Per-route request metrics, recorded by app.metrics.middleware.PrometheusMiddleware.
+# "route" is the path template, or "<unmatched>" for requests no route handled.
+http_requests = Counter(
+    "tracker_http_requests_total", "HTTP requests by route and status class", ["method", "route", "status"]
+)
+http_requests_in_flight = Gauge("tracker_http_requests_in_flight", "HTTP requests being handled", ["method"])
+http_request_seconds = Histogram(
+    "tracker_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+http_db_queries = Histogram(
+    "tracker_http_db_queries",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+http_db_seconds = Histogram(
+    "tracker_http_db_seconds",
+    "Time per request spent executing SQL statements",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+db_query_seconds = Histogram(
+    "tracker_db_query_seconds",
+    "Execution time of individual SQL statements, background jobs included",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5),
+)
+
+cache_hits = Counter("tracker_cache_hits_total", "In-process cache hits", ["cache"])
+cache_misses = Counter("tracker_cache_misses_total", "In-process cache misses", ["cache"])
+
+password_jobs_pending = Gauge("tracker_password_jobs_pending", "Password hash/verify jobs queued or running")
+password_jobs_rejected = Counter("tracker_password_jobs_rejected_total", "Password jobs rejected because the pool was saturated")
+password_job_seconds = Histogram(
+    "tracker_password_job_seconds",
+    "Time from submitting a password job to its completion, queueing included",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+db_pool_size = Gauge("tracker_db_pool_size", "Configured pool size", ["engine"])
+db_pool_checked_out = Gauge("tracker_db_pool_checked_out", "Connections currently checked out of the pool", ["engine"])
+db_pool_overflow = Gauge("tracker_db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+db_pool_wait_seconds = Histogram(
+    "tracker_db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+ws_connections = Gauge("tracker_ws_connections", "Open WebSocket connections in this process")
+ws_queued_messages = Gauge("tracker_ws_queued_messages", "Messages waiting in WebSocket send queues")
+ws_messages_dropped = Counter(
+    "tracker_ws_messages_dropped_total", "WebSocket messages not delivered to a slow or dead client", ["reason"]
+)
+
+# Recorded by the job worker (app.workers.runner); outcome is done, retried, failed, or
+# lost when the job was requeued as stale while it ran
+jobs_processed = Counter("tracker_jobs_processed_total", "Background jobs run, by outcome", ["kind", "outcome"])
+jobs_running = Gauge("tracker_jobs_running", "Background jobs currently running in this process", ["kind"])
+job_seconds = Histogram(
+    "tracker_job_duration_seconds",
+    "Time spent running a background job",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+
 @router.get("/metrics")
 def get_metrics():
     return Response(generate_latest(), media_type="text/plain")
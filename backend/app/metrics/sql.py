@@ -0,0 +1,57 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import prometheus as metrics
+
+
+class RequestDBStats:
+    """
+    Queries run and seconds spent in the database on behalf of one request.
+    """
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def track_request_db(stats: RequestDBStats):
+    """
+    Makes stats the current request's counters; returns a token for stop_request_db.
+    The context variable is copied into threadpool workers and async tasks, so sync and
+    async sessions both report here.
+    """
+    return _current.set(stats)
+
+
+def stop_request_db(token):
+    _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._tracker_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._tracker_start
+    metrics.db_query_seconds.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def install_sql_hooks():
+    """
+    Times every statement on every engine, async engines included. Idempotent.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,2 +1,6 @@
 from .issue import Issue, Status, Severity, Priority
-from .stats import DailyStats
+from .stats import StatsRollup
+from .tag import Tag, issue_tags
+from .attachment import Attachment
+from .upload import UploadSession
+from .job import Job, JobStatus
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+
+class Attachment(Base):
+    """
+    An uploaded file. Content lives in the storage backend under its SHA-256, so rows
+    with the same hash share one stored blob.
+    """
+    __tablename__ = "attachments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    issue_id = Column(Integer, ForeignKey("issues.id", ondelete="CASCADE"), index=True, nullable=True)
+    uploader_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), index=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
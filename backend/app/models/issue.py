@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -39,7 +39,23 @@ class Issue(Base):
     reporter_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    tags = Column(String, nullable=True)  # Comma-separated tags
-
     reporter = relationship("User")
-    
\ No newline at end of file
+    # selectin: tags for a whole page of issues load in one extra query
+    tag_objects = relationship("Tag", secondary="issue_tags", lazy="selectin", order_by="Tag.name")
+    attachments = relationship(
+        "Attachment", lazy="selectin", order_by="Attachment.id", cascade="all, delete-orphan"
+    )
+
+    @property
+    def tags(self) -> list[str]:
+        return [tag.name for tag in self.tag_objects]
+
+    # Composite indexes backing keyset pagination on (created_at, id), alone
+    # and behind each equality filter the issues list supports.
+    __table_args__ = (
+        Index("ix_issues_created_at_id", "created_at", "id"),
+        Index("ix_issues_reporter_created_at_id", "reporter_id", "created_at", "id"),
+        Index("ix_issues_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_issues_severity_created_at_id", "severity", "created_at", "id"),
+        Index("ix_issues_priority_created_at_id", "priority", "created_at", "id"),
+    )
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.db.base import Base
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"  # out of attempts
+
+
+class Job(Base):
+    """
+    A unit of background work for the worker service (worker/main.py). `kind` names the
+    handler in app.workers.jobs; payload and result are JSON. Jobs enqueued with the same
+    idempotency_key are stored once.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")
+    status = Column(String(16), nullable=False, default=JobStatus.QUEUED)
+    idempotency_key = Column(String(255), unique=True, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Claiming scans queued jobs by due time; stale-lock recovery and cleanup by status
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
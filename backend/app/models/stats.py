@@ -1,14 +1,22 @@
 # app/models/stats.py
 
-from sqlalchemy import Column, Integer, Date, Enum
+from sqlalchemy import Column, Integer, String, Date, UniqueConstraint
 from app.db.base import Base
-from app.models.issue import Status
-from datetime import date
 
-class DailyStats(Base):
-    __tablename__ = "daily_stats"
+class StatsRollup(Base):
+    """
+    Per-day counter of issues created on `date`, broken down by their current
+    status, severity or priority (`dimension`), one row per `value`.
+    Maintained incrementally by the issue CRUD functions.
+    """
+    __tablename__ = "stats_rollups"
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, default=date.today, index=True)
-    status = Column(Enum(Status), nullable=False, index=True)
-    count = Column(Integer, default=0)
+    date = Column(Date, nullable=False)
+    dimension = Column(String, nullable=False)  # "status" | "severity" | "priority"
+    value = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("date", "dimension", "value", name="uq_stats_rollups_date_dimension_value"),
+    )
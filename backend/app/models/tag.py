@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
+from app.db.base import Base
+
+
+issue_tags = Table(
+    "issue_tags",
+    Base.metadata,
+    Column("issue_id", Integer, ForeignKey("issues.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # (issue_id, tag_id) is covered by the primary key; this one serves tag filters and tag counts
+    Index("ix_issue_tags_tag_id_issue_id", "tag_id", "issue_id"),
+)
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress. Bytes up to `offset` are durably written to the
+    session's partial file; sha256 is set once all `size` bytes have arrived and the
+    content has moved into attachment storage.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)
+    sha256 = Column(String(64), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True, nullable=False)
@@ -0,0 +1,15 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class AttachmentOut(BaseModel):
+    id: int
+    filename: str
+    content_type: Optional[str] = None
+    size: int
+    sha256: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
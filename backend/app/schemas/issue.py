@@ -1,7 +1,8 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from app.models.issue import Severity, Status, Priority
+from app.schemas.attachment import AttachmentOut
 
 
 class IssueBase(BaseModel):
@@ -26,22 +27,59 @@ class IssueUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class IssueImport(IssueCreate):
+    """
+    One NDJSON line of POST /api/issues/bulk.
+    """
+    reporter_id: Optional[int] = None  # defaults to the importing user
+    created_at: Optional[datetime] = None  # defaults to now; set it to keep the original date
+
+
+class IssueBatchUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=10000)
+    status: Optional[Status] = None
+    priority: Optional[Priority] = None
+
+
+class RowError(BaseModel):
+    line: Optional[int] = None  # bulk import: 1-based NDJSON line
+    id: Optional[int] = None  # batch update: issue id
+    error: str
+
+
+class IssueImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[RowError]  # the first few; `failed` counts them all
+
+
+class IssueBatchResult(BaseModel):
+    updated: List[int]
+    errors: List[RowError]
+
+
 class IssueOut(IssueBase):
     id: int
     reporter_id: int
     created_at: datetime
     tags: Optional[List[str]] = None
+    attachments: List[AttachmentOut] = []
 
     class Config:
         from_attributes = True  # ✅ Use this instead of orm_mode in Pydantic v2
-    
-    @classmethod
-    def from_orm(cls, obj):
-        """Custom from_orm to ensure priority has a default value."""
-        data = cls.__dict__.copy()
-        # Ensure priority is never None
-        if hasattr(obj, 'priority') and obj.priority is None:
-            obj.priority = 'MINOR'
-        if hasattr(obj, 'tags') and isinstance(obj.tags, str):
-            data.tags = obj.tags.split(',') if obj.tags else []
-        return super().from_orm(obj)
\ No newline at end of file
+
+
+# Validates a whole page of issue rows in one call (see list_issues)
+IssueOutList = TypeAdapter(List[IssueOut])
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class IssueSearchHit(BaseModel):
+    issue: IssueOut
+    score: float  # lower is more relevant
+    title_highlight: Optional[str] = None  # HTML-escaped text, matches wrapped in <mark>…</mark>
+    description_highlight: Optional[str] = None
@@ -0,0 +1,40 @@
+import json
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+from app.models.issue import Severity, Status, Priority
+
+
+class ExportRequest(BaseModel):
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson"
+    status: Optional[Status] = None
+    severity: Optional[Severity] = None
+    priority: Optional[Priority] = None
+    reporter_id: Optional[int] = None
+    tag: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+    def filters(self) -> dict:
+        return self.model_dump(exclude={"format"})
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[Any] = None
+
+    @field_validator("result", mode="before")
+    @classmethod
+    def parse_result(cls, value):
+        return json.loads(value) if isinstance(value, str) else value
+
+    class Config:
+        from_attributes = True
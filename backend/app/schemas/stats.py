@@ -10,3 +10,9 @@ class DailyStat(BaseModel):
 
     class Config:
         from_attributes = True  # Required for SQLAlchemy model conversion in Pydantic v2
+
+
+class TimeseriesPoint(BaseModel):
+    bucket: date  # first day of the day/week/month bucket
+    value: str
+    count: int
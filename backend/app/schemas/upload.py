@@ -0,0 +1,23 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class UploadCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: Optional[str] = None
+    size: int = Field(..., gt=0)
+
+
+class UploadOut(BaseModel):
+    id: str
+    filename: str
+    content_type: Optional[str] = None
+    size: int
+    offset: int
+    complete: bool
+    expires_at: datetime
+
+
+class AttachUpload(BaseModel):
+    upload_id: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from enum import Enum
 
 class Role(str, Enum):
@@ -33,5 +33,20 @@ class TokenData(BaseModel):
     user_id: int
     role: Role
 
+class Principal(BaseModel):
+    """Identity of the authenticated caller, cached between requests (see app.utils.cache)."""
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    email: str
+    role: Role
+
+class RoleUpdate(BaseModel):
+    role: Role
+
+class BulkUserResult(BaseModel):
+    created: int
+    skipped: list[str]
+
 # Alias User to UserOut for backward compatibility (so you can do `from app.schemas.user import User`)
 User = UserOut
@@ -0,0 +1,30 @@
+import os
+import tempfile
+from functools import lru_cache
+
+from app.core.config import settings
+from app.storage.base import StorageBackend, UploadTooLarge, blob_key, hash_file, store_blob, store_file, write_temp
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """
+    The configured storage backend (one instance per process).
+    """
+    if settings.STORAGE_BACKEND == "s3":
+        from app.storage.s3 import S3Storage
+        return S3Storage(settings.STORAGE_S3_BUCKET, endpoint_url=settings.STORAGE_S3_ENDPOINT_URL,
+                         region=settings.STORAGE_S3_REGION)
+    if settings.STORAGE_BACKEND == "local":
+        from app.storage.local import LocalStorage
+        return LocalStorage(settings.STORAGE_LOCAL_ROOT)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+def partial_path(upload_id: str) -> str:
+    """
+    Where the bytes of an unfinished resumable upload are kept.
+    """
+    directory = settings.UPLOAD_PARTIAL_DIR or get_storage().temp_dir or os.path.join(tempfile.gettempdir(), "tracker-uploads")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"resumable-{upload_id}")
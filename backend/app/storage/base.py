@@ -0,0 +1,112 @@
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+
+
+class UploadTooLarge(Exception):
+    """
+    Raised while streaming an upload once it exceeds the allowed size.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+def blob_key(sha256: str) -> str:
+    """
+    Storage key for content with the given hash, fanned out over two directory levels.
+    """
+    return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+class StorageBackend:
+    """
+    Where attachment content lives. Blobs are written once under blob_key(sha256) and
+    never modified, so callers may cache freely by key.
+    """
+
+    # Directory for in-progress uploads; put_file() is cheapest from here
+    temp_dir: Optional[str] = None
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def put_file(self, key: str, path: str):
+        """
+        Stores the finished file at path under key. The file at path is consumed.
+        """
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None,
+                   chunk_size: int = settings.UPLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+        """
+        Yields the bytes in [start, end] (inclusive; end=None reads to the end of the blob).
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        """
+        Filesystem path of the blob when the backend keeps one, else None.
+        """
+        return None
+
+
+def write_temp(fileobj: BinaryIO, temp_dir: Optional[str], max_bytes: int,
+               chunk_size: int = settings.UPLOAD_CHUNK_BYTES) -> tuple[str, str, int]:
+    """
+    Copies fileobj to a new temp file in fixed-size chunks, hashing as it goes.
+    Returns (path, sha256, size); raises UploadTooLarge past max_bytes and leaves no file behind.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(dir=temp_dir, prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := fileobj.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest(), size
+
+
+def hash_file(path: str, chunk_size: int = settings.UPLOAD_CHUNK_BYTES) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_file(storage: StorageBackend, path: str, sha256: str):
+    """
+    Moves a hashed temp file into storage, or drops it if the same content is already stored.
+    """
+    key = blob_key(sha256)
+    if storage.exists(key):
+        os.unlink(path)
+    else:
+        storage.put_file(key, path)
+
+
+def store_blob(storage: StorageBackend, fileobj: BinaryIO, max_bytes: int) -> tuple[str, int]:
+    """
+    Streams fileobj into content-addressed storage. Returns (sha256, size).
+    """
+    path, sha256, size = write_temp(fileobj, storage.temp_dir, max_bytes)
+    store_file(storage, path, sha256)
+    return sha256, size
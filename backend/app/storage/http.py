@@ -0,0 +1,75 @@
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from starlette.responses import FileResponse, StreamingResponse
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.storage.base import StorageBackend, blob_key
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses a single-range "bytes=" header into an inclusive (start, end). Returns None when
+    the header is absent or not a byte range; raises 416 when the range can't be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, _, end = header[len("bytes="):].strip().partition("-")
+    try:
+        if start:
+            first, last = int(start), int(end) if end else size - 1
+        else:  # suffix range: the last N bytes
+            first, last = max(size - int(end), 0), size - 1
+    except ValueError:
+        return None
+    if first > last or first >= size:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return first, min(last, size - 1)
+
+
+def content_disposition(filename: str) -> str:
+    return f"attachment; filename*=utf-8''{quote(filename)}"
+
+
+def attachment_response(request: Request, storage: StorageBackend, attachment: Attachment) -> Response:
+    """
+    Serves an attachment; its content hash is the ETag.
+    """
+    return stored_file_response(
+        request, storage, blob_key(attachment.sha256), f'"{attachment.sha256}"',
+        attachment.filename, attachment.content_type, attachment.size,
+    )
+
+
+def stored_file_response(request: Request, storage: StorageBackend, key: str, etag: str,
+                         filename: str, content_type: Optional[str], size: int) -> Response:
+    """
+    Serves a stored file with a strong ETag, If-None-Match revalidation and Range
+    support. Local files go out through FileResponse, which uses the server's zero-copy
+    send when available; with STORAGE_ACCEL_REDIRECT_PREFIX set, the proxy streams the
+    file instead and no Python worker is held for the transfer.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Accept-Ranges": "bytes"}
+    if etag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+
+    media_type = content_type or "application/octet-stream"
+    path = storage.local_path(key)
+    if path is not None and settings.STORAGE_ACCEL_REDIRECT_PREFIX:
+        headers["X-Accel-Redirect"] = settings.STORAGE_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + key
+        headers["Content-Disposition"] = content_disposition(filename)
+        return Response(media_type=media_type, headers=headers)
+    if path is not None:
+        return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition(filename)
+    byte_range = parse_range(request.headers.get("range"), size)
+    if byte_range is None or request.headers.get("if-range", etag) != etag:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(storage.iter_bytes(key), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(storage.iter_bytes(key, start, end), status_code=206, media_type=media_type, headers=headers)
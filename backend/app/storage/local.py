@@ -0,0 +1,53 @@
+import os
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from app.storage.base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    """
+    Blobs as files under a root directory. Temp files are created inside the root so
+    put_file() is an atomic rename.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.temp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self.temp_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put_file(self, key: str, path: str):
+        dest = self._path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(path, dest)
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None,
+                   chunk_size: int = settings.UPLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
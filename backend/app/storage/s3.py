@@ -0,0 +1,57 @@
+import os
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from app.storage.base import StorageBackend
+
+
+def _is_not_found(exc: Exception) -> bool:
+    error = getattr(exc, "response", {}).get("Error", {})
+    return str(error.get("Code")) in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(StorageBackend):
+    """
+    Blobs as objects in an S3-compatible bucket (AWS, MinIO, ...). Requires boto3 unless
+    a client is passed in.
+    """
+
+    def __init__(self, bucket: str, client=None, endpoint_url: Optional[str] = None, region: Optional[str] = None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if _is_not_found(e):
+                return False
+            raise
+        return True
+
+    def put_file(self, key: str, path: str):
+        # upload_file switches to multipart uploads for large files
+        self.client.upload_file(path, self.bucket, key)
+        os.unlink(path)
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None,
+                   chunk_size: int = settings.UPLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)["Body"]
+        try:
+            while chunk := body.read(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
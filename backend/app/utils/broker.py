@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+# NOTIFY payloads must be shorter than 8000 bytes
+POSTGRES_MAX_PAYLOAD = 7999
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class Broker:
+    """
+    Pub/sub bus between API processes. Every process that subscribes receives every
+    published message (its own included) exactly once and fans it out to its local
+    WebSocket clients, so a process subscribes once however many sockets it holds.
+    """
+
+    def __init__(self):
+        self._handler: Optional[Handler] = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, handler: Handler):
+        """
+        Starts delivering messages to handler. Idempotent; the first handler wins.
+        """
+        if self._handler is not None:
+            return
+        async with self._lock:
+            if self._handler is None:
+                await self._start()
+                self._handler = handler
+
+    async def publish(self, message: str):
+        raise NotImplementedError
+
+    async def close(self):
+        self._handler = None
+
+    async def _start(self):
+        pass
+
+    def _deliver(self, message: str):
+        if self._handler is not None:
+            try:
+                self._handler(message)
+            except Exception:
+                logger.exception("Broker handler failed")
+
+
+class MemoryBroker(Broker):
+    """
+    Single-process bus: publish() hands the message straight to this process's handler.
+    """
+
+    async def publish(self, message: str):
+        self._deliver(message)
+
+
+class PostgresBroker(Broker):
+    """
+    LISTEN/NOTIFY on one channel, using asyncpg. One connection listens (and is re-opened
+    if it drops); another publishes.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._listener = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+        self._reconnect: Optional[asyncio.Task] = None
+
+    async def _start(self):
+        await self._listen()
+
+    async def _listen(self):
+        import asyncpg
+        self._listener = await asyncpg.connect(self.dsn)
+        await self._listener.add_listener(self.channel, self._on_notify)
+        self._listener.add_termination_listener(self._on_terminate)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._deliver(payload)
+
+    def _on_terminate(self, connection):
+        if self._handler is not None and (self._reconnect is None or self._reconnect.done()):
+            self._reconnect = asyncio.create_task(self._relisten())
+
+    async def _relisten(self):
+        # Messages published while disconnected are lost; clients catch up by sequence number
+        while self._handler is not None:
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.warning(f"Postgres broker reconnect failed: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def publish(self, message: str):
+        if len(message.encode()) > POSTGRES_MAX_PAYLOAD:
+            logger.warning("Event too large for NOTIFY; delivering to this process only")
+            self._deliver(message)
+            return
+        import asyncpg
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await asyncpg.connect(self.dsn)
+            await self._publisher.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def close(self):
+        await super().close()
+        for connection in (self._listener, self._publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+
+class RedisBroker(Broker):
+    """
+    Redis pub/sub on one channel. Requires the redis package (redis.asyncio).
+    """
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("A redis:// BROKER_URL requires the redis package (pip install redis)") from e
+        self.client = redis.from_url(url, decode_responses=True)
+        self.channel = channel
+        self._reader: Optional[asyncio.Task] = None
+
+    async def _start(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._reader = asyncio.create_task(self._read(pubsub))
+
+    async def _read(self, pubsub):
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._deliver(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis broker connection lost: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                try:
+                    await pubsub.subscribe(self.channel)
+                except Exception:
+                    pass
+
+    async def publish(self, message: str):
+        await self.client.publish(self.channel, message)
+
+    async def close(self):
+        await super().close()
+        if self._reader is not None:
+            self._reader.cancel()
+        await self.client.aclose()
+
+
+def create_broker(url: str, channel: str) -> Broker:
+    """
+    Builds a broker from a URL: memory://, postgresql://… or redis://….
+    """
+    scheme = url.split("://", 1)[0].split("+", 1)[0]
+    if scheme == "memory":
+        return MemoryBroker()
+    if scheme in ("postgresql", "postgres"):
+        # asyncpg wants a plain libpq-style URL
+        return PostgresBroker("postgresql://" + url.split("://", 1)[1], channel)
+    if scheme in ("redis", "rediss"):
+        return RedisBroker(url, channel)
+    raise ValueError(f"Unsupported BROKER_URL scheme: {scheme}")
+
+
+broker = create_broker(settings.BROKER_URL, settings.BROKER_CHANNEL)
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+from app.metrics import prometheus as metrics
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+    Hits and misses are counted in Prometheus under the cache's name.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[1] < time.monotonic():
+                del self._data[key]
+                item = None
+            if item is None:
+                metrics.cache_misses.labels(self.name).inc()
+                return None
+            self._data.move_to_end(key)
+        metrics.cache_hits.labels(self.name).inc()
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# user id -> Principal
+user_cache = TTLCache("user", settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+# JWT -> user id, so repeat requests skip decoding the token
+token_cache = TTLCache("token", settings.TOKEN_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+# user id -> True while the user's reads must stay on the primary after a write
+recent_writers = TTLCache("recent_writer", settings.USER_CACHE_MAX_SIZE, settings.READ_AFTER_WRITE_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """
+    Drops a user's cached principal. Call after changing their role or deleting them;
+    tokens cached for the user resolve through user_cache, so they are covered too.
+    """
+    user_cache.delete(user_id)
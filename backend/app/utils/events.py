@@ -0,0 +1,169 @@
+import json
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.crud.stats import ROLLUP_DIMENSIONS
+from app.models.issue import Issue
+from app.utils.broker import broker
+from app.utils.websocket import Connection, ConnectionManager, RESYNC, manager
+
+# Topics a client can subscribe to:
+#   issues       every issue event
+#   issue:<id>   events for one issue
+#   mine         events for issues the client reported
+#   stats        counter deltas after any issue write
+# Reporters only ever receive events for their own issues, whatever they subscribe to.
+ALL_ISSUES = "issues"
+STATS = "stats"
+MINE = "mine"
+
+# Fields carried by issue events; updates only send the ones that changed
+ISSUE_FIELDS = ("title", "description", "severity", "status", "priority", "tags", "reporter_id", "created_at")
+
+
+def issue_topic(issue_id: int) -> str:
+    return f"issue:{issue_id}"
+
+
+def reporter_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def issue_snapshot(issue: Issue) -> dict:
+    """
+    The event-relevant state of an issue. Take it before changing the issue to diff later.
+    """
+    snapshot = {field: _plain(getattr(issue, field)) for field in ISSUE_FIELDS}
+    snapshot["tags"] = list(issue.tags)
+    snapshot["id"] = issue.id
+    return snapshot
+
+
+def _stats_deltas(before: Optional[dict], after: Optional[dict]) -> dict:
+    deltas = {}
+    for dimension in ROLLUP_DIMENSIONS:
+        old = before and before[dimension]
+        new = after and after[dimension]
+        if old == new:
+            continue
+        counts = deltas.setdefault(dimension, {})
+        if old is not None:
+            counts[old] = counts.get(old, 0) - 1
+        if new is not None:
+            counts[new] = counts.get(new, 0) + 1
+    return deltas
+
+
+def issue_events(kind: str, before: Optional[dict], after: Optional[dict]) -> list[dict]:
+    """
+    Events for one issue write: "created" (full issue), "updated"/"triaged" (changed
+    fields only) or "deleted" (no fields), plus a stats delta when counters moved.
+    """
+    current = after or before
+    event = {"type": f"issue.{kind}", "issue_id": current["id"], "reporter_id": current["reporter_id"]}
+    if kind == "created":
+        event["changes"] = {k: v for k, v in after.items() if k != "id"}
+    elif kind != "deleted":
+        event["changes"] = {k: v for k, v in after.items() if before.get(k) != v}
+        if not event["changes"]:
+            return []
+    events = [event]
+    deltas = _stats_deltas(before, after)
+    if deltas:
+        events.append({"type": "stats.changed", "deltas": deltas})
+    return events
+
+
+def batch_issue_events(kind: str, changes: list[tuple[Optional[dict], Optional[dict]]], per_issue: bool = True) -> list[dict]:
+    """
+    issue_events for many issues written together: one event per issue (unless
+    per_issue is False, e.g. for bulk imports) and a single merged stats delta.
+    """
+    events, deltas = [], {}
+    for before, after in changes:
+        for event in issue_events(kind, before, after):
+            if event["type"] != "stats.changed":
+                if per_issue:
+                    events.append(event)
+                continue
+            for dimension, counts in event["deltas"].items():
+                merged = deltas.setdefault(dimension, {})
+                for value, delta in counts.items():
+                    merged[value] = merged.get(value, 0) + delta
+    deltas = {d: {v: n for v, n in counts.items() if n} for d, counts in deltas.items()}
+    deltas = {d: counts for d, counts in deltas.items() if counts}
+    if deltas:
+        events.append({"type": "stats.changed", "deltas": deltas})
+    return events
+
+
+async def publish_events(events: list[dict]):
+    """
+    Publishes events to every API process. Run after the write has committed (e.g. as a
+    background task) so subscribers never see uncommitted state.
+    """
+    for event in events:
+        await broker.publish(json.dumps(event, separators=(",", ":")))
+
+
+def event_topics(event: dict) -> tuple:
+    if event["type"] == "stats.changed":
+        return (STATS,)
+    return (ALL_ISSUES, issue_topic(event["issue_id"]), reporter_topic(event["reporter_id"]))
+
+
+class EventHub:
+    """
+    Receives events from the broker, numbers them, keeps the last `size` in a ring buffer
+    and routes each to the connections subscribed to its topics. Sequence numbers are
+    per process (identified by `epoch`), so a client resuming elsewhere or after a
+    restart gets a resync instead of a replay.
+    """
+
+    def __init__(self, manager: ConnectionManager, size: int = settings.WS_REPLAY_BUFFER_SIZE):
+        self.manager = manager
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.buffer: deque = deque(maxlen=size)
+
+    def dispatch(self, message: str):
+        event = json.loads(message)
+        self.seq += 1
+        event["seq"] = self.seq
+        event["epoch"] = self.epoch
+        data = json.dumps(event, separators=(",", ":"))
+        topics = event_topics(event)
+        owner_id = event.get("reporter_id")
+        self.buffer.append((self.seq, topics, owner_id, data))
+        self.manager.publish(topics, data, owner_id)
+
+    def replay(self, connection: Connection, since: str) -> bool:
+        """
+        Re-sends the buffered events after `since` ("<epoch>:<seq>") that match the
+        connection's topics. Sends a resync and returns False if they are not all buffered.
+        """
+        epoch, _, seq = since.partition(":")
+        try:
+            last_seen = int(seq)
+        except ValueError:
+            last_seen = -1
+        oldest = self.buffer[0][0] if self.buffer else self.seq + 1
+        if epoch != self.epoch or last_seen < oldest - 1 or last_seen > self.seq:
+            self.manager.send(connection, RESYNC)
+            return False
+        for seq, topics, owner_id, data in self.buffer:
+            if seq > last_seen and not connection.topics.isdisjoint(topics) and self.manager.allowed(connection, owner_id):
+                self.manager.send(connection, data)
+        return True
+
+
+hub = EventHub(manager)
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+
+from app.crud.export import EXPORT_FIELDS
+
+Batches = Iterable[list[tuple]]
+
+
+class ExportFormatUnavailable(Exception):
+    """
+    The format needs an optional package that is not installed.
+    """
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def ndjson_chunks(batches: Batches) -> Iterator[bytes]:
+    """
+    One JSON object per line; tags as a list.
+    """
+    encode = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+    for batch in batches:
+        yield "".join(encode(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in batch).encode()
+
+
+def csv_chunks(batches: Batches) -> Iterator[bytes]:
+    """
+    CSV with a header row; tags comma-joined in one column, as the issue form takes them.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows((*row[:-1], ",".join(row[-1])) for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Drain(io.RawIOBase):
+    """
+    Write-only file that hands out what was written since the last drain().
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_chunks(batches: Batches) -> Iterator[bytes]:
+    """
+    Parquet with one row group per batch. Requires pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportFormatUnavailable("Parquet export requires the pyarrow package (pip install pyarrow)") from e
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("severity", pa.string()),
+        ("status", pa.string()),
+        ("priority", pa.string()),
+        ("reporter_id", pa.int64()),
+        ("created_at", pa.timestamp("us")),
+        ("tags", pa.list_(pa.string())),
+    ])
+    return _parquet_chunks(batches, pa, pq, schema)
+
+
+def _parquet_chunks(batches, pa, pq, schema) -> Iterator[bytes]:
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+
+# format -> (media type, file extension, encoder)
+EXPORT_FORMATS: dict[str, tuple[str, str, Callable[[Batches], Iterator[bytes]]]] = {
+    "ndjson": ("application/x-ndjson", "ndjson", ndjson_chunks),
+    "csv": ("text/csv", "csv", csv_chunks),
+    "parquet": ("application/vnd.apache.parquet", "parquet", parquet_chunks),
+}
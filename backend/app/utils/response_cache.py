@@ -0,0 +1,165 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.issue import Issue
+from app.models.stats import StatsRollup
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Rendered response kept by the cache: (status code, media type, body)
+Entry = tuple[int, str, bytes]
+
+_VERSION_KEY = "issues_version"
+
+
+class ResponseCache:
+    """
+    Rendered responses keyed by request, invalidated by a global "issues version" that is
+    bumped after every committed issue or rollup write. version() is part of every key and
+    ETag, so a bump retires all entries and validators at once without deleting anything.
+    """
+
+    async def version(self) -> str:
+        raise NotImplementedError
+
+    def bump(self):
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[Entry]:
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: Entry):
+        raise NotImplementedError
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    Per-process LRU. Other workers' writes are not seen, so the version also rolls over
+    every TTL window: with several workers, a stale response or 304 lives at most ttl
+    seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._entries = TTLCache("response", maxsize, ttl)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    async def version(self) -> str:
+        return f"{self._version}.{int(time.time() // self.ttl)}"
+
+    def bump(self):
+        with self._lock:
+            self._version += 1
+
+    async def get(self, key: str) -> Optional[Entry]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: Entry):
+        self._entries.set(key, entry)
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Shared by all workers: the version is a Redis counter and entries expire after ttl.
+    Requires the redis package. Redis errors degrade to cache misses; a failed bump is
+    logged and covered by the entry TTL.
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "tracker:response:"):
+        try:
+            import redis
+            import redis.asyncio as redis_async
+        except ImportError as e:
+            raise RuntimeError("A redis:// STATS_CACHE_URL requires the redis package (pip install redis)") from e
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = redis_async.from_url(url)
+        # Bumps run in the committing thread, which may not have an event loop
+        self.sync_client = redis.Redis.from_url(url)
+
+    async def version(self) -> str:
+        try:
+            return (await self.client.get(self.prefix + _VERSION_KEY) or b"0").decode()
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return f"unavailable.{time.time()}"  # never matches; nothing is served from cache
+
+    def bump(self):
+        try:
+            self.sync_client.incr(self.prefix + _VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not bump the issues version: {e}")
+
+    async def get(self, key: str) -> Optional[Entry]:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        header, body = raw.split(b"\n", 1)
+        status, media_type = header.decode().split(" ", 1)
+        return int(status), media_type, body
+
+    async def set(self, key: str, entry: Entry):
+        status, media_type, body = entry
+        try:
+            await self.client.set(self.prefix + key, f"{status} {media_type}\n".encode() + body, ex=int(self.ttl))
+        except Exception:
+            pass
+
+
+def create_response_cache(url: str) -> ResponseCache:
+    """
+    Builds a response cache from a URL: memory:// or redis://….
+    """
+    scheme = url.split("://", 1)[0]
+    if scheme == "memory":
+        return MemoryResponseCache(settings.STATS_CACHE_MAX_SIZE, settings.STATS_CACHE_TTL_SECONDS)
+    if scheme in ("redis", "rediss"):
+        return RedisResponseCache(url, settings.STATS_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unsupported STATS_CACHE_URL scheme: {scheme}")
+
+
+response_cache = create_response_cache(settings.STATS_CACHE_URL)
+
+
+# ─────────────────────────────────────────────────────
+# Issues version: bumped after any session commits a change to issues or rollups
+
+_TRACKED = (Issue, StatsRollup)
+_DIRTY = "issues_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flushed_writes(session, flush_context):
+    if any(isinstance(obj, _TRACKED) for obj in itertools.chain(session.new, session.dirty, session.deleted)):
+        session.info[_DIRTY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_writes(state):
+    # Bulk INSERT/UPDATE/DELETE and upserts bypass the unit of work
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper is not None:
+        if state.bind_mapper.class_ in _TRACKED:
+            state.session.info[_DIRTY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    if session.info.pop(_DIRTY, False):
+        response_cache.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_DIRTY, None)
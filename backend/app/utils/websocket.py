@@ -1,19 +1,215 @@
+import asyncio
+import json
+from typing import Optional
+
 from fastapi import WebSocket
-from typing import List
+
+from app.core.config import settings
+from app.metrics import prometheus as metrics
+
+PING = json.dumps({"type": "ping"})
+# Sent in place of a backlog dropped under the "coalesce" policy: refetch instead of replaying
+RESYNC = json.dumps({"type": "resync"})
+
+# Close code for clients disconnected for falling behind ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class Connection:
+    """
+    One client socket with its own bounded outbound queue, drained by a dedicated writer
+    task so a slow client only ever delays itself.
+    """
+    __slots__ = ("websocket", "queue", "writer", "last_send", "sending", "topics", "user_id", "own_only")
+
+    def __init__(self, websocket: WebSocket, queue_size: int, user_id: Optional[int] = None, own_only: bool = False):
+        self.websocket = websocket
+        self.topics: set[str] = set()
+        # Resolved once at handshake. own_only connections (reporters) only receive
+        # messages about things they own; see ConnectionManager.publish.
+        self.user_id = user_id
+        self.own_only = own_only
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        # Loop time the latest send started, and whether it is still in progress;
+        # read by the manager's watchdog for pings and send timeouts
+        self.last_send = asyncio.get_running_loop().time()
+        self.sending = False
+
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Tracks live WebSocket connections and fans messages out to them.
+
+    broadcast() never awaits a client: it puts the message on every connection's queue
+    and returns. When a queue is full the slow-consumer policy decides what happens:
+      drop_oldest  discard the oldest queued message to make room
+      coalesce     discard the whole backlog and queue a single {"type": "resync"}
+      disconnect   close the connection (code 1013)
+    Idle connections get an application-level {"type": "ping"} every ping_interval
+    seconds; a send that fails or takes longer than send_timeout drops the client.
+    Both are checked by one watchdog task per manager rather than a timer per send,
+    which would cost more than the send itself at high fan-out.
+    """
 
-    async def connect(self, websocket: WebSocket):
+    def __init__(
+        self,
+        queue_size: int = settings.WS_QUEUE_SIZE,
+        policy: str = settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        ping_interval: float = settings.WS_PING_INTERVAL_SECONDS,
+    ):
+        if policy not in ("drop_oldest", "coalesce", "disconnect"):
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.ping_interval = ping_interval
+        self.connections: set[Connection] = set()
+        # topic -> connections subscribed to it
+        self.subscribers: dict[str, set[Connection]] = {}
+        self._closing: set[asyncio.Task] = set()
+        self._watchdog: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket, user_id: Optional[int] = None, own_only: bool = False) -> Connection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        return self.register(websocket, user_id, own_only)
+
+    def register(self, websocket: WebSocket, user_id: Optional[int] = None, own_only: bool = False) -> Connection:
+        """
+        Starts delivering to an already accepted socket.
+        """
+        connection = Connection(websocket, self.queue_size, user_id, own_only)
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.connections.add(connection)
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.create_task(self._watch())
+        return connection
+
+    def disconnect(self, connection: Connection):
+        """
+        Stops delivering to the connection. Safe to call more than once.
+        """
+        self.connections.discard(connection)
+        self.unsubscribe(connection, list(connection.topics))
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+    def subscribe(self, connection: Connection, topics):
+        for topic in topics:
+            connection.topics.add(topic)
+            self.subscribers.setdefault(topic, set()).add(connection)
+
+    def unsubscribe(self, connection: Connection, topics):
+        for topic in topics:
+            connection.topics.discard(topic)
+            subscribers = self.subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.subscribers[topic]
+
+    def publish(self, topics, message: str, owner_id: Optional[int] = None):
+        """
+        Queues message once for every connection subscribed to any of the topics.
+        A message with an owner_id skips own_only connections of other users: one
+        comparison per connection, whatever the roles involved.
+        """
+        targets = set()
+        for topic in topics:
+            subscribers = self.subscribers.get(topic)
+            if subscribers:
+                targets.update(subscribers)
+        for connection in targets:
+            if self.allowed(connection, owner_id):
+                self.send(connection, message)
+
+    @staticmethod
+    def allowed(connection: Connection, owner_id: Optional[int]) -> bool:
+        return not connection.own_only or owner_id is None or connection.user_id == owner_id
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        self.broadcast_nowait(message)
+
+    def broadcast_nowait(self, message: str):
+        for connection in list(self.connections):
+            self.send(connection, message)
+
+    def send(self, connection: Connection, message: str):
+        """
+        Queues a message for one connection, applying the slow-consumer policy if it is full.
+        """
+        queue = connection.queue
+        try:
+            queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self.policy == "drop_oldest":
+            queue.get_nowait()
+            queue.put_nowait(message)
+            metrics.ws_messages_dropped.labels(reason="drop_oldest").inc()
+        elif self.policy == "coalesce":
+            dropped = queue.qsize() + 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            metrics.ws_messages_dropped.labels(reason="coalesce").inc(dropped)
+        else:
+            metrics.ws_messages_dropped.labels(reason="disconnect").inc(queue.qsize() + 1)
+            self._close(connection, SLOW_CONSUMER_CLOSE_CODE)
+
+    def queued(self) -> int:
+        return sum(c.queue.qsize() for c in self.connections)
+
+    async def _write(self, connection: Connection):
+        websocket, queue = connection.websocket, connection.queue
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await queue.get()
+                connection.last_send = loop.time()
+                connection.sending = True
+                await websocket.send_text(message)
+                connection.sending = False
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The client went away
+            metrics.ws_messages_dropped.labels(reason="send_failed").inc(queue.qsize() + 1)
+            self._close(connection, SLOW_CONSUMER_CLOSE_CODE)
+
+    async def _watch(self):
+        """
+        Pings idle connections and drops those stuck in a send. Exits once no connections remain.
+        """
+        loop = asyncio.get_running_loop()
+        interval = min(self.send_timeout, self.ping_interval) / 2
+        while self.connections:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            for connection in list(self.connections):
+                if connection.sending:
+                    if now - connection.last_send > self.send_timeout:
+                        metrics.ws_messages_dropped.labels(reason="send_timeout").inc(connection.queue.qsize() + 1)
+                        self._close(connection, SLOW_CONSUMER_CLOSE_CODE)
+                elif now - connection.last_send > self.ping_interval and connection.queue.empty():
+                    connection.queue.put_nowait(PING)
+
+    def _close(self, connection: Connection, code: int):
+        self.disconnect(connection)
+        task = asyncio.create_task(self._close_socket(connection.websocket, code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_socket(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
 
 manager = ConnectionManager()
+metrics.ws_connections.set_function(lambda: len(manager.connections))
+metrics.ws_queued_messages.set_function(manager.queued)
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.attachment import release_blobs
+from app.crud.export import iter_issue_batches
+from app.crud.job import delete_finished_jobs
+from app.crud.stats import reconcile_rollups
+from app.crud.upload import expire_upload_sessions
+from app.models.job import Job
+from app.schemas.job import ExportRequest
+from app.storage import get_storage
+from app.utils.export import EXPORT_FORMATS, ExportFormatUnavailable
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(db, payload, job); the return value is stored as the job's result
+Handler = Callable[[Session, dict, Job], Any]
+HANDLERS: dict[str, Handler] = {}
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a handler when retrying cannot help; the job fails at once.
+    """
+
+
+def handler(kind: str):
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def export_key(job_id: int, extension: str) -> str:
+    return f"exports/{job_id}.{extension}"
+
+
+@handler("stats.reconcile")
+def reconcile_stats(db: Session, payload: dict, job: Job):
+    reconcile_rollups(db, days=payload.get("days", settings.STATS_RECONCILE_DAYS))
+
+
+@handler("uploads.expire")
+def expire_uploads(db: Session, payload: dict, job: Job):
+    return {"removed": expire_upload_sessions(db)}
+
+
+@handler("attachments.release")
+def release_attachments(db: Session, payload: dict, job: Job):
+    release_blobs(db, get_storage(), payload["hashes"])
+
+
+@handler("issues.export")
+def export_issues(db: Session, payload: dict, job: Job):
+    """
+    Writes the export to a temp file and moves it into storage under export_key(), where
+    GET /api/jobs/{id}/result serves it from.
+    """
+    request = ExportRequest.model_validate(payload)
+    media_type, extension, encode = EXPORT_FORMATS[request.format]
+    rows = 0
+
+    def counted(batches):
+        nonlocal rows
+        for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    storage = get_storage()
+    fd, path = tempfile.mkstemp(dir=storage.temp_dir, prefix="export-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in encode(counted(iter_issue_batches(db, **request.filters()))):
+                out.write(chunk)
+        size = os.path.getsize(path)
+        key = export_key(job.id, extension)
+        storage.put_file(key, path)
+    except ExportFormatUnavailable as e:
+        os.unlink(path)
+        raise PermanentJobError(str(e)) from e
+    except BaseException:
+        if os.path.exists(path):
+            os.unlink(path)
+        raise
+    return {"key": key, "filename": f"issues.{extension}", "media_type": media_type, "size": size, "rows": rows}
+
+
+@handler("jobs.cleanup")
+def cleanup_jobs(db: Session, payload: dict, job: Job):
+    """
+    Deletes jobs finished more than JOB_RETENTION_HOURS ago, and their export files.
+    """
+    deleted = delete_finished_jobs(db, datetime.utcnow() - timedelta(hours=settings.JOB_RETENTION_HOURS))
+    storage = get_storage()
+    for _, kind, result in deleted:
+        if kind == "issues.export" and result:
+            storage.delete(json.loads(result)["key"])
+    return {"deleted": len(deleted)}
+
+
+# Enqueued by every worker each interval under the same idempotency key, so exactly one
+# copy runs per interval however many workers there are: (kind, interval in seconds)
+PERIODIC_JOBS: list[tuple[str, float]] = [
+    ("stats.reconcile", settings.STATS_RECONCILE_INTERVAL_MINUTES * 60),
+    ("uploads.expire", settings.UPLOAD_CLEANUP_INTERVAL_MINUTES * 60),
+    ("jobs.cleanup", 3600),
+]
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+import app.utils.response_cache  # noqa: F401  (bumps the stats cache version on rollup writes)
+from app.core.config import settings
+from app.crud.job import claim_jobs, complete_job, enqueue_job, fail_job, heartbeat_job, requeue_stale_jobs
+from app.db.session import SessionLocal
+from app.metrics import prometheus as metrics
+from app.models.job import Job
+from app.workers.jobs import HANDLERS, PERIODIC_JOBS, PermanentJobError
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs jobs from the jobs table on a pool of `concurrency` threads. Each poll requeues
+    jobs of crashed workers, enqueues due periodic jobs and claims as many due jobs as
+    there are idle threads; any number of runners can share one database.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 concurrency: int = settings.JOB_WORKER_CONCURRENCY, worker_id: Optional[str] = None,
+                 periodic: list[tuple[str, float]] = PERIODIC_JOBS):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.periodic = periodic
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="job")
+        self._running = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._scheduled: dict[str, int] = {}  # kind -> last periodic slot enqueued by this runner
+
+    def schedule_periodic(self, db: Session, now: Optional[float] = None):
+        now = now or time.time()
+        for kind, interval in self.periodic:
+            slot = int(now // interval)
+            if self._scheduled.get(kind) == slot:
+                continue
+            enqueue_job(db, kind, idempotency_key=f"{kind}@{slot}", run_at=datetime.utcfromtimestamp(slot * interval))
+            self._scheduled[kind] = slot
+
+    def poll(self) -> int:
+        """
+        One scheduling round. Returns how many jobs were handed to the pool.
+        """
+        with self._lock:
+            idle = self.concurrency - self._running
+        db = self.session_factory()
+        try:
+            requeue_stale_jobs(db)
+            self.schedule_periodic(db)
+            job_ids = claim_jobs(db, self.worker_id, idle) if idle else []
+        finally:
+            db.close()
+        for job_id in job_ids:
+            with self._lock:
+                self._running += 1
+            self._executor.submit(self._run_in_pool, job_id)
+        return len(job_ids)
+
+    def _run_in_pool(self, job_id: int):
+        try:
+            self.run_job(job_id)
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._wake.set()
+
+    def run_job(self, job_id: int):
+        """
+        Runs one claimed job in a session of its own and records the outcome. While it
+        runs, a heartbeat thread keeps its lock fresh so long jobs are not taken for lost.
+        """
+        db = self.session_factory()
+        started = time.perf_counter()
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, finished), daemon=True)
+        heartbeat.start()
+        try:
+            job = db.get(Job, job_id)
+            kind = job.kind
+            metrics.jobs_running.labels(kind).inc()
+            try:
+                fn = HANDLERS.get(kind)
+                if fn is None:
+                    raise PermanentJobError(f"No handler for job kind {kind!r}")
+                result = fn(db, json.loads(job.payload), job)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Job {job_id} ({kind}) failed: {e}\n{traceback.format_exc()}")
+                status = fail_job(db, job, self.worker_id, f"{type(e).__name__}: {e}",
+                                  retry=not isinstance(e, PermanentJobError))
+                outcome = {None: "lost", "failed": "failed"}.get(status, "retried")
+            else:
+                outcome = "done" if complete_job(db, job, self.worker_id, result) else "lost"
+            if outcome == "lost":
+                logger.warning(f"Job {job_id} ({kind}) lost its lock while running; outcome discarded")
+            metrics.jobs_running.labels(kind).dec()
+            metrics.jobs_processed.labels(kind, outcome).inc()
+            metrics.job_seconds.labels(kind).observe(time.perf_counter() - started)
+        finally:
+            finished.set()
+            heartbeat.join()
+            db.close()
+
+    def _heartbeat(self, job_id: int, finished: threading.Event):
+        while not finished.wait(settings.JOB_HEARTBEAT_SECONDS):
+            db = self.session_factory()
+            try:
+                if not heartbeat_job(db, job_id, self.worker_id):
+                    logger.warning(f"Job {job_id} is no longer held by {self.worker_id}")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat for job {job_id} failed: {e}")
+            finally:
+                db.close()
+
+    def run_pending(self) -> int:
+        """
+        Runs due jobs inline, one at a time, until none are left. Returns how many ran.
+        For tests and one-off runs (worker --once); periodic jobs are not scheduled.
+        """
+        ran = 0
+        while True:
+            db = self.session_factory()
+            try:
+                job_ids = claim_jobs(db, self.worker_id, 1)
+            finally:
+                db.close()
+            if not job_ids:
+                return ran
+            self.run_job(job_ids[0])
+            ran += 1
+
+    def run_forever(self):
+        logger.info(f"Job worker {self.worker_id} started with {self.concurrency} threads")
+        while not self._stopping.is_set():
+            # Set by finishing jobs: a freed thread is worth a poll before the interval ends
+            self._wake.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Job poll failed: {e}")
+            self._wake.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+        self._executor.shutdown(wait=True)
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stop(self):
+        """
+        Stops claiming new jobs; run_forever() returns once the running ones finish.
+        """
+        self._stopping.set()
+        self._wake.set()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Rebuilds stats rollup history from the issues table.
+
+Usage:
+    python backfill_stats.py                          # oldest issue .. today
+    python backfill_stats.py --from 2025-01-01 --to 2025-06-30
+"""
+
+import argparse
+import sys
+import os
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.db.base import Base
+from app.db.session import engine
+from app.crud.stats import backfill_rollups
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill stats rollups from issues")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🔧 Backfilling stats rollups...")
+        backfill_rollups(db, args.start, args.end)
+        print("✅ Stats rollups rebuilt")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /api/stats/analytics aggregation.
+
+Seeds a throwaway SQLite database with N issues and times get_analytics()
+against the previous approach of loading every Issue row and counting in Python.
+
+Usage:
+    python benchmarks/bench_analytics.py              # 1k, 10k, 100k, 1M
+    python benchmarks/bench_analytics.py 1000 50000   # custom sizes
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.issue import Issue, Status, Severity, Priority
+from app.models.user import User
+from app.crud.stats import get_analytics
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+BATCH = 50_000
+
+
+def seed(engine, n):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+        for offset in range(0, n, BATCH):
+            conn.execute(insert(Issue), [
+                {
+                    "title": f"Issue {i}",
+                    "description": "x" * 200,
+                    "status": rng.choice(list(Status)),
+                    "severity": rng.choice(list(Severity)),
+                    "priority": rng.choice(list(Priority)),
+                    "reporter_id": 1,
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + BATCH, n))
+            ])
+
+
+def analytics_python(db):
+    """The pre-aggregation implementation, kept here as the baseline."""
+    all_issues = db.query(Issue).all()
+    result = {
+        "total_issues": len(all_issues),
+        "open_issues": len([i for i in all_issues if i.status == "OPEN"]),
+        "in_progress_issues": len([i for i in all_issues if i.status == "IN_PROGRESS"]),
+        "completed_issues": len([i for i in all_issues if i.status == "DONE"]),
+        "high_priority_issues": len([i for i in all_issues if i.priority in ("CRITICAL", "BLOCKER")]),
+        "medium_priority_issues": len([i for i in all_issues if i.priority == "MINOR"]),
+        "low_priority_issues": len([i for i in all_issues if i.priority == "TRIVIAL"]),
+    }
+    result["issues_by_status"] = {s: len([i for i in all_issues if i.status == s]) for s in ["OPEN", "TRIAGED", "IN_PROGRESS", "DONE"]}
+    result["issues_by_severity"] = {s: len([i for i in all_issues if i.severity == s]) for s in ["LOW", "MEDIUM", "HIGH"]}
+    return result
+
+
+def timed(fn, db, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        t0 = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'issues':>10} {'sql (ms)':>12} {'python (ms)':>12}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            seed(engine, n)
+            db = sessionmaker(bind=engine)()
+            try:
+                sql_ms = timed(get_analytics, db, repeat=5)
+                # Hydrating every row gets slow quickly; one pass is enough to show the trend
+                py_ms = timed(analytics_python, db, repeat=1 if n > 100_000 else 3)
+            finally:
+                db.close()
+                engine.dispose()
+        print(f"{n:>10} {sql_ms:>12.1f} {py_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /api/issues/search.
+
+Seeds a throwaway SQLite database (FTS5 index included) with N issues of random
+text and times search_issues() for a common and a rare term against a
+LIKE '%term%' scan over title and description.
+
+Usage:
+    python benchmarks/bench_search.py               # 10k, 100k, 1M
+    python benchmarks/bench_search.py 1000 50000    # custom sizes
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.search import ensure_search_index
+from app.models.issue import Issue
+from app.models.user import User
+from app.crud.search import search_issues
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+BATCH = 50_000
+VOCABULARY = [f"word{i}" for i in range(5_000)]
+COMMON, RARE = "word1", "word2500"
+
+
+def sentence(rng, n):
+    # Zipf-ish: low-numbered words are far more frequent
+    return " ".join(VOCABULARY[min(int(rng.paretovariate(1.1)) - 1, len(VOCABULARY) - 1)] for _ in range(n))
+
+
+def seed(engine, n):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+        for offset in range(0, n, BATCH):
+            conn.execute(insert(Issue), [
+                {
+                    "title": sentence(rng, 6),
+                    "description": sentence(rng, 40),
+                    "reporter_id": 1,
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + BATCH, n))
+            ])
+
+
+def like_scan(db, term):
+    pattern = f"%{term}%"
+    return db.query(Issue.id).filter(or_(Issue.title.like(pattern), Issue.description.like(pattern))).limit(20).all()
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'issues':>10} {'fts common':>12} {'fts rare':>10} {'like common':>12} {'like rare':>10}  (ms)")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            ensure_search_index(engine)
+            seed(engine, n)
+            db = sessionmaker(bind=engine)()
+            try:
+                results = [
+                    timed(lambda: search_issues(db, COMMON)),
+                    timed(lambda: search_issues(db, RARE)),
+                    timed(lambda: like_scan(db, COMMON)),
+                    timed(lambda: like_scan(db, RARE), repeat=1),
+                ]
+            finally:
+                db.close()
+                engine.dispose()
+        print(f"{n:>10} {results[0]:>12.1f} {results[1]:>10.1f} {results[2]:>12.1f} {results[3]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
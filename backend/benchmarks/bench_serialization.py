@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the GET /api/issues/ response path.
+
+Seeds a throwaway SQLite database with tagged issues (every tenth one with an
+attachment) and measures rows/sec for a page, fetch and JSON encoding included:
+
+  orm + per-object      ORM entities, IssueOut.model_validate per issue, then
+                        jsonable_encoder + json.dumps (the old JSONResponse path)
+  orm + TypeAdapter     ORM entities validated in bulk and dumped by pydantic-core
+                        (what FastAPI does for response_model=List[IssueOut])
+  rows + TypeAdapter    list_issue_rows_page_async + IssueOutList (the endpoint now)
+  rows + orjson         the same rows, dumped to Python and encoded by orjson
+
+Usage:
+    python benchmarks/bench_serialization.py              # pages of 100 and 1000
+    python benchmarks/bench_serialization.py 50 500       # custom page sizes
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.db.base import Base
+from app.models.attachment import Attachment
+from app.models.issue import Issue, Severity, Status
+from app.models.tag import Tag, issue_tags
+from app.models.user import User
+from app.crud.issue import list_issues_page_async, list_issue_rows_page_async
+from app.schemas.issue import IssueOut, IssueOutList
+
+try:
+    import orjson
+except ImportError:  # optional; the orjson row is skipped
+    orjson = None
+
+DEFAULT_PAGES = [100, 1000]
+ISSUES = 5_000
+TAGS = [f"tag{i}" for i in range(20)]
+
+
+def seed(engine):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(insert(Tag), [{"id": i + 1, "name": name} for i, name in enumerate(TAGS)])
+        conn.execute(insert(Issue), [
+            {
+                "id": i + 1,
+                "title": f"Issue {i}",
+                "description": "Steps to reproduce: " + "lorem ipsum " * rng.randint(5, 30),
+                "severity": rng.choice(list(Severity)),
+                "status": rng.choice(list(Status)),
+                "reporter_id": 1,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(ISSUES)
+        ])
+        conn.execute(insert(issue_tags), [
+            {"issue_id": i + 1, "tag_id": tag_id}
+            for i in range(ISSUES)
+            for tag_id in rng.sample(range(1, len(TAGS) + 1), rng.randint(0, 3))
+        ])
+        conn.execute(insert(Attachment), [
+            {
+                "issue_id": i + 1, "uploader_id": 1, "filename": f"log{i}.txt", "content_type": "text/plain",
+                "size": 1024, "sha256": f"{i:064x}", "created_at": start,
+            }
+            for i in range(0, ISSUES, 10)
+        ])
+
+
+async def orm_per_object(sessions, limit):
+    async with sessions() as db:
+        issues, _, _ = await list_issues_page_async(db, limit=limit)
+        return json.dumps(jsonable_encoder([IssueOut.model_validate(issue) for issue in issues])).encode()
+
+
+async def orm_type_adapter(sessions, limit):
+    async with sessions() as db:
+        issues, _, _ = await list_issues_page_async(db, limit=limit)
+        return IssueOutList.dump_json(IssueOutList.validate_python(issues, from_attributes=True))
+
+
+async def rows_type_adapter(sessions, limit):
+    async with sessions() as db:
+        rows, _, _ = await list_issue_rows_page_async(db, limit=limit)
+        return IssueOutList.dump_json(IssueOutList.validate_python(rows))
+
+
+async def rows_orjson(sessions, limit):
+    async with sessions() as db:
+        rows, _, _ = await list_issue_rows_page_async(db, limit=limit)
+        return orjson.dumps(IssueOutList.dump_python(IssueOutList.validate_python(rows)))
+
+
+async def timed(fn, sessions, limit, repeat=10):
+    await fn(sessions, limit)  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn(sessions, limit)
+        best = min(best, time.perf_counter() - t0)
+    return limit / best
+
+
+async def run(url, pages):
+    engine = create_async_engine(url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    variants = [
+        ("orm + per-object", orm_per_object),
+        ("orm + TypeAdapter", orm_type_adapter),
+        ("rows + TypeAdapter", rows_type_adapter),
+    ]
+    if orjson is not None:
+        variants.append(("rows + orjson", rows_orjson))
+    try:
+        # Same bytes from every path, modulo whitespace
+        bodies = [json.loads(await fn(sessions, 50)) for _, fn in variants]
+        assert all(body == bodies[0] for body in bodies), "variants disagree"
+
+        print(f"{'variant':<20}" + "".join(f"{f'page {limit}':>14}" for limit in pages) + "  (rows/sec)")
+        for name, fn in variants:
+            rates = [await timed(fn, sessions, limit) for limit in pages]
+            print(f"{name:<20}" + "".join(f"{rate:>14,.0f}" for rate in rates))
+    finally:
+        await engine.dispose()
+
+
+def main():
+    pages = [int(a) for a in sys.argv[1:]] or DEFAULT_PAGES
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine)
+        engine.dispose()
+        asyncio.run(run(f"sqlite+aiosqlite:///{path}", pages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for WebSocket fan-out.
+
+Connects N in-process clients to a ConnectionManager and times how long it takes
+until every client has received M broadcast messages, next to the previous
+implementation (awaiting send_text on each socket in turn). A fraction of the
+clients can be made slow to show that they no longer hold everyone else up.
+
+Clients are in-memory sockets, so this measures the manager's own overhead rather
+than the network stack.
+
+Usage:
+    python benchmarks/bench_websocket.py                       # 10k clients, 10 messages
+    python benchmarks/bench_websocket.py 10000 10 --slow 0.01  # 1% of clients take 50 ms per send
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.websocket import ConnectionManager
+
+
+class Progress:
+    """
+    Counts deliveries and fires an event when a target is reached.
+    """
+
+    def __init__(self, target: int):
+        self.target = target
+        self.count = 0
+        self.done = asyncio.Event()
+
+    def add(self):
+        self.count += 1
+        if self.count == self.target:
+            self.done.set()
+
+
+class BenchSocket:
+    def __init__(self, delay: float, progress: Progress):
+        self.delay = delay
+        self.progress = progress
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.progress.add()
+
+    async def close(self, code=1000):
+        pass
+
+
+def make_sockets(clients, messages, slow_fraction, delay):
+    slow = int(clients * slow_fraction)
+    fast_progress, slow_progress = Progress((clients - slow) * messages), Progress(slow * messages)
+    sockets = [BenchSocket(delay, slow_progress) for _ in range(slow)]
+    sockets += [BenchSocket(0.0, fast_progress) for _ in range(clients - slow)]
+    return sockets, fast_progress, slow_progress
+
+
+async def bench_sequential(clients, messages, slow_fraction, delay):
+    sockets, _, _ = make_sockets(clients, messages, slow_fraction, delay)
+    start = time.perf_counter()
+    for i in range(messages):
+        for socket in sockets:
+            await socket.send_text(str(i))
+    return time.perf_counter() - start
+
+
+async def bench_manager(clients, messages, slow_fraction, delay):
+    manager = ConnectionManager(queue_size=max(messages, 1), policy="drop_oldest", send_timeout=60, ping_interval=3600)
+    sockets, fast_progress, slow_progress = make_sockets(clients, messages, slow_fraction, delay)
+    for socket in sockets:
+        await manager.connect(socket)
+    await asyncio.sleep(0)  # let every writer task start and park on its queue
+
+    start = time.perf_counter()
+    for i in range(messages):
+        await manager.broadcast(str(i))
+    broadcast_done = time.perf_counter() - start
+    if fast_progress.target:
+        await fast_progress.done.wait()
+    fast_done = time.perf_counter() - start
+    if slow_progress.target:
+        await slow_progress.done.wait()
+    all_done = time.perf_counter() - start
+    for connection in list(manager.connections):
+        manager.disconnect(connection)
+    return broadcast_done, fast_done, all_done
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="WebSocket fan-out benchmark")
+    parser.add_argument("clients", type=int, nargs="?", default=10_000)
+    parser.add_argument("messages", type=int, nargs="?", default=10)
+    parser.add_argument("--slow", type=float, default=0.0, help="fraction of slow clients")
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds per send for slow clients")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.messages} messages, {args.slow:.1%} slow ({args.delay * 1000:.0f} ms/send)")
+    seq = await bench_sequential(args.clients, args.messages, args.slow, args.delay)
+    print(f"  sequential send_text loop : all delivered in {seq * 1000:9.1f} ms")
+    broadcast, fast, total = await bench_manager(args.clients, args.messages, args.slow, args.delay)
+    print(f"  queued fan-out            : broadcast() {broadcast * 1000:7.1f} ms, "
+          f"fast clients {fast * 1000:9.1f} ms, all {total * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the issues list and analytics endpoints.
+
+Runs N concurrent clients against a live server for a fixed duration and reports
+requests/sec and latency percentiles per endpoint. To compare the sync and async
+implementations, run it against a server started from each revision with the same
+database and worker count, e.g.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python benchmarks/load_test.py --clients 500 --duration 30
+
+Requires httpx.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+ENDPOINTS = ["/api/issues/?limit=100", "/api/stats/analytics"]
+
+
+async def client_loop(client, path, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - t0)
+
+
+async def run(path, args, headers):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            client_loop(client, path, headers, deadline, latencies, errors) for _ in range(args.clients)
+        ))
+    return latencies, errors
+
+
+def report(path, latencies, errors, duration):
+    if len(latencies) < 2:
+        print(f"{path:<28} {len(latencies)} successful requests ({len(errors)} errors)")
+        return
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{path:<28} {len(latencies) / duration:>9.1f} req/s"
+        f"  p50 {q[49] * 1000:>7.1f} ms  p99 {q[98] * 1000:>8.1f} ms  errors {len(errors)}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test issues list and analytics")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("paths", nargs="*", default=ENDPOINTS)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.url) as client:
+        login = await client.post("/api/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per endpoint")
+    for path in args.paths:
+        latencies, errors = await run(path, args, headers)
+        report(path, latencies, errors, args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
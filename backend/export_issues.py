@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Exports issues as NDJSON, CSV or Parquet, streaming from the read database in batches
+so memory stays flat however many issues there are. Same filters as GET /api/issues/export.
+
+Usage:
+    python export_issues.py issues.ndjson
+    python export_issues.py issues.parquet --format parquet --status OPEN --from 2025-01-01
+    python export_issues.py - --format csv | gzip > issues.csv.gz
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import ReadSessionLocal
+from app.db.base import Base  # registers all models
+from app.models.issue import Status, Severity, Priority
+from app.crud.export import stream_issue_batches
+from app.utils.export import EXPORT_FORMATS
+
+def main():
+    parser = argparse.ArgumentParser(description="Export issues")
+    parser.add_argument("output", help="Output file, or - for stdout")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default=None,
+                        help="Defaults to the output file's extension, else ndjson")
+    parser.add_argument("--status", type=Status)
+    parser.add_argument("--severity", type=Severity)
+    parser.add_argument("--priority", type=Priority)
+    parser.add_argument("--reporter-id", type=int)
+    parser.add_argument("--tag")
+    parser.add_argument("--from", dest="created_from", type=datetime.fromisoformat)
+    parser.add_argument("--to", dest="created_to", type=datetime.fromisoformat)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    extension = os.path.splitext(args.output)[1].lstrip(".")
+    fmt = args.format or (extension if extension in EXPORT_FORMATS else "ndjson")
+    batches = stream_issue_batches(
+        ReadSessionLocal,
+        batch_size=args.batch_size,
+        reporter_id=args.reporter_id,
+        status=args.status,
+        severity=args.severity,
+        priority=args.priority,
+        tag=args.tag,
+        created_from=args.created_from,
+        created_to=args.created_to,
+    )
+
+    rows = 0
+    def counted():
+        nonlocal rows
+        for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    start = time.perf_counter()
+    chunks = EXPORT_FORMATS[fmt][2](counted())
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"✅ Exported {rows} issues as {fmt} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
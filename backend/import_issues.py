@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Bulk issue import from NDJSON (one IssueImport object per line; see POST /api/issues/bulk).
+
+Lines are validated and inserted a batch at a time, each batch in one transaction with
+one rollup update; bad lines are reported on stderr and skipped.
+
+Usage:
+    python import_issues.py issues.ndjson --reporter-id 1 [--batch-size 5000]
+    zcat old-tracker.ndjson.gz | python import_issues.py - --reporter-id 1
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal, engine
+from app.db.base import Base
+from app.crud.issue import import_issue_batch
+
+def batches(f, batch_size):
+    batch = []
+    for number, line in enumerate(f, start=1):
+        if line.strip():
+            batch.append((number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def main():
+    parser = argparse.ArgumentParser(description="Import issues from NDJSON")
+    parser.add_argument("file", help="NDJSON file, or - for stdin")
+    parser.add_argument("--reporter-id", type=int, required=True,
+                        help="Reporter for lines that do not set reporter_id")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    f = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+    db = SessionLocal()
+    created = failed = 0
+    start = time.perf_counter()
+    try:
+        for batch in batches(f, args.batch_size):
+            snapshots, errors = import_issue_batch(db, batch, args.reporter_id)
+            created += len(snapshots)
+            failed += len(errors)
+            for error in errors:
+                print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+            print(f"… {created} imported, {failed} failed", file=sys.stderr)
+    finally:
+        db.close()
+        if f is not sys.stdin.buffer:
+            f.close()
+    elapsed = time.perf_counter() - start
+    print(f"✅ Imported {created} issues ({failed} failed) in {elapsed:.1f}s, {created / max(elapsed, 1e-9):.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
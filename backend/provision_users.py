@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Bulk user provisioning.
+
+Reads users from a CSV file with the header `email,password,full_name,role`
+(full_name and role optional), hashes passwords in parallel across CPU cores
+and inserts them in batches. Existing emails are skipped.
+
+Usage:
+    python provision_users.py users.csv [--batch-size 1000] [--workers 8]
+    python provision_users.py --demo      # admin / maintainer / reporter demo accounts
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal, engine
+from app.db.base import Base
+from app.crud.user import bulk_create_users
+from app.schemas.user import UserCreate
+
+DEMO_USERS = [
+    {"email": "admin@example.com", "password": "admin123", "full_name": "Admin", "role": "ADMIN"},
+    {"email": "maintainer@example.com", "password": "maintainer123", "full_name": "Maintainer", "role": "MAINTAINER"},
+    {"email": "reporter@example.com", "password": "reporter123", "full_name": "Reporter", "role": "REPORTER"},
+]
+
+def read_users(path):
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield UserCreate(
+                email=row["email"].strip(),
+                password=row["password"],
+                full_name=row.get("full_name") or None,
+                role=row.get("role") or "REPORTER",
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Provision users in bulk")
+    parser.add_argument("file", nargs="?", help="CSV file with email,password,full_name,role")
+    parser.add_argument("--demo", action="store_true", help="Create the demo admin/maintainer/reporter accounts")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.demo:
+        users = [UserCreate(**u) for u in DEMO_USERS]
+    elif args.file:
+        users = list(read_users(args.file))
+    else:
+        parser.error("give a CSV file or --demo")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            created, skipped = bulk_create_users(db, users, executor, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"✅ Created {len(created)} users in {time.perf_counter() - started:.1f}s")
+    if skipped:
+        print(f"ℹ️  Skipped {len(skipped)} existing or duplicate emails")
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ import type {
   UserLogin,
   Token,
   DailyStats,
-  AnalyticsStats
+  AnalyticsStats,
+  TimeseriesPoint
 } from './types';
 
 const API_BASE = 'http://localhost:8000/api';
@@ -122,6 +123,21 @@ export async function fetchSeverityStats(): Promise<Record<string, number>> {
   return handleResponse<Record<string, number>>(response);
 }
 
+export async function fetchTimeseries(params: {
+  from?: string;
+  to?: string;
+  bucket?: 'day' | 'week' | 'month';
+  dimension?: 'status' | 'severity' | 'priority';
+} = {}): Promise<TimeseriesPoint[]> {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, v]) => v) as [string, string][]
+  );
+  const response = await fetch(`${API_BASE}/stats/timeseries?${query}`, {
+    headers: getAuthHeaders()
+  });
+  return handleResponse<TimeseriesPoint[]>(response);
+}
+
 // ─────────────────────────────────────────
 // Analytics endpoint (alternative solution)
 // ─────────────────────────────────────────
@@ -135,10 +151,15 @@ export async function fetchAnalytics(): Promise<AnalyticsStats> {
 // ─────────────────────────────────────────
 // WebSocket connection
 // ─────────────────────────────────────────
-export function createWebSocketConnection() {
+export function createWebSocketConnection(topics: string[] = ['issues'], since?: string) {
   if (!browser) return null;
 
-  const ws = new WebSocket('ws://localhost:8000/ws/issues');
+  const token = localStorage.getItem('token');
+  if (!token) return null;
+
+  const params = new URLSearchParams({ topics: topics.join(','), token });
+  if (since) params.set('since', since);
+  const ws = new WebSocket(`ws://localhost:8000/ws/issues?${params}`);
 
   ws.onopen = () => {
     console.log('✅ WebSocket connected');
@@ -11,6 +11,15 @@ export type Severity = 'LOW' | 'MEDIUM' | 'HIGH';
 export type Status = 'OPEN' | 'TRIAGED' | 'IN_PROGRESS' | 'DONE';
 export type Priority = 'BLOCKER' | 'CRITICAL' | 'MINOR' | 'TRIVIAL';
 
+export interface Attachment {
+  id: number;
+  filename: string;
+  content_type?: string;
+  size: number;
+  sha256: string;
+  created_at: string;
+}
+
 export interface Issue {
   id: number;
   title: string;
@@ -22,6 +31,7 @@ export interface Issue {
   reporter_id: number;
   created_at: string;
   tags: string[];
+  attachments: Attachment[];
 }
 
 export interface IssueCreate {
@@ -59,6 +69,12 @@ export interface DailyStats {
   count: number;
 }
 
+export interface TimeseriesPoint {
+  bucket: string;
+  value: string;
+  count: number;
+}
+
 export interface AnalyticsStats {
   total_issues: number;
   open_issues: number;
@@ -71,3 +87,11 @@ export interface AnalyticsStats {
   issues_by_status: Record<string, number>;
   issues_by_severity: Record<string, number>;
 }
+
+// Pushed over /ws/issues
+export type IssueEvent =
+  | { type: 'issue.created' | 'issue.updated' | 'issue.triaged'; issue_id: number; reporter_id: number; changes: Partial<Issue>; seq: number; epoch: string }
+  | { type: 'issue.deleted'; issue_id: number; reporter_id: number; seq: number; epoch: string }
+  | { type: 'stats.changed'; deltas: Record<string, Record<string, number>>; seq: number; epoch: string }
+  | { type: 'resync' }
+  | { type: 'ping' };
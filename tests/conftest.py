@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+# Make the backend package importable and point it at a throwaway SQLite file
+# before app.main runs create_all against the configured database.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+_tmp_dir = tempfile.mkdtemp(prefix="tracker-tests-")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}")
+os.environ.setdefault("STORAGE_LOCAL_ROOT", os.path.join(_tmp_dir, "uploads"))
+
+from fastapi.testclient import TestClient  # noqa: E402  (after the environment above)
+from app.main import app  # noqa: E402
+
+_client = TestClient(app)
+
+
+def register(email, role="REPORTER"):
+    """
+    Registers a user through the API and returns their access token.
+    """
+    response = _client.post("/api/auth/register", json={
+        "email": email,
+        "password": "secret123",
+        "full_name": "Test User",
+        "role": role
+    })
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def auth_headers(email, role="REPORTER"):
+    return {"Authorization": f"Bearer {register(email, role)}"}
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from conftest import auth_headers, register
 
 client = TestClient(app)
 
@@ -19,3 +20,75 @@ def test_register_login():
         "password": "test123"
     })
     assert login.status_code == 200
+
+
+def test_cached_principal_invalidated_on_role_change_and_delete():
+    admin = auth_headers("cache-admin@example.com", "ADMIN")
+    owner = auth_headers("cache-owner@example.com", "REPORTER")
+    other = auth_headers("cache-other@example.com", "REPORTER")
+
+    issue = client.post("/api/issues/", data={"title": "Cached", "severity": "LOW"}, headers=owner).json()
+    # Primes the principal cache with the REPORTER role
+    assert client.get(f"/api/issues/{issue['id']}", headers=other).status_code == 403
+
+    users = {u["email"]: u["id"] for u in client.get("/api/users/").json()}
+    other_id = users["cache-other@example.com"]
+    assert client.patch(f"/api/users/{other_id}/role", json={"role": "MAINTAINER"}, headers=admin).status_code == 200
+    assert client.get(f"/api/issues/{issue['id']}", headers=other).status_code == 200
+
+    assert client.delete(f"/api/users/{other_id}", headers=admin).status_code == 204
+    assert client.get(f"/api/issues/{issue['id']}", headers=other).status_code == 401
+
+
+def test_login_fails_fast_when_password_pool_is_saturated(monkeypatch):
+    from app.core.config import settings
+
+    register("busy@example.com", "REPORTER")
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    response = client.post("/api/auth/login", json={"email": "busy@example.com", "password": "secret123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_register_existing_email_with_other_password():
+    register("taken@example.com", "REPORTER")
+    response = client.post("/api/auth/register", json={
+        "email": "taken@example.com",
+        "password": "a-different-password",
+        "role": "REPORTER"
+    })
+    assert response.status_code == 400
+
+
+def test_bulk_provision_users():
+    admin = auth_headers("bulk-admin@example.com", "ADMIN")
+    users = [{"email": f"bulk{i}@example.com", "password": f"pw{i}"} for i in range(5)]
+    users.append({"email": "bulk0@example.com", "password": "dup"})
+    users.append({"email": "bulk-admin@example.com", "password": "existing"})
+
+    response = client.post("/api/users/bulk", json=users, headers=admin)
+    assert response.status_code == 200
+    assert response.json()["created"] == 5
+    assert sorted(response.json()["skipped"]) == ["bulk-admin@example.com", "bulk0@example.com"]
+
+    login = client.post("/api/auth/login", json={"email": "bulk3@example.com", "password": "pw3"})
+    assert login.status_code == 200
+
+    reporter = auth_headers("bulk-reporter@example.com", "REPORTER")
+    assert client.post("/api/users/bulk", json=users, headers=reporter).status_code == 403
+
+
+def test_bulk_provision_respects_the_password_pool_limit(monkeypatch):
+    from prometheus_client import REGISTRY
+    from app.core.config import settings
+
+    admin = auth_headers("bulk-busy-admin@example.com", "ADMIN")
+    users = [{"email": f"bulk-busy{i}@example.com", "password": f"pw{i}"} for i in range(3)]
+    hashed = REGISTRY.get_sample_value("tracker_password_job_seconds_count")
+    assert client.post("/api/users/bulk", json=users, headers=admin).json()["created"] == 3
+    assert REGISTRY.get_sample_value("tracker_password_job_seconds_count") == hashed + 3
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    users = [{"email": "bulk-busy-later@example.com", "password": "pw"}]
+    response = client.post("/api/users/bulk", json=users, headers=admin)
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
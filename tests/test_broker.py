@@ -0,0 +1,63 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.utils.broker import MemoryBroker, PostgresBroker, RedisBroker, create_broker
+
+
+def test_create_broker_from_url():
+    assert isinstance(create_broker("memory://", "events"), MemoryBroker)
+    postgres = create_broker("postgresql+psycopg2://u:p@db/tracker", "events")
+    assert isinstance(postgres, PostgresBroker) and postgres.dsn == "postgresql://u:p@db/tracker"
+    with pytest.raises(ValueError):
+        create_broker("kafka://localhost", "events")
+
+
+def test_memory_broker_delivers_to_subscriber_once():
+    async def scenario():
+        broker, received = MemoryBroker(), []
+        await broker.publish("before subscribe")
+        await broker.subscribe(received.append)
+        await broker.subscribe(lambda m: received.append("second handler"))
+        await broker.publish("hello")
+        return received
+
+    assert asyncio.run(scenario()) == ["hello"]
+
+
+async def round_trip(publisher, subscriber):
+    received = asyncio.Queue()
+    await subscriber.subscribe(received.put_nowait)
+    await publisher.publish("cross-process")
+    try:
+        return await asyncio.wait_for(received.get(), 5)
+    finally:
+        await publisher.close()
+        await subscriber.close()
+
+
+def test_redis_broker_round_trip():
+    pytest.importorskip("redis")
+    url = os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/0")
+    channel = f"test-{uuid.uuid4().hex}"
+
+    async def scenario():
+        try:
+            await RedisBroker(url, channel).client.ping()
+        except Exception:
+            pytest.skip("redis-server not reachable")
+        return await round_trip(RedisBroker(url, channel), RedisBroker(url, channel))
+
+    assert asyncio.run(scenario()) == "cross-process"
+
+
+@pytest.mark.skipif("TEST_POSTGRES_URL" not in os.environ, reason="set TEST_POSTGRES_URL to run")
+def test_postgres_broker_round_trip():
+    url, channel = os.environ["TEST_POSTGRES_URL"], f"test_{uuid.uuid4().hex}"
+
+    async def scenario():
+        return await round_trip(PostgresBroker(url, channel), PostgresBroker(url, channel))
+
+    assert asyncio.run(scenario()) == "cross-process"
@@ -0,0 +1,167 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.db.session import engine
+from conftest import auth_headers, register
+
+client = TestClient(app)
+
+
+def test_sqlite_connections_use_wal():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_pool_metrics_exported():
+    with engine.connect():
+        pass
+    body = client.get("/metrics").text
+    assert 'tracker_db_pool_checked_out{engine="sync"}' in body
+    assert 'tracker_db_pool_size{engine="async"}' in body
+    assert 'tracker_db_pool_wait_seconds_count{engine="sync"}' in body
+
+
+def test_request_metrics_use_route_templates_and_count_queries():
+    from prometheus_client import REGISTRY
+
+    labels = {"method": "GET", "route": "/api/issues/{issue_id}"}
+    before = REGISTRY.get_sample_value("tracker_http_db_queries_count", labels) or 0
+    headers = auth_headers("metrics@example.com")
+    assert client.get("/api/issues/123456789", headers=headers).status_code == 404
+    client.get("/no/such/path")
+
+    body = client.get("/metrics").text
+    assert 'route="/api/issues/{issue_id}",status="4xx"' in body
+    assert 'tracker_http_requests_total{method="GET",route="<unmatched>",status="4xx"}' in body
+    assert 'tracker_http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/issues/{issue_id}"}' in body
+    assert REGISTRY.get_sample_value("tracker_http_db_queries_count", labels) == before + 1
+    assert REGISTRY.get_sample_value("tracker_http_db_queries_sum", labels) > 0
+    assert REGISTRY.get_sample_value("tracker_http_requests_in_flight", {"method": "GET"}) == 0
+
+
+def test_reads_go_to_replica_except_right_after_a_write(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.orm import sessionmaker
+    from app.api import deps
+    from app.db.base import Base
+    from app.utils.cache import recent_writers
+
+    # An empty second database stands in for a replica that has not caught up
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica = create_engine(url)
+    Base.metadata.create_all(bind=replica)
+    async_replica = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    monkeypatch.setattr(deps, "ReadSessionLocal", sessionmaker(bind=replica))
+    monkeypatch.setattr(deps, "AsyncReadSessionLocal", async_sessionmaker(async_replica, expire_on_commit=False))
+
+    headers = auth_headers("replica@example.com")
+    try:
+        assert client.get("/api/issues/", headers=headers).json() == []
+
+        client.post("/api/issues/", data={"title": "Read your writes", "severity": "LOW"}, headers=headers)
+        assert [i["title"] for i in client.get("/api/issues/", headers=headers).json()] == ["Read your writes"]
+        assert "Read your writes" in client.get("/api/issues/export", headers=headers).text
+
+        recent_writers.clear()
+        assert client.get("/api/issues/", headers=headers).json() == []
+        assert client.get("/api/issues/export", headers=headers).text == ""
+    finally:
+        recent_writers.clear()
+        replica.dispose()
+
+
+def test_async_crud_variants_keep_tags_rollups_and_search_in_step():
+    import asyncio
+    from sqlalchemy import select
+    from app.crud.issue import (
+        create_issue_async, delete_issue_async, get_issue_async, get_tag_counts_async,
+        list_issue_rows_page_async, triage_issues_async, update_issue_async,
+    )
+    from app.crud.search import search_issues_async
+    from app.crud.stats import get_today_rollup_async
+    from app.db.session import AsyncSessionLocal
+    from app.models.issue import Priority, Status
+    from app.models.user import User
+    from app.schemas.issue import IssueCreate, IssueUpdate
+
+    register("async-crud@example.com")
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            reporter_id = (await db.execute(select(User.id).where(User.email == "async-crud@example.com"))).scalar_one()
+            before = dict(await get_today_rollup_async(db, "status"))
+
+            issue = await create_issue_async(
+                db, IssueCreate(title="Async wombat", severity="LOW", tags=["async", "db"]), reporter_id
+            )
+            assert issue.tags == ["async", "db"]
+            issue = await update_issue_async(db, issue, IssueUpdate(status=Status.TRIAGED, tags=["async"]))
+            assert (await get_issue_async(db, issue.id)).tags == ["async"]
+            assert await get_tag_counts_async(db, reporter_id) == [("async", 1)]
+
+            hits, _ = await search_issues_async(db, "wombat", reporter_id=reporter_id)
+            assert [hit["issue"].id for hit in hits] == [issue.id]
+
+            changes, errors = await triage_issues_async(db, [issue.id, 987654321], status=Status.IN_PROGRESS,
+                                                        priority=Priority.CRITICAL)
+            assert [after["status"] for _, after in changes] == ["IN_PROGRESS"]
+            assert errors == [{"id": 987654321, "error": "Issue not found"}]
+            rows, _, _ = await list_issue_rows_page_async(db, reporter_id=reporter_id, status=Status.IN_PROGRESS)
+            assert [(r["id"], r["priority"]) for r in rows] == [(issue.id, Priority.CRITICAL)]
+
+            after = dict(await get_today_rollup_async(db, "status"))
+            assert after.get("IN_PROGRESS", 0) == before.get("IN_PROGRESS", 0) + 1
+            assert after.get("OPEN", 0) == before.get("OPEN", 0)
+            assert after.get("TRIAGED", 0) == before.get("TRIAGED", 0)
+
+            assert await delete_issue_async(db, issue.id)
+            assert not await delete_issue_async(db, issue.id)
+            assert dict(await get_today_rollup_async(db, "status")).get("IN_PROGRESS", 0) == before.get("IN_PROGRESS", 0)
+            assert await search_issues_async(db, "wombat", reporter_id=reporter_id) == ([], None)
+
+    asyncio.run(scenario())
+
+
+def test_issue_writes_search_and_triage_use_the_async_session():
+    import asyncio
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.api.deps import get_async_db, get_db
+
+    agen = get_async_db()
+    db = asyncio.run(agen.__anext__())
+    assert isinstance(db, AsyncSession)
+    asyncio.run(agen.aclose())
+
+    headers = auth_headers("async-admin@example.com", "ADMIN")
+    register("async-member@example.com")
+
+    def no_sync_session():
+        raise AssertionError("endpoint opened a sync session")
+
+    app.dependency_overrides[get_db] = no_sync_session
+    try:
+        created = client.post("/api/issues/", data={"title": "Async numbat", "severity": "LOW"}, headers=headers)
+        assert created.status_code == 200
+        issue_id = created.json()["id"]
+        assert client.patch(f"/api/issues/{issue_id}", json={"status": "TRIAGED"}, headers=headers).status_code == 200
+        assert client.patch(
+            f"/api/issues/{issue_id}/triage", json={"status": "IN_PROGRESS"}, headers=headers
+        ).json()["status"] == "IN_PROGRESS"
+        batch = client.patch("/api/issues/batch", json={"ids": [issue_id], "status": "DONE"}, headers=headers)
+        assert batch.json() == {"updated": [issue_id], "errors": []}
+        assert [h["issue"]["id"] for h in client.get("/api/issues/search?q=numbat", headers=headers).json()] == [issue_id]
+        assert client.delete(f"/api/issues/{issue_id}", headers=headers).status_code == 204
+
+        upload = client.post("/api/uploads/", json={"filename": "a.log", "size": 3}, headers=headers).json()
+        assert client.delete(f"/api/uploads/{upload['id']}", headers=headers).status_code == 204
+        job = client.post("/api/jobs/exports", json={"format": "csv"}, headers=headers).json()
+        assert client.get(f"/api/jobs/{job['id']}", headers=headers).json()["status"] == "queued"
+
+        member = next(u for u in client.get("/api/users/", headers=headers).json() if u["email"] == "async-member@example.com")
+        assert client.patch(f"/api/users/{member['id']}/role", json={"role": "MAINTAINER"},
+                            headers=headers).json()["role"] == "MAINTAINER"
+        assert client.delete(f"/api/users/{member['id']}", headers=headers).status_code == 204
+    finally:
+        app.dependency_overrides.pop(get_db)
@@ -0,0 +1,347 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from conftest import auth_headers
+
+client = TestClient(app)
+
+
+def create_issue(headers, title, severity="LOW"):
+    response = client.post("/api/issues/", data={"title": title, "severity": severity}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_list_issues_cursor_pagination():
+    headers = auth_headers("pager@example.com", role="REPORTER")
+    created = [create_issue(headers, f"Paged issue {i}")["id"] for i in range(5)]
+
+    first = client.get("/api/issues/?limit=2", headers=headers)
+    assert first.status_code == 200
+    assert [i["id"] for i in first.json()] == created[::-1][:2]
+    assert "X-Prev-Cursor" not in first.headers
+
+    second = client.get(f"/api/issues/?limit=2&after={first.headers['X-Next-Cursor']}", headers=headers)
+    assert [i["id"] for i in second.json()] == created[::-1][2:4]
+
+    back = client.get(f"/api/issues/?limit=2&before={second.headers['X-Prev-Cursor']}", headers=headers)
+    assert [i["id"] for i in back.json()] == created[::-1][:2]
+
+    last = client.get(f"/api/issues/?limit=2&after={second.headers['X-Next-Cursor']}", headers=headers)
+    assert [i["id"] for i in last.json()] == created[:1]
+    assert "X-Next-Cursor" not in last.headers
+
+
+def test_list_issues_filters_and_bad_cursor():
+    headers = auth_headers("filter@example.com", role="MAINTAINER")
+    high = create_issue(headers, "Filtered high", severity="HIGH")
+    create_issue(headers, "Filtered low", severity="LOW")
+
+    response = client.get("/api/issues/?severity=HIGH&order=asc", headers=headers)
+    assert response.status_code == 200
+    ids = [i["id"] for i in response.json()]
+    assert high["id"] in ids
+    assert all(i["severity"] == "HIGH" for i in response.json())
+
+    assert client.get("/api/issues/?after=not-a-cursor", headers=headers).status_code == 400
+
+
+def test_tags_filter_and_counts():
+    headers = auth_headers("tagger@example.com", role="REPORTER")
+    tagged = client.post("/api/issues/", data={"title": "Tagged", "severity": "LOW", "tags": "ui, login"}, headers=headers).json()
+    assert tagged["tags"] == ["login", "ui"]
+    create_issue(headers, "Untagged")
+
+    response = client.get("/api/issues/?tag=login", headers=headers)
+    assert [i["id"] for i in response.json()] == [tagged["id"]]
+
+    updated = client.patch(f"/api/issues/{tagged['id']}", json={"tags": ["ui", "regression"]}, headers=headers).json()
+    assert updated["tags"] == ["regression", "ui"]
+    assert client.get("/api/issues/?tag=login", headers=headers).json() == []
+
+    counts = {t["name"]: t["count"] for t in client.get("/api/issues/tags", headers=headers).json()}
+    assert counts == {"regression": 1, "ui": 1}
+
+
+def test_list_rows_match_issue_detail():
+    headers = auth_headers("rows@example.com", role="REPORTER")
+    plain = create_issue(headers, "Row plain")
+    full = client.post(
+        "/api/issues/",
+        data={"title": "Row full", "description": "Body", "severity": "HIGH", "priority": "BLOCKER", "tags": "b,a"},
+        files={"file": ("row.txt", b"row bytes", "text/plain")},
+        headers=headers,
+    ).json()
+
+    listed = client.get("/api/issues/", headers=headers).json()
+    assert listed == [client.get(f"/api/issues/{i['id']}", headers=headers).json() for i in (full, plain)]
+    assert listed[0]["tags"] == ["a", "b"] and listed[0]["attachments"][0]["filename"] == "row.txt"
+    assert listed[1]["tags"] == [] and listed[1]["attachments"] == []
+
+
+def test_export_streams_filtered_scoped_issues():
+    import csv
+    import io
+    import json
+
+    headers = auth_headers("exporter@example.com", role="REPORTER")
+    other = auth_headers("export-other@example.com", role="REPORTER")
+    mine = [
+        client.post("/api/issues/", data={"title": "Export, \"quoted\"", "severity": "HIGH", "tags": "x,y"}, headers=headers).json(),
+        create_issue(headers, "Export low"),
+    ]
+    create_issue(other, "Not mine")
+
+    response = client.get("/api/issues/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in rows] == [i["id"] for i in mine]
+    assert rows[0]["tags"] == ["x", "y"] and rows[0]["created_at"] == mine[0]["created_at"]
+
+    response = client.get("/api/issues/export?format=csv&severity=HIGH", headers=headers)
+    assert "issues.csv" in response.headers["content-disposition"]
+    table = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["title"], r["tags"]) for r in table] == [('Export, "quoted"', "x,y")]
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        assert client.get("/api/issues/export?format=parquet", headers=headers).status_code == 501
+    else:
+        response = client.get("/api/issues/export?format=parquet", headers=headers)
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.column("title").to_pylist() == [i["title"] for i in mine]
+        assert table.column("tags").to_pylist() == [["x", "y"], []]
+
+
+def test_bulk_import_reports_bad_lines_and_keeps_the_rest():
+    import json
+
+    admin = auth_headers("importer@example.com", role="ADMIN")
+    reporter = auth_headers("import-reporter@example.com", role="REPORTER")
+    before = client.get("/api/stats/analytics", headers=admin).json()
+
+    lines = [
+        json.dumps({"title": "Imported 1", "severity": "HIGH", "tags": ["legacy", " ui "]}),
+        "{not json",
+        json.dumps({"title": "Imported 2", "status": "DONE", "created_at": "2020-05-01T10:00:00"}),
+        "",
+        json.dumps({"severity": "LOW"}),
+        json.dumps({"title": "Imported 3", "reporter_id": 999999}),
+        json.dumps({"title": "Imported 4", "priority": "BLOCKER"}),
+    ]
+    response = client.post("/api/issues/bulk?batch_size=3", content="\n".join(lines), headers=admin)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (3, 3)
+    assert [e["line"] for e in result["errors"]] == [2, 5, 6]
+    assert "title" in result["errors"][1]["error"] and "999999" in result["errors"][2]["error"]
+
+    imported = client.get("/api/issues/export", headers=admin).text.splitlines()
+    rows = {r["title"]: r for r in map(json.loads, imported) if r["title"].startswith("Imported")}
+    assert set(rows) == {"Imported 1", "Imported 2", "Imported 4"}
+    assert rows["Imported 1"]["tags"] == ["legacy", "ui"]
+    assert rows["Imported 2"]["created_at"] == "2020-05-01T10:00:00"
+
+    after = client.get("/api/stats/analytics", headers=admin).json()
+    assert after["total_issues"] == before["total_issues"] + 3
+    assert after["issues_by_severity"]["HIGH"] == before["issues_by_severity"]["HIGH"] + 1
+
+    assert client.post("/api/issues/bulk", content=lines[0], headers=reporter).status_code == 403
+
+
+def test_bulk_import_reports_oversized_lines_without_buffering_them(monkeypatch):
+    import json
+    from app.api import issues as issues_api
+
+    monkeypatch.setattr(issues_api, "IMPORT_MAX_LINE_BYTES", 100)
+    admin = auth_headers("long-lines@example.com", role="ADMIN")
+    good = json.dumps({"title": "Short line", "severity": "LOW"}).encode()
+
+    def body():
+        yield good + b"\n" + b"x" * 80
+        yield b"x" * 80  # line 2 crosses the limit in its second chunk
+        yield b"x" * 80 + b"\n" + good + b"\n"
+        yield b"y" * 200  # unterminated last line
+
+    response = client.post("/api/issues/bulk", content=body(), headers=admin)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 2)
+    assert [(e["line"], e["error"]) for e in result["errors"]] == [
+        (2, "Line longer than 100 bytes"), (4, "Line longer than 100 bytes")
+    ]
+
+
+def test_bulk_import_retries_a_failed_copy_row_by_row(monkeypatch):
+    import json
+    import sqlite3
+    from types import SimpleNamespace
+    import app.crud.issue as issue_crud
+
+    class RejectingCursor:
+        def copy_expert(self, statement, buffer):
+            raise sqlite3.DataError('invalid byte sequence for encoding "UTF8": 0x00')
+
+        def close(self):
+            pass
+
+    # COPY errors come from the raw driver cursor, the way psycopg2 raises them
+    copy_db = SimpleNamespace(connection=lambda: SimpleNamespace(
+        dialect=SimpleNamespace(loaded_dbapi=sqlite3), connection=SimpleNamespace(cursor=RejectingCursor),
+    ))
+    real_insert = issue_crud._insert_issue_rows
+
+    def insert_rejecting_nul(db, rows):
+        if any("\x00" in row["title"] for row in rows):
+            issue_crud.copy_rows(copy_db, "issues", issue_crud.IMPORT_COLUMNS, rows)
+        return real_insert(db, rows)
+
+    monkeypatch.setattr(issue_crud, "_insert_issue_rows", insert_rejecting_nul)
+    admin = auth_headers("copy-importer@example.com", role="ADMIN")
+    lines = [json.dumps({"title": title}) for title in ("Copy ok 1", "Copy \x00 bad", "Copy ok 2")]
+    response = client.post("/api/issues/bulk", content="\n".join(lines), headers=admin)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert result["errors"][0]["line"] == 2 and "0x00" in result["errors"][0]["error"]
+
+
+def test_batch_triage_enforces_workflow_per_issue():
+    headers = auth_headers("batch-triage@example.com", role="MAINTAINER")
+    open_issue = create_issue(headers, "Batch open")
+    done = create_issue(headers, "Batch done")
+    for status in ("TRIAGED", "IN_PROGRESS", "DONE"):
+        client.patch(f"/api/issues/{done['id']}", json={"status": status}, headers=headers)
+
+    response = client.patch(
+        "/api/issues/batch",
+        json={"ids": [open_issue["id"], done["id"], 987654321], "status": "TRIAGED", "priority": "CRITICAL"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["updated"] == [open_issue["id"]]
+    assert result["errors"] == [
+        {"line": None, "id": done["id"], "error": "Invalid status transition: DONE → TRIAGED"},
+        {"line": None, "id": 987654321, "error": "Issue not found"},
+    ]
+    triaged = client.get(f"/api/issues/{open_issue['id']}", headers=headers).json()
+    assert (triaged["status"], triaged["priority"]) == ("TRIAGED", "CRITICAL")
+    assert client.get(f"/api/issues/{done['id']}", headers=headers).json()["priority"] != "CRITICAL"
+
+    reporter = auth_headers("batch-reporter@example.com", role="REPORTER")
+    assert client.patch("/api/issues/batch", json={"ids": [open_issue["id"]], "priority": "MINOR"}, headers=reporter).status_code == 403
+
+
+def test_search_ranks_highlights_and_scopes():
+    owner = auth_headers("searcher@example.com", role="REPORTER")
+    other = auth_headers("search-other@example.com", role="REPORTER")
+    in_title = client.post("/api/issues/", data={"title": "Zebra stripes misaligned", "severity": "LOW"}, headers=owner).json()
+    in_body = client.post("/api/issues/", data={"title": "Layout bug", "description": "the zebra table renders badly", "severity": "LOW"}, headers=owner).json()
+    client.post("/api/issues/", data={"title": "Zebra from someone else", "severity": "LOW"}, headers=other)
+
+    response = client.get("/api/issues/search?q=zebra", headers=owner)
+    assert response.status_code == 200
+    hits = response.json()
+    assert [h["issue"]["id"] for h in hits] == [in_title["id"], in_body["id"]]
+    assert hits[0]["title_highlight"] == "<mark>Zebra</mark> stripes misaligned"
+    assert "<mark>zebra</mark>" in hits[1]["description_highlight"]
+
+    first = client.get("/api/issues/search?q=zebra&limit=1", headers=owner)
+    assert [h["issue"]["id"] for h in first.json()] == [in_title["id"]]
+    second = client.get(f"/api/issues/search?q=zebra&limit=1&after={first.headers['X-Next-Cursor']}", headers=owner)
+    assert [h["issue"]["id"] for h in second.json()] == [in_body["id"]]
+    assert "X-Next-Cursor" not in second.headers
+
+    # FTS syntax in user input is treated as plain words
+    assert client.get('/api/issues/search?q="zebra AND (', headers=owner).status_code == 200
+
+    # Highlights are safe to render as HTML: issue text is escaped, only the marks are tags
+    client.post("/api/issues/", data={"title": "<img src=x onerror=alert(1)> quagga", "severity": "LOW"}, headers=owner)
+    hit = client.get("/api/issues/search?q=quagga", headers=owner).json()[0]
+    assert hit["title_highlight"] == "&lt;img src=x onerror=alert(1)&gt; <mark>quagga</mark>"
+
+
+def test_uploads_are_deduplicated_and_capped(monkeypatch):
+    import hashlib
+    import os
+    import pytest
+    import app.api.issues as issues_api
+    from app.core.config import settings
+    from app.storage import get_storage, blob_key
+    from app.workers.runner import JobRunner
+
+    headers = auth_headers("uploader@example.com", role="REPORTER")
+    admin = auth_headers("upload-admin@example.com", role="ADMIN")
+    post = lambda name, body: client.post(
+        "/api/issues/", data={"title": name, "severity": "LOW"}, files={"file": (name, body, "text/plain")}, headers=headers
+    )
+
+    first = post("a.log", b"same bytes").json()
+    second = post("b.log", b"same bytes").json()
+    a, b = first["attachments"][0], second["attachments"][0]
+    assert (a["filename"], b["filename"]) == ("a.log", "b.log")
+    assert a["sha256"] == b["sha256"] and a["size"] == 10
+    path = get_storage().local_path(blob_key(a["sha256"]))
+    assert open(path, "rb").read() == b"same bytes"
+
+    # The blob outlives the first issue and goes with the last reference
+    client.delete(f"/api/issues/{first['id']}", headers=admin)
+    JobRunner().run_pending()
+    assert os.path.exists(path)
+    client.delete(f"/api/issues/{second['id']}", headers=admin)
+    assert os.path.exists(path)  # released by the worker
+    JobRunner().run_pending()
+    assert not os.path.exists(path)
+
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 4)
+    assert post("big.log", b"12345").status_code == 413
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", 3)
+    response = post("quota.log", b"1234")
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Storage quota exceeded"
+    assert [f for f in os.listdir(get_storage().temp_dir) if not f.endswith(".lock")] == []
+
+    # An invalid issue stores nothing, and neither does one whose insert fails
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", 10**9)
+    invalid = client.post("/api/issues/", data={"title": "invalid", "severity": "NOPE"},
+                          files={"file": ("invalid.log", b"never stored", "text/plain")}, headers=headers)
+    assert invalid.status_code == 422
+    assert not os.path.exists(get_storage().local_path(blob_key(hashlib.sha256(b"never stored").hexdigest())))
+    async def failing_create(*args, **kwargs):
+        return 1 / 0
+    monkeypatch.setattr(issues_api, "create_issue_async", failing_create)
+    with pytest.raises(ZeroDivisionError):
+        post("failing.log", b"rolled back")
+    assert not os.path.exists(get_storage().local_path(blob_key(hashlib.sha256(b"rolled back").hexdigest())))
+
+
+def test_attachment_download_ranges_and_etags(monkeypatch):
+    from app.core.config import settings
+
+    headers = auth_headers("downloader@example.com", role="REPORTER")
+    stranger = auth_headers("stranger@example.com", role="REPORTER")
+    issue = client.post(
+        "/api/issues/", data={"title": "Has a log", "severity": "LOW"},
+        files={"file": ("crash log.txt", b"0123456789", "text/plain")}, headers=headers,
+    ).json()
+    url = f"/api/issues/{issue['id']}/attachment"
+    etag = f'"{issue["attachments"][0]["sha256"]}"'
+
+    assert client.get(url, headers=stranger).status_code == 403
+    full = client.get(url, headers=headers)
+    assert full.status_code == 200 and full.content == b"0123456789"
+    assert full.headers["etag"] == etag
+    assert "crash%20log.txt" in full.headers["content-disposition"]
+
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    part = client.get(url, headers={**headers, "Range": "bytes=2-5"})
+    assert part.status_code == 206 and part.content == b"2345"
+    assert part.headers["content-range"] == "bytes 2-5/10"
+
+    monkeypatch.setattr(settings, "STORAGE_ACCEL_REDIRECT_PREFIX", "/protected-attachments")
+    accel = client.get(url, headers=headers)
+    assert accel.content == b""
+    assert accel.headers["x-accel-redirect"].startswith("/protected-attachments/sha256/")
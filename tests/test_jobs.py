@@ -0,0 +1,124 @@
+import json
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.crud.job import claim_jobs, complete_job, enqueue_job, heartbeat_job, requeue_stale_jobs
+from app.db.session import SessionLocal
+from app.models.job import Job, JobStatus
+from app.workers.jobs import HANDLERS
+from app.workers.runner import JobRunner
+from conftest import auth_headers
+
+client = TestClient(app)
+
+
+def test_jobs_retry_with_backoff_until_failed(monkeypatch):
+    calls = []
+
+    def flaky(db, payload, job):
+        calls.append(job.attempts)
+        if len(calls) < 2:
+            raise RuntimeError("boom")
+        return {"ok": payload["n"]}
+
+    monkeypatch.setitem(HANDLERS, "test.flaky", flaky)
+    monkeypatch.setitem(HANDLERS, "test.broken", lambda db, payload, job: 1 / 0)
+    runner = JobRunner(worker_id="test")
+    db = SessionLocal()
+    try:
+        flaky_job = enqueue_job(db, "test.flaky", {"n": 3}, idempotency_key="flaky-1")
+        assert enqueue_job(db, "test.flaky", {"n": 4}, idempotency_key="flaky-1").id == flaky_job.id
+        broken = enqueue_job(db, "test.broken", max_attempts=2)
+
+        assert runner.run_pending() == 2
+        db.expire_all()
+        assert flaky_job.status == JobStatus.QUEUED and flaky_job.last_error == "RuntimeError: boom"
+        assert flaky_job.run_at > datetime.utcnow()  # backing off
+        assert runner.run_pending() == 0
+
+        later = datetime.utcnow() + timedelta(hours=2)
+        for job_id in claim_jobs(db, "test", 10, now=later):
+            runner.run_job(job_id)
+        db.expire_all()
+        assert flaky_job.status == JobStatus.DONE and json.loads(flaky_job.result) == {"ok": 3}
+        assert calls == [1, 2]
+        assert broken.status == JobStatus.FAILED and broken.attempts == 2
+        assert broken.last_error.startswith("ZeroDivisionError")
+    finally:
+        db.close()
+
+
+def test_stale_running_jobs_are_requeued():
+    db = SessionLocal()
+    try:
+        job = enqueue_job(db, "test.stale")
+        assert claim_jobs(db, "crashed", 10) == [job.id]
+        assert claim_jobs(db, "other", 10) == []
+        assert requeue_stale_jobs(db) == 0
+        later = datetime.utcnow() + timedelta(hours=1)
+        assert requeue_stale_jobs(db, now=later) == 1
+        db.expire_all()
+        assert (job.status, job.locked_by, job.attempts) == (JobStatus.QUEUED, None, 1)
+
+        # The requeued job runs elsewhere; the first worker can neither renew nor finish it
+        assert claim_jobs(db, "other", 10, now=later) == [job.id]
+        assert not heartbeat_job(db, job.id, "crashed")
+        assert not complete_job(db, job, "crashed", {"from": "crashed"})
+        assert heartbeat_job(db, job.id, "other")
+        assert complete_job(db, job, "other", {"from": "other"})
+        db.expire_all()
+        assert (job.status, json.loads(job.result)) == (JobStatus.DONE, {"from": "other"})
+        db.delete(job)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_running_jobs_send_heartbeats(monkeypatch):
+    import time
+    from app.core.config import settings
+
+    seen = []
+
+    def slow(db, payload, job):
+        for _ in range(2):
+            with SessionLocal() as other:
+                seen.append(other.get(Job, job.id).locked_at)
+            time.sleep(0.3)
+
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setitem(HANDLERS, "test.slow", slow)
+    db = SessionLocal()
+    try:
+        job = enqueue_job(db, "test.slow")
+        assert JobRunner(worker_id="beating").run_pending() == 1
+        db.expire_all()
+        assert job.status == JobStatus.DONE
+        assert seen[1] > seen[0]
+    finally:
+        db.close()
+
+
+def test_export_job_writes_a_downloadable_file():
+    headers = auth_headers("job-exporter@example.com")
+    other = auth_headers("job-other@example.com")
+    mine = client.post("/api/issues/", data={"title": "Queued export", "severity": "LOW"}, headers=headers).json()
+    client.post("/api/issues/", data={"title": "Not in export", "severity": "LOW"}, headers=other)
+
+    keyed = {**headers, "Idempotency-Key": "export-1"}
+    response = client.post("/api/jobs/exports", json={"format": "ndjson"}, headers=keyed)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and response.headers["location"] == f"/api/jobs/{job['id']}"
+    assert client.post("/api/jobs/exports", json={"format": "ndjson"}, headers=keyed).json()["id"] == job["id"]
+    assert client.get(f"/api/jobs/{job['id']}/result", headers=headers).status_code == 409
+    assert client.get(f"/api/jobs/{job['id']}", headers=other).status_code == 404
+
+    JobRunner().run_pending()
+    done = client.get(f"/api/jobs/{job['id']}", headers=headers).json()
+    assert done["status"] == "done" and done["result"]["rows"] == 1
+    response = client.get(f"/api/jobs/{job['id']}/result", headers=headers)
+    assert response.status_code == 200
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [mine["id"]]
+    assert client.get(f"/api/jobs/{job['id']}/result", headers={**headers, "If-None-Match": response.headers["etag"]}).status_code == 304
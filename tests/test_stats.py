@@ -0,0 +1,145 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from conftest import auth_headers
+
+client = TestClient(app)
+
+
+def test_analytics_counts():
+    headers = auth_headers("analytics@example.com", role="MAINTAINER")
+    before = client.get("/api/stats/analytics", headers=headers).json()
+
+    client.post("/api/issues/", data={"title": "Analytics high", "severity": "HIGH", "priority": "BLOCKER"}, headers=headers)
+    client.post("/api/issues/", data={"title": "Analytics low", "severity": "LOW", "priority": "TRIVIAL"}, headers=headers)
+
+    after = client.get("/api/stats/analytics", headers=headers).json()
+    assert after["total_issues"] == before["total_issues"] + 2
+    assert after["open_issues"] == before["open_issues"] + 2
+    assert after["high_priority_issues"] == before["high_priority_issues"] + 1
+    assert after["low_priority_issues"] == before["low_priority_issues"] + 1
+    assert after["issues_by_severity"]["HIGH"] == before["issues_by_severity"]["HIGH"] + 1
+    assert set(after["issues_by_status"]) == {"OPEN", "TRIAGED", "IN_PROGRESS", "DONE"}
+    assert after["recent_issues"][0]["title"] == "Analytics low"
+
+
+def daily_counts(headers):
+    return {row["status"]: row["count"] for row in client.get("/api/stats/daily", headers=headers).json()}
+
+
+def test_daily_stats_follow_issue_writes():
+    headers = auth_headers("rollups@example.com", role="ADMIN")
+    before = daily_counts(headers)
+
+    issue = client.post("/api/issues/", data={"title": "Rollup issue", "severity": "MEDIUM"}, headers=headers).json()
+    assert daily_counts(headers).get("OPEN", 0) == before.get("OPEN", 0) + 1
+
+    client.patch(f"/api/issues/{issue['id']}", json={"status": "TRIAGED"}, headers=headers)
+    after_update = daily_counts(headers)
+    assert after_update.get("OPEN", 0) == before.get("OPEN", 0)
+    assert after_update["TRIAGED"] == before.get("TRIAGED", 0) + 1
+
+    client.delete(f"/api/issues/{issue['id']}", headers=headers)
+    assert daily_counts(headers).get("TRIAGED", 0) == before.get("TRIAGED", 0)
+
+
+def test_reconcile_matches_incremental_counts():
+    from app.db.session import SessionLocal
+    from app.crud.stats import reconcile_rollups
+
+    headers = auth_headers("reconcile@example.com", role="MAINTAINER")
+    client.post("/api/issues/", data={"title": "Reconcile issue", "severity": "HIGH"}, headers=headers)
+    incremental = daily_counts(headers)
+    severity = client.get("/api/stats/severity", headers=headers).json()
+
+    db = SessionLocal()
+    try:
+        reconcile_rollups(db, days=1)
+    finally:
+        db.close()
+
+    assert daily_counts(headers) == incremental
+    assert client.get("/api/stats/severity", headers=headers).json() == severity
+
+
+def test_timeseries_buckets_and_backfill():
+    from datetime import datetime
+    from app.db.session import SessionLocal
+    from app.crud.stats import backfill_rollups
+    from app.models.issue import Issue, Severity
+
+    headers = auth_headers("timeseries@example.com", role="MAINTAINER")
+    db = SessionLocal()
+    try:
+        # Written behind the rollups' back, so only a backfill can count them
+        db.add_all([
+            Issue(title="Old issue", severity=Severity.HIGH, created_at=datetime(2024, 3, day, 12))
+            for day in (4, 5, 20)
+        ])
+        db.commit()
+        params = "from=2024-03-01&to=2024-03-31&dimension=severity"
+        assert client.get(f"/api/stats/timeseries?{params}", headers=headers).json() == []
+
+        backfill_rollups(db, datetime(2024, 3, 1).date(), datetime(2024, 3, 31).date())
+    finally:
+        db.close()
+
+    daily = client.get(f"/api/stats/timeseries?{params}", headers=headers).json()
+    assert daily == [
+        {"bucket": "2024-03-04", "value": "HIGH", "count": 1},
+        {"bucket": "2024-03-05", "value": "HIGH", "count": 1},
+        {"bucket": "2024-03-20", "value": "HIGH", "count": 1},
+    ]
+    weekly = client.get(f"/api/stats/timeseries?{params}&bucket=week", headers=headers).json()
+    assert weekly == [
+        {"bucket": "2024-03-04", "value": "HIGH", "count": 2},
+        {"bucket": "2024-03-18", "value": "HIGH", "count": 1},
+    ]
+    monthly = client.get(f"/api/stats/timeseries?{params}&bucket=month", headers=headers).json()
+    assert monthly == [{"bucket": "2024-03-01", "value": "HIGH", "count": 3}]
+
+    assert client.get("/api/stats/timeseries?from=2024-04-01&to=2024-03-01", headers=headers).status_code == 400
+
+
+def test_stats_responses_are_cached_until_an_issue_write():
+    from prometheus_client import REGISTRY
+
+    headers = auth_headers("etag@example.com", role="REPORTER")
+    first = client.get("/api/stats/severity", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and etag.endswith('-REPORTER"')
+
+    labels = {"method": "GET", "route": "/api/stats/severity"}
+    queries = lambda: REGISTRY.get_sample_value("tracker_http_db_queries_sum", labels)
+    before = queries()
+    cached = client.get("/api/stats/severity", headers=headers)
+    assert cached.json() == first.json() and cached.headers["etag"] == etag
+    not_modified = client.get("/api/stats/severity", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert queries() == before
+
+    assert client.get("/api/stats/severity").headers["etag"] != etag  # keyed by role
+
+    client.post("/api/issues/", data={"title": "Bumps the version", "severity": "MEDIUM"}, headers=headers)
+    fresh = client.get("/api/stats/severity", headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["etag"] != etag
+    assert fresh.json()["MEDIUM"] == first.json().get("MEDIUM", 0) + 1
+
+
+def test_failed_stats_query_is_not_cached(monkeypatch):
+    from app.api import stats as stats_api
+
+    headers = auth_headers("degraded@example.com", role="MAINTAINER")
+    client.post("/api/issues/", data={"title": "Counted after the outage", "severity": "LOW"}, headers=headers)
+    real = stats_api.get_analytics_async
+
+    async def fail_once(db):
+        monkeypatch.setattr(stats_api, "get_analytics_async", real)
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(stats_api, "get_analytics_async", fail_once)
+    fallback = client.get("/api/stats/analytics", headers=headers)
+    assert fallback.status_code == 200 and fallback.json()["total_issues"] == 0
+    assert fallback.headers["cache-control"] == "no-store" and "etag" not in fallback.headers
+
+    fresh = client.get("/api/stats/analytics", headers=headers)
+    assert fresh.json()["total_issues"] > 0 and "etag" in fresh.headers
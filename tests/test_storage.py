@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from app.storage import UploadTooLarge, blob_key, store_blob
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class FakeS3Client:
+    """
+    In-memory stand-in for the boto3 S3 client calls S3Storage makes.
+    """
+
+    def __init__(self):
+        self.objects = {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise NotFound()
+        return {"ContentLength": len(self.objects[Bucket, Key])}
+
+    def upload_file(self, path, bucket, key):
+        with open(path, "rb") as f:
+            self.objects[bucket, key] = f.read()
+
+    def get_object(self, Bucket, Key, Range):
+        start, _, end = Range[len("bytes="):].partition("-")
+        data = self.objects[Bucket, Key][int(start):int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(data)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, tmp_path):
+    if request.param == "local":
+        return LocalStorage(str(tmp_path))
+    s3 = S3Storage("bucket", client=FakeS3Client())
+    s3.temp_dir = str(tmp_path)
+    return s3
+
+
+def test_store_blob_round_trip(storage, tmp_path):
+    data = b"0123456789" * 1000
+    sha256, size = store_blob(storage, io.BytesIO(data), max_bytes=len(data))
+    key = blob_key(sha256)
+    assert size == len(data) and storage.size(key) == len(data)
+    assert b"".join(storage.iter_bytes(key, chunk_size=333)) == data
+    assert b"".join(storage.iter_bytes(key, 5, 14)) == data[5:15]
+
+    # Storing the same content again keeps a single blob and cleans up the temp file
+    assert store_blob(storage, io.BytesIO(data), max_bytes=len(data)) == (sha256, size)
+    assert not [p for p in tmp_path.rglob("upload-*")]
+
+    storage.delete(key)
+    assert not storage.exists(key)
+
+
+def test_store_blob_rejects_oversized_uploads(storage, tmp_path):
+    with pytest.raises(UploadTooLarge):
+        store_blob(storage, io.BytesIO(b"x" * 11), max_bytes=10)
+    assert not [p for p in tmp_path.rglob("upload-*")]
+
+
+def test_parse_range():
+    from fastapi import HTTPException
+    from app.storage.http import parse_range
+
+    assert parse_range(None, 10) is None
+    assert parse_range("bytes=2-5", 10) == (2, 5)
+    assert parse_range("bytes=7-", 10) == (7, 9)
+    assert parse_range("bytes=-3", 10) == (7, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    with pytest.raises(HTTPException) as e:
+        parse_range("bytes=10-", 10)
+    assert e.value.status_code == 416
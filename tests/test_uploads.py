@@ -0,0 +1,149 @@
+import os
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from app.main import app
+from conftest import auth_headers
+
+client = TestClient(app)
+
+
+def start(headers, size, filename="core.dump"):
+    response = client.post("/api/uploads/", json={"filename": filename, "size": size}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def send(headers, upload_id, offset, body):
+    return client.patch(f"/api/uploads/{upload_id}", content=body,
+                        headers={**headers, "Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream"})
+
+
+def test_resumable_upload_attaches_to_issue():
+    headers = auth_headers("resumer@example.com")
+    data = os.urandom(3000)
+    issue = client.post("/api/issues/", data={"title": "Crash", "severity": "HIGH"}, headers=headers).json()
+    upload_id = start(headers, len(data))
+
+    assert send(headers, upload_id, 0, data[:1000]).headers["Upload-Offset"] == "1000"
+    # A retry from a stale offset is refused and told where to resume
+    stale = send(headers, upload_id, 0, data[:1000])
+    assert stale.status_code == 409 and stale.headers["Upload-Offset"] == "1000"
+    assert client.head(f"/api/uploads/{upload_id}", headers=headers).headers["Upload-Offset"] == "1000"
+
+    # Attaching before the last byte arrives is refused
+    attach = lambda: client.post(f"/api/issues/{issue['id']}/attachments", json={"upload_id": upload_id}, headers=headers)
+    assert attach().status_code == 409
+
+    # While another request holds the partial file, a PATCH is refused before writing
+    import fcntl
+    from app.storage import partial_path
+    with open(partial_path(upload_id), "r+b") as busy:
+        fcntl.flock(busy, fcntl.LOCK_EX)
+        assert send(headers, upload_id, 1000, data[1000:]).status_code == 409
+    assert os.path.getsize(partial_path(upload_id)) == 1000
+
+    assert send(headers, upload_id, 1000, data[1000:]).status_code == 204
+    assert client.get(f"/api/uploads/{upload_id}", headers=headers).json()["complete"] is True
+
+    attachment = attach().json()
+    assert attachment["size"] == len(data) and attachment["filename"] == "core.dump"
+    assert client.get(f"/api/issues/{issue['id']}/attachment", headers=headers).content == data
+    assert client.get(f"/api/uploads/{upload_id}", headers=headers).status_code == 404
+
+
+def test_upload_limits_ownership_and_expiry():
+    from app.db.session import SessionLocal
+    from app.crud.upload import expire_upload_sessions
+    from app.storage import partial_path
+
+    headers = auth_headers("limits@example.com")
+    other = auth_headers("other-uploader@example.com")
+    assert client.post("/api/uploads/", json={"filename": "huge", "size": 10 ** 12}, headers=headers).status_code == 413
+
+    upload_id = start(headers, 5)
+    assert client.head(f"/api/uploads/{upload_id}", headers=other).status_code == 404
+    assert send(headers, upload_id, 0, b"123456").status_code == 413
+
+    assert send(headers, upload_id, 0, b"12").status_code == 204
+    assert os.path.exists(partial_path(upload_id))
+    db = SessionLocal()
+    try:
+        assert expire_upload_sessions(db, now=datetime.utcnow() + timedelta(days=2)) >= 1
+    finally:
+        db.close()
+    assert not os.path.exists(partial_path(upload_id))
+    assert client.head(f"/api/uploads/{upload_id}", headers=headers).status_code == 404
+
+
+def test_resumable_uploads_have_their_own_cap_and_reserve_quota(monkeypatch):
+    from app.core.config import settings
+
+    headers = auth_headers("reserver@example.com")
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+    monkeypatch.setattr(settings, "MAX_RESUMABLE_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", 150)
+    assert client.post("/api/uploads/", json={"filename": "big", "size": 101}, headers=headers).status_code == 413
+    first = start(headers, 100)
+    # The open session holds its 100 bytes before any of them arrive
+    refused = client.post("/api/uploads/", json={"filename": "second", "size": 60}, headers=headers)
+    assert refused.status_code == 413 and refused.json()["detail"] == "Storage quota exceeded"
+    assert client.delete(f"/api/uploads/{first}", headers=headers).status_code == 204
+    start(headers, 60)
+
+
+def test_patch_streams_without_holding_a_connection_and_survives_a_vanished_file():
+    from app.db.session import async_engine
+    from app.storage import partial_path
+
+    headers = auth_headers("streamer@example.com")
+    upload_id = start(headers, 6)
+    checked_out = []
+
+    def body():
+        yield b"abc"
+        checked_out.append(async_engine.pool.checkedout())
+        yield b"def"
+
+    assert send(headers, upload_id, 0, body()).status_code == 204
+    assert checked_out == [0]
+    assert client.get(f"/api/uploads/{upload_id}", headers=headers).json()["complete"] is True
+
+    upload_id = start(headers, 6)
+    os.unlink(partial_path(upload_id))
+    assert send(headers, upload_id, 0, b"abcdef").status_code == 404
+
+
+def test_release_waits_for_a_blob_being_referenced(tmp_path):
+    import io
+    import threading
+    from app.crud.attachment import blob_lock, release_blobs
+    from app.db.session import SessionLocal
+    from app.models.upload import UploadSession
+    from app.models.user import User
+    from app.storage import blob_key, store_blob
+    from app.storage.local import LocalStorage
+
+    storage = LocalStorage(str(tmp_path))
+    auth_headers("blob-locker@example.com")
+    sha256, _ = store_blob(storage, io.BytesIO(b"shared"), 100)
+    db, releaser = SessionLocal(), SessionLocal()
+    try:
+        owner = db.query(User).filter(User.email == "blob-locker@example.com").one().id
+        with blob_lock(db, storage, sha256):
+            release = threading.Thread(target=release_blobs, args=(releaser, storage, [sha256]))
+            release.start()
+            release.join(0.2)
+            assert release.is_alive()  # blocked until the new reference is committed
+            db.add(UploadSession(id=sha256[:32], user_id=owner, filename="f", size=6, offset=6, sha256=sha256,
+                                 expires_at=datetime.utcnow()))
+            db.commit()
+        release.join()
+        assert storage.exists(blob_key(sha256))
+        db.delete(db.get(UploadSession, sha256[:32]))
+        db.commit()
+        release_blobs(releaser, storage, [sha256])
+        assert not storage.exists(blob_key(sha256))
+    finally:
+        db.close()
+        releaser.close()
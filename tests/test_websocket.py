@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+from app.utils.websocket import ConnectionManager, RESYNC
+from conftest import register
+
+
+class FakeSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        self.received.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def settle(seconds=0.05):
+    await asyncio.sleep(seconds)
+
+
+def test_slow_client_does_not_delay_others():
+    async def scenario():
+        manager = ConnectionManager(queue_size=10, policy="drop_oldest", send_timeout=5, ping_interval=60)
+        fast, slow = FakeSocket(), FakeSocket(delay=10)
+        for socket in (fast, slow):
+            await manager.connect(socket)
+        for i in range(5):
+            await manager.broadcast(str(i))
+        await settle()
+        assert fast.received == ["0", "1", "2", "3", "4"]
+        assert slow.received == []
+        for connection in list(manager.connections):
+            manager.disconnect(connection)
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_policies():
+    async def scenario(policy):
+        manager = ConnectionManager(queue_size=3, policy=policy, send_timeout=5, ping_interval=60)
+        socket = FakeSocket()
+        connection = manager.register(socket)
+        connection.writer.cancel()  # nothing drains the queue: the client is stuck
+        for i in range(5):
+            manager.broadcast_nowait(str(i))
+        await settle()
+        return manager, connection, socket
+
+    manager, connection, _ = asyncio.run(scenario("drop_oldest"))
+    assert list(connection.queue._queue) == ["2", "3", "4"]
+
+    manager, connection, _ = asyncio.run(scenario("coalesce"))
+    assert list(connection.queue._queue) == [RESYNC, "4"]
+
+    manager, connection, socket = asyncio.run(scenario("disconnect"))
+    assert connection not in manager.connections
+    assert socket.closed_with == 1013
+
+
+def test_idle_connections_are_pinged_and_dead_or_stuck_ones_dropped():
+    class DeadSocket(FakeSocket):
+        async def send_text(self, message):
+            raise ConnectionResetError()
+
+    async def scenario():
+        manager = ConnectionManager(queue_size=10, policy="drop_oldest", send_timeout=0.02, ping_interval=0.01)
+        idle, dead, stuck = FakeSocket(), DeadSocket(), FakeSocket(delay=10)
+        await manager.connect(idle)
+        dead_connection = await manager.connect(dead)
+        stuck_connection = await manager.connect(stuck)
+        await manager.broadcast("hello")
+        await settle()
+        assert idle.received[0] == "hello"
+        assert json.loads(idle.received[-1]) == {"type": "ping"}
+        assert dead_connection not in manager.connections
+        assert stuck_connection not in manager.connections and stuck.closed_with == 1013
+        for connection in list(manager.connections):
+            manager.disconnect(connection)
+
+    asyncio.run(scenario())
+
+
+def test_issue_events_stream_deltas_and_replay():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # One portal for every call, so HTTP requests and sockets share the event loop
+    with TestClient(app) as client:
+        token = register("events@example.com", "MAINTAINER")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with client.websocket_connect(f"/ws/issues?topics=issues,stats&token={token}") as ws:
+            issue = client.post("/api/issues/", data={"title": "Live", "severity": "HIGH"}, headers=headers).json()
+            created = ws.receive_json()
+            assert created["type"] == "issue.created" and created["issue_id"] == issue["id"]
+            assert created["changes"]["title"] == "Live"
+            stats = ws.receive_json()
+            assert stats["type"] == "stats.changed" and stats["deltas"]["status"] == {"OPEN": 1}
+
+            client.patch(f"/api/issues/{issue['id']}/triage", json={"status": "TRIAGED"}, headers=headers)
+            triaged = ws.receive_json()
+            assert triaged["type"] == "issue.triaged" and triaged["changes"] == {"status": "TRIAGED"}
+            assert ws.receive_json()["deltas"] == {"status": {"OPEN": -1, "TRIAGED": 1}}
+
+        # Resuming after the creation replays only what the new topics cover
+        since = f"{created['epoch']}:{created['seq']}"
+        with client.websocket_connect(f"/ws/issues?topics=issue:{issue['id']}&since={since}&token={token}") as ws:
+            assert ws.receive_json() == triaged
+
+        with client.websocket_connect(f"/ws/issues?since=unknown:1&token={token}") as ws:
+            assert ws.receive_json() == {"type": "resync"}
+
+
+def test_websocket_requires_token_and_scopes_reporters():
+    import pytest
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+    from app.main import app
+
+    with TestClient(app) as client:
+        alice, bob = register("ws-alice@example.com", "REPORTER"), register("ws-bob@example.com", "REPORTER")
+
+        with pytest.raises(WebSocketDisconnect) as rejected:
+            with client.websocket_connect("/ws/issues?token=not-a-jwt") as ws:
+                ws.receive_json()
+        assert rejected.value.code == 1008
+
+        # Even subscribed to everything, a reporter only hears about their own issues
+        with client.websocket_connect(f"/ws/issues?topics=issues&token={alice}") as ws:
+            for owner, title in ((bob, "Bob's"), (alice, "Alice's")):
+                client.post("/api/issues/", data={"title": title, "severity": "LOW"},
+                            headers={"Authorization": f"Bearer {owner}"})
+            event = ws.receive_json()
+            assert event["type"] == "issue.created" and event["changes"]["title"] == "Alice's"
+
+
+def test_publish_skips_other_owners_for_own_only_connections():
+    async def scenario():
+        manager = ConnectionManager(queue_size=10, policy="drop_oldest", send_timeout=5, ping_interval=60)
+        maintainer = manager.register(FakeSocket(), user_id=1)
+        reporter = manager.register(FakeSocket(), user_id=2, own_only=True)
+        for connection in (maintainer, reporter):
+            manager.subscribe(connection, {"issue:7"})
+        manager.publish(("issues", "issue:7"), "someone else's", owner_id=3)
+        manager.publish(("issues", "issue:7"), "reporter's own", owner_id=2)
+        manager.publish(("stats",), "unowned")
+        await settle()
+        result = maintainer.websocket.received, reporter.websocket.received
+        for connection in list(manager.connections):
+            manager.disconnect(connection)
+        return result
+
+    assert asyncio.run(scenario()) == (["someone else's", "reporter's own"], ["reporter's own"])
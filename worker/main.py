@@ -0,0 +1,49 @@
+"""
+Job worker: runs queued background jobs (exports, stats reconciliation, upload cleanup,
+blob release) from the jobs table. Run several for more throughput:
+
+    python worker/main.py --concurrency 8
+    python worker/main.py --once        # run what is due now and exit
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+
+# In a checkout the backend package sits next to this directory; the image copies it to /app
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+if os.path.isdir(BACKEND):
+    sys.path.insert(0, BACKEND)
+
+import app.db.base  # noqa: F401,E402  (registers all models)
+from app.core.config import settings  # noqa: E402
+from app.db.init_db import init_schema  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.workers.runner import JobRunner  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY, help="jobs run at once")
+    parser.add_argument("--once", action="store_true", help="run due jobs and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    init_schema(engine)
+    runner = JobRunner(concurrency=args.concurrency)
+    if args.once:
+        print(f"Ran {runner.run_pending()} jobs")
+        return
+
+    if settings.JOB_WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+        start_http_server(settings.JOB_WORKER_METRICS_PORT)
+    # Finish the running jobs on SIGTERM (docker stop) instead of leaving them to be retried
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: runner.stop())
+    runner.run_forever()
+
+
+if __name__ == "__main__":
+    main()